@@ -1,5 +1,8 @@
 import hashlib
 import random
+import time
+
+import instrumentation
 
 # 工具函数
 def is_prime(n):
@@ -12,95 +15,182 @@ def is_prime(n):
 def is_even(n): return n % 2 == 0
 def is_odd(n): return n % 2 != 0
 
-def get_candidates_for_pos(pos, current_path, clues, length):
+# 数字集合的位掩码：第 d 位为 1 表示数字 d 可选
+ALL_DIGITS_MASK = (1 << 10) - 1
+PRIME_MASK = sum(1 << d for d in range(10) if is_prime(d))
+EVEN_MASK = sum(1 << d for d in range(10) if is_even(d))
+ODD_MASK = ALL_DIGITS_MASK & ~EVEN_MASK
+
+
+def compile_clues(clues, length, stop_at_fixed=False):
     """
-    根据当前位置、已有路径与线索，筛选当前可选数字
-    - pos: 当前数字在密码中的位置
-    - current_path: 已构建的部分路径
-    - clues: 所有线索
-    - length: 密码总长度
+    把线索编译成每个位置的可选数字掩码（不含“数字不重复”约束，它由回溯时的已用掩码处理）：
+    - [-1, -1]：所有数字都是质数，各位置与 PRIME_MASK 相与
+    - [位置(从 1 开始), 0/1]：该位置为偶数 / 奇数
+    - 长度等于密码长度的线索：完整密码，-1 以外的位为固定数字
+    stop_at_fixed 为 True 时，某位置遇到第一个固定数字后忽略其后的线索（方法一逐条筛选时提前返回的语义），
+    否则所有线索都要满足（方法二逐条校验的语义）。
     """
-    # 初始候选：所有未用过的数字
-    candidates = [c for c in range(10) if c not in current_path]
-
+    masks = [ALL_DIGITS_MASK] * length
+    settled = [False] * length
     for clue in clues:
         if clue == [-1, -1]:
-            # 要求所有数字都是质数
-            candidates = [c for c in candidates if is_prime(c)]
+            masks = [m if done else m & PRIME_MASK for m, done in zip(masks, settled)]
         elif len(clue) == 2:
             clue_pos, prop = clue
-            if clue_pos == pos + 1:
+            pos = clue_pos - 1
+            if 0 <= pos < length and not settled[pos]:
                 # prop 0 表示该位置为偶数，1 表示奇数
                 if prop == 0:
-                    candidates = [c for c in candidates if is_even(c)]
+                    masks[pos] &= EVEN_MASK
                 elif prop == 1:
-                    candidates = [c for c in candidates if is_odd(c)]
+                    masks[pos] &= ODD_MASK
         elif len(clue) == length:
-            # 完整密码线索，有些位是固定数字
-            fixed_digit = clue[pos]
-            if fixed_digit != -1:
-                return [fixed_digit] if fixed_digit in candidates else []
-    return candidates
+            for pos, fixed_digit in enumerate(clue):
+                if fixed_digit == -1 or settled[pos]:
+                    continue
+                masks[pos] &= (1 << fixed_digit) if 0 <= fixed_digit <= 9 else 0
+                settled[pos] = stop_at_fixed
+    return masks
+
+
+def iter_digits(mask):
+    """按从小到大的顺序产出掩码中的数字"""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+# 每个数字掩码对应的数字元组（从小到大），热点处查表代替 iter_digits 生成器
+MASK_DIGITS = tuple(tuple(iter_digits(mask)) for mask in range(ALL_DIGITS_MASK + 1))
+
+
+def get_candidates_for_pos(pos, current_path, clues, length):
+    """
+    根据当前位置、已有路径与线索，筛选当前可选数字
+    - pos: 当前数字在密码中的位置
+    - current_path: 已构建的部分路径
+    - clues: 所有线索
+    - length: 密码总长度
+    """
+    used = 0
+    for digit in current_path:
+        used |= 1 << digit
+    return list(iter_digits(compile_clues(clues, length, stop_at_fixed=True)[pos] & ~used))
+
+# 哈希阶段：盐值只吸收一次，候选密码写在预分配的字节缓冲区里
+class SaltedHasher:
+    """
+    判断候选密码的 sha256(salt + 密码) 是否等于目标哈希。
+    - sha256(salt) 只计算一次，每个候选从它的副本继续，不再拼接 salt + 密码
+    - buffer 为当前候选的 ASCII 字节，回溯时按位原地改写，不为每个候选新建字符串
+    salt + 密码不足一个 64 字节分组，压缩计算都在 digest() 时发生，因此再预先吸收密码前缀没有收益；
+    同理把最后一位的兄弟候选成批比对也省不下哈希本身，实测反而因分组开销更慢，每个叶子直接调用 matches()。
+    比较的是摘要字节；目标不是小写十六进制时与原先的 hexdigest 比较一样永远不匹配。
+    启用埋点时 record() 报告的吞吐量为哈希次数除以从创建到记录的总耗时（含搜索本身），比对时不计时。
+    """
+
+    def __init__(self, salt, target_hash, length):
+        self.salted = hashlib.sha256(salt)
+        try:
+            target = bytes.fromhex(target_hash)
+            self.target = target if target.hex() == target_hash else None
+        except (TypeError, ValueError):
+            self.target = None
+        self.buffer = bytearray(b'0' * length)
+        self.hashes = 0
+        self.started = time.perf_counter() if instrumentation.ENABLED else None
+
+    def matches(self):
+        """缓冲区中的候选是否匹配"""
+        h = self.salted.copy()
+        h.update(self.buffer)
+        self.hashes += 1
+        return h.digest() == self.target
+
+    def record(self):
+        """把哈希次数与吞吐量记录到埋点"""
+        instrumentation.count('puzzle.hashes', self.hashes)
+        if self.started is not None:
+            seconds = time.perf_counter() - self.started
+            instrumentation.phase('puzzle.hash', hashes=self.hashes, seconds=seconds,
+                                  hashes_per_second=self.hashes / seconds if seconds else 0.0)
+
+
+# 逐步求解器的产出粒度：每一步（含 "Trying" 部分路径）、每个叶子、每 N 个叶子（传整数），或只产出最终结果。
+# 成功一步总会产出；不需要产出的步骤不格式化状态文本。尝试次数与粒度无关。
+GRANULARITY_STEP = "step"
+GRANULARITY_LEAF = "leaf"
+GRANULARITY_RESULT = "result"
+
+
+def _granularity_flags(granularity):
+    """返回 (是否产出部分路径, 每隔多少个叶子产出一次，0 表示不产出叶子)"""
+    if granularity == GRANULARITY_STEP:
+        return True, 1
+    if granularity == GRANULARITY_LEAF:
+        return False, 1
+    if granularity == GRANULARITY_RESULT:
+        return False, 0
+    if isinstance(granularity, int) and not isinstance(granularity, bool) and granularity > 0:
+        return False, granularity
+    raise ValueError(f"invalid granularity {granularity!r}")
+
 
 # 方法一：优化回溯（先筛选候选）
-def _solve_method_1(clues, target_hash, length, salt, tries_counter):
+def _solve_method_1(clues, target_hash, length, salt, tries_counter, granularity=GRANULARITY_STEP):
     """方法1：预处理候选数字，使用优化的回溯搜索"""
+    yield_steps, leaf_every = _granularity_flags(granularity)
     path = []
+    masks = compile_clues(clues, length, stop_at_fixed=True)
+    hasher = SaltedHasher(salt, target_hash, length)
+    buffer = hasher.buffer
 
-    def backtrack():
+    def backtrack(used):
         current_pos = len(path)
         if current_pos == length:
             tries_counter["count"] += 1
-            password_str = "".join(map(str, path))
-            yield list(path), f"Hashing '{password_str}'...", tries_counter["count"]
-            # 比对哈希值
-            password_bytes = password_str.encode('utf-8')
-            current_hash = hashlib.sha256(salt + password_bytes).hexdigest()
-            if current_hash == target_hash:
-                yield list(path), f"Success! Password: {password_str}", tries_counter["count"]
+            if leaf_every and tries_counter["count"] % leaf_every == 0:
+                yield list(path), f"Hashing '{buffer.decode()}'...", tries_counter["count"]
+            if hasher.matches():
+                hasher.record()  # 调用方在成功后通常不再推进生成器，先记录统计
+                yield list(path), f"Success! Password: {buffer.decode()}", tries_counter["count"]
                 return True
             return False
 
-        # 获取当前位置的可选数字
-        candidates = get_candidates_for_pos(current_pos, path, clues, length)
-        for num in candidates:
+        # 当前位置的可选数字：线索掩码去掉已用数字
+        for num in MASK_DIGITS[masks[current_pos] & ~used]:
             path.append(num)
-            yield list(path), f"Trying: {path}", tries_counter["count"]
-            if (yield from backtrack()): return True
+            buffer[current_pos] = 48 + num
+            if yield_steps:
+                yield list(path), f"Trying: {path}", tries_counter["count"]
+            if (yield from backtrack(used | (1 << num))): return True
             path.pop()
         return False
 
-    yield from backtrack()
+    if not (yield from backtrack(0)):
+        hasher.record()
 
 # 方法二/三：暴力回溯（method2 固定顺序，method3 随机打乱）
-def _solve_method_2(clues, target_hash, length, salt, tries_counter, randomize=False):
+def _solve_method_2(clues, target_hash, length, salt, tries_counter, randomize=False,
+                    granularity=GRANULARITY_STEP):
     """方法2/3：尝试所有0-9数字，逐个判断是否合法"""
+    yield_steps, leaf_every = _granularity_flags(granularity)
     path = []
+    masks = compile_clues(clues, length)
+    hasher = SaltedHasher(salt, target_hash, length)
+    buffer = hasher.buffer
 
-    def is_valid(num, pos):
-        if num in path: return False
-        for clue in clues:
-            if clue == [-1, -1]:
-                if not is_prime(num): return False
-            elif len(clue) == 2:
-                clue_pos, prop = clue
-                if clue_pos == pos + 1:
-                    if prop == 0 and not is_even(num): return False
-                    if prop == 1 and not is_odd(num): return False
-            elif len(clue) == length:
-                if clue[pos] != -1 and num != clue[pos]: return False
-        return True
-
-    def backtrack():
+    def backtrack(used):
         current_pos = len(path)
         if current_pos == length:
             tries_counter["count"] += 1
-            password_str = "".join(map(str, path))
-            yield list(path), f"Hashing '{password_str}'...", tries_counter["count"]
-            password_bytes = password_str.encode('utf-8')
-            current_hash = hashlib.sha256(salt + password_bytes).hexdigest()
-            if current_hash == target_hash:
-                yield list(path), f"Success! Password: {password_str}", tries_counter["count"]
+            if leaf_every and tries_counter["count"] % leaf_every == 0:
+                yield list(path), f"Hashing '{buffer.decode()}'...", tries_counter["count"]
+            if hasher.matches():
+                hasher.record()  # 调用方在成功后通常不再推进生成器，先记录统计
+                yield list(path), f"Success! Password: {buffer.decode()}", tries_counter["count"]
                 return True
             return False
 
@@ -108,28 +198,103 @@ def _solve_method_2(clues, target_hash, length, salt, tries_counter, randomize=F
         if randomize:
             random.shuffle(candidate_digits)
 
+        valid = masks[current_pos] & ~used  # 满足线索且未使用的数字
         for num in candidate_digits:
-            yield list(path), f"Trying: {path}", tries_counter["count"]
-            if is_valid(num, current_pos):
+            if yield_steps:
+                yield list(path), f"Trying: {path}", tries_counter["count"]
+            if valid >> num & 1:
                 path.append(num)
-                if (yield from backtrack()): return True
+                buffer[current_pos] = 48 + num
+                if (yield from backtrack(used | (1 << num))): return True
                 path.pop()
         return False
 
-    yield from backtrack()
+    if not (yield from backtrack(0)):
+        hasher.record()
+
+# 无界面搜索：与逐步求解器相同的访问顺序与计数，但不经过生成器、不产出任何步骤
+def search_silently(masks, hasher, pos=0, used=0, randomize=False, should_stop=None):
+    """
+    从第 pos 位开始顺序搜索（hasher.buffer 的前 pos 位须已填好，used 为它们的已用掩码）。
+    randomize 时每个节点调用一次 random.shuffle，与 method3 的随机数消耗一致。
+    返回 (是否找到, 尝试次数)，找到时密码留在 hasher.buffer 中；should_stop() 为真时放弃，返回 (False, -1)。
+    """
+    length = len(masks)
+    if pos == length:
+        return hasher.matches(), 1
+    buffer, matches = hasher.buffer, hasher.matches
+    tries = 0
+    stopped = False
+
+    def dfs(pos, used):
+        nonlocal tries, stopped
+        valid = masks[pos] & ~used
+        if randomize:
+            order = list(range(10))
+            random.shuffle(order)
+            digits = [d for d in order if valid >> d & 1]
+        else:
+            digits = MASK_DIGITS[valid]
+        if pos == length - 1:
+            if should_stop is not None and should_stop():
+                stopped = True
+                return True
+            for digit in digits:
+                buffer[pos] = 48 + digit
+                tries += 1
+                if matches():
+                    return True
+            return False
+        for digit in digits:
+            buffer[pos] = 48 + digit
+            if dfs(pos + 1, used | (1 << digit)):
+                return True
+        return False
+
+    found = dfs(pos, used)
+    if stopped:
+        return False, -1
+    return found, tries
+
+
+def solve_puzzle_instant(method, clues, target_hash, length, salt, tries_counter):
+    """
+    无界面调用的即时求解：不产出步骤、不格式化状态文本。
+    tries_counter["count"] 的增量与逐步求解到成功（或搜完）时相同，返回密码字符串，找不到时返回 None。
+    """
+    hasher = SaltedHasher(salt, target_hash, length)
+    masks = compile_clues(clues, length, stop_at_fixed=method not in ("method2", "method3"))
+    found, tries = search_silently(masks, hasher, randomize=(method == "method3"))
+    tries_counter["count"] += tries
+    hasher.record()
+    return hasher.buffer.decode() if found else None
+
+
+def drain_steps(solver, budget_seconds):
+    """
+    在时间预算内尽量多地推进逐步求解器（快进）；遇到成功一步立即停下。
+    返回 (最后产出的一步或 None, 求解器是否已耗尽)。
+    """
+    deadline = time.perf_counter() + budget_seconds
+    step = None
+    for step in solver:
+        if "Success!" in step[1] or time.perf_counter() >= deadline:
+            return step, False
+    return step, True
+
 
 # 入口函数
-def solve_puzzle_by_method(method, clues, target_hash, length, salt, tries_counter):
+def solve_puzzle_by_method(method, clues, target_hash, length, salt, tries_counter, granularity=GRANULARITY_STEP):
     """
     根据指定方法启动密码破解流程
-    返回生成器，逐步输出路径、状态和尝试次数
+    返回生成器，逐步输出路径、状态和尝试次数；granularity 控制产出哪些步骤（见 GRANULARITY_*）
     """
     if method == "method1":
-        return _solve_method_1(clues, target_hash, length, salt, tries_counter)
+        return _solve_method_1(clues, target_hash, length, salt, tries_counter, granularity)
     elif method == "method2":
-        return _solve_method_2(clues, target_hash, length, salt, tries_counter, randomize=False)
+        return _solve_method_2(clues, target_hash, length, salt, tries_counter, False, granularity)
     elif method == "method3":
-        return _solve_method_2(clues, target_hash, length, salt, tries_counter, randomize=True)
+        return _solve_method_2(clues, target_hash, length, salt, tries_counter, True, granularity)
     else:
         # 默认使用 method1
-        return _solve_method_1(clues, target_hash, length, salt, tries_counter)
+        return _solve_method_1(clues, target_hash, length, salt, tries_counter, granularity)
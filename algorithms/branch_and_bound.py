@@ -1,86 +1,463 @@
 import heapq
+from bisect import bisect_left
+from collections import OrderedDict, defaultdict
 
-# 全局变量用于让启发函数访问Boss血量列表
-B_HPS = [] 
+# GauntletCache 默认保留的求解结果数
+GAUNTLET_CACHE_MAX_ENTRIES = 256
+# 冷却组合数不超过该值时，启发值使用精确的最大伤害表，否则退回松弛上界
+EXACT_BOUND_STATE_LIMIT = 4096
+# 集束模式：每回合层、每个 Boss 之间保留的状态数，以及 auto 模式改用集束的规模阈值
+BEAM_WIDTH = 4
+BEAM_EXACT_BOUND_STATE_LIMIT = 256
+AUTO_EXACT_MAX_SKILLS = 6
+AUTO_EXACT_MAX_TOTAL_HP = 600
+# 分步求解时，A* 每展开这么多个状态交还一次控制权（须为 2 的幂）
+YIELD_INTERVAL = 64
+# A* 整数状态键中 Boss 序号 / 剩余血量 / 冷却组合编号各占的位数
+BOSS_INDEX_BITS = 20
+HP_BITS = 24
+COOLDOWN_ID_BITS = 20
 
-def heuristic(boss_idx, boss_hp):
-    if boss_idx >= len(B_HPS):
-        return 0
-    remaining_hp = boss_hp + sum(B_HPS[boss_idx+1:])
-    return remaining_hp / 6
 
-def solve_boss_gauntlet(boss_hp_list, skills):
+def damage_upper_bounds(skills, total_hp, cooldowns=None):
     """
-    使用A*算法
+    bounds[t] 为 t 回合内可能造成的最大总伤害的上界，直到不小于 total_hp 为止。
+    松弛：剩余冷却为 r、冷却为 c 的技能在 t 回合内至多使用 ceil((t - r) / (c + 1)) 次，每回合只用一个技能；
+    在此约束下按伤害从高到低分配回合即得到松弛问题的最优值。cooldowns 缺省时视为全部就绪。
     """
-    global B_HPS
-    B_HPS = boss_hp_list
-    num_skills = len(skills)
+    if cooldowns is None:
+        cooldowns = (0,) * len(skills)
+    by_damage = sorted(((s['Damage'], s['Cooldown'], r) for s, r in zip(skills, cooldowns)), reverse=True)
+    if not by_damage or by_damage[0][0] <= 0:
+        return None  # 没有能造成伤害的技能，无法击败
+    bounds = [0]
+    t = 0
+    while bounds[-1] < total_hp:
+        t += 1
+        slots, total = t, 0
+        for damage, cooldown, ready_in in by_damage:
+            if slots == 0 or damage <= 0:
+                break
+            uses = min(max(0, -(-(t - ready_in) // (cooldown + 1))), slots)
+            total += uses * damage
+            slots -= uses
+        bounds.append(total)
+    return bounds
 
-    initial_state = (0, boss_hp_list[0], tuple([0] * num_skills))
 
-    entry_count = 0 # 初始化一个唯一的计数器
-    pq = [(0 + heuristic(0, boss_hp_list[0]), 0, entry_count, [], initial_state)]
-    entry_count += 1
-    
-    visited = set()
+def exact_damage_bounds(skill_specs, max_hp, limit=EXACT_BOUND_STATE_LIMIT):
+    """
+    枚举从全部就绪出发可达的所有冷却组合，用 DP 求出每个组合在 t 回合内的最大总伤害（忽略溢出）：
+    best[t][c] = max_i (d_i + best[t-1][next(c, i)])，并对 t 取前缀最大值使其单调。
+    返回 {冷却元组: bounds 列表}（含义同 damage_upper_bounds，但为精确值）；组合数超过 limit 时返回 None。
+    """
+    num_skills = len(skill_specs)
+    zero = (0,) * num_skills
+    index, states, moves = {zero: 0}, [zero], []
+    for cooldowns in states:  # 遍历中追加，即 BFS
+        ticked = [cd - 1 if cd > 0 else 0 for cd in cooldowns]
+        state_moves = []
+        for i, (damage, cooldown) in enumerate(skill_specs):
+            if cooldowns[i] == 0:
+                next_cooldowns = list(ticked)
+                next_cooldowns[i] = cooldown
+                next_cooldowns = tuple(next_cooldowns)
+                if next_cooldowns not in index:
+                    if len(states) >= limit:
+                        return None
+                    index[next_cooldowns] = len(states)
+                    states.append(next_cooldowns)
+                state_moves.append((damage, index[next_cooldowns]))
+        moves.append(state_moves)
+
+    # 表长超过全部就绪时所需回合数 + 最长冷却后停止：截断只会让启发值偏小，仍可采纳
+    max_turns = None
+    count = len(states)
+    bounds = [[0] for _ in range(count)]
+    best = [0] * count
+    t = 0
+    while max_turns is None or t < max_turns:
+        t += 1
+        previous, best = best, [max((damage + best[nxt] for damage, nxt in moves[c]), default=0)
+                                for c in range(count)]
+        if best == previous:
+            break  # 不动点：最大伤害不再增长（会陷入所有技能都在冷却的死局）
+        for c in range(count):
+            column = bounds[c]
+            if column[-1] < max_hp:
+                column.append(max(column[-1], best[c]))
+        if max_turns is None and bounds[0][-1] >= max_hp:
+            max_turns = t + max(cooldown for _, cooldown in skill_specs) + 1
+    if bounds[0][-1] < max_hp:
+        return None  # 全部就绪时也打不出足够伤害（例如没有能造成伤害的技能）
+    return {states[c]: bounds[c] for c in range(count)}
+
+
+def _ready_bounds(skill_specs, max_hp, limit):
+    """返回 (全部就绪时的伤害上界表, 精确表字典或 None)；无法击败时上界表为 None"""
+    exact = exact_damage_bounds(skill_specs, max_hp, limit)
+    if exact is not None:
+        return exact[(0,) * len(skill_specs)], exact
+    skills = [{'Damage': d, 'Cooldown': c} for d, c in skill_specs]
+    return damage_upper_bounds(skills, max_hp), None
+
+
+def _drain(steps):
+    """把分步求解器运行到底，返回其结果"""
+    while True:
+        try:
+            next(steps)
+        except StopIteration as stop:
+            return stop.value
+
+
+def _solve(boss_hps, skill_specs, stats):
+    return _drain(_iter_exact(boss_hps, skill_specs, stats))
+
+
+def _iter_exact(boss_hps, skill_specs, stats, upper_bound=None):
+    """
+    A* 核心，写成生成器：每展开 YIELD_INTERVAL 个状态产出一次当前的回合数下界（已弹出的最大 f 值），
+    结束时以 StopIteration 的值返回结果。upper_bound 为已知可行解的回合数，f 超过它的状态不再入队。状态为 (Boss 序号, 当前 Boss 剩余血量, 冷却组合编号)，打包成一个整数；
+    父指针表代替在堆元素中复制技能序列。冷却组合按需编号，其转移表与伤害上界表各只计算一次。
+    启发值：当前 Boss 按当前冷却状态求出的最少回合数（见 exact_damage_bounds / damage_upper_bounds），加上之后每个 Boss
+    各自从全部就绪开始的最少回合数。每个 Boss 的击杀回合窗口互不重叠、击杀时溢出的伤害不会带到下一个，
+    且任一窗口内的伤害不超过从全部就绪开始的上界，因此逐个相加仍可采纳，并比按总血量估计更紧。
+    返回 (回合数, 技能下标序列)，无解时回合数为 -1。
+    """
+    skills = [{'Damage': d, 'Cooldown': c} for d, c in skill_specs]
+    num_bosses, num_skills = len(boss_hps), len(skills)
+    damages = [d for d, _ in skill_specs]
+    expanded = pushed = 0
+
+    def finish(turns, sequence):
+        if stats is not None:
+            stats.update(expanded=expanded, pushed=pushed, cache_hit=False)
+        return turns, sequence
+
+    if num_bosses == 0:
+        return finish(0, ())
+    max_hp = max(boss_hps)
+    ready_bounds, exact = _ready_bounds(skill_specs, max_hp, EXACT_BOUND_STATE_LIMIT)
+    if ready_bounds is None:
+        return finish(-1, ())
+    # later_turns[i]: 第 i 个及之后的 Boss 各自所需最少回合数之和
+    later_turns = [0] * (num_bosses + 1)
+    for i in range(num_bosses - 1, -1, -1):
+        later_turns[i] = later_turns[i + 1] + bisect_left(ready_bounds, boss_hps[i])
+
+    # 冷却组合编号：cooldown_states[c] 为冷却元组，moves[c] 为 [(技能下标, 伤害, 使用后的组合编号)]
+    cooldown_states, cooldown_index, moves, bounds = [], {}, [], []
 
+    def cooldown_id(cooldowns):
+        c = cooldown_index.get(cooldowns)
+        if c is None:
+            c = cooldown_index[cooldowns] = len(cooldown_states)
+            cooldown_states.append(cooldowns)
+            moves.append(None)
+            bounds.append(damage_upper_bounds(skills, max_hp, cooldowns) if exact is None else exact[cooldowns])
+        return c
+
+    def moves_from(c):
+        if moves[c] is None:
+            cooldowns = cooldown_states[c]
+            ticked = [cd - 1 if cd > 0 else 0 for cd in cooldowns]
+            result = []
+            for i in range(num_skills):
+                if cooldowns[i] == 0:
+                    next_cooldowns = list(ticked)
+                    next_cooldowns[i] = skill_specs[i][1]
+                    result.append((i, damages[i], cooldown_id(tuple(next_cooldowns))))
+            moves[c] = result
+        return moves[c]
+
+    # 整数状态键：Boss 序号 | 剩余血量 | 冷却组合编号，位宽见 BOSS_INDEX_BITS 等（由 _exact_overflow 保证不溢出）
+    hp_shift = COOLDOWN_ID_BITS
+    boss_shift = HP_BITS + COOLDOWN_ID_BITS
+
+    def pack(boss_idx, hp, c):
+        return (boss_idx << boss_shift) | (hp << hp_shift) | c
+
+    goal = pack(num_bosses, 0, 0)
+    start = pack(0, boss_hps[0], cooldown_id((0,) * num_skills))
+    best_g = {start: 0}
+    parent = {start: None}  # 状态 -> (父状态, 技能下标)
+    counter = 0
+    # 堆元素 (f, -g, 计数, 状态)：f 相同时优先展开更深的状态
+    pq = [(later_turns[0], 0, counter, start)]
+    cooldown_mask = (1 << COOLDOWN_ID_BITS) - 1
+    hp_mask = (1 << HP_BITS) - 1
+
+    yield_mask = YIELD_INTERVAL - 1
     while pq:
-        f, g, _, path, state = heapq.heappop(pq)
-        
-        boss_idx, boss_hp, cooldowns = state
+        f, neg_g, _, state = heapq.heappop(pq)
+        g = -neg_g
+        if g > best_g[state]:
+            continue  # 过期元素
+        if state == goal:
+            sequence = []
+            while parent[state] is not None:
+                state, skill_index = parent[state]
+                sequence.append(skill_index)
+            return finish(g, tuple(reversed(sequence)))
+        expanded += 1
+        if not expanded & yield_mask:
+            yield f
 
-        if (boss_idx, boss_hp, cooldowns) in visited:
-            continue
-        visited.add((boss_idx, boss_hp, cooldowns))
+        boss_idx, boss_hp, c = state >> boss_shift, (state >> hp_shift) & hp_mask, state & cooldown_mask
+        new_g = g + 1
+        for i, damage, next_c in moves_from(c):
+            next_hp = boss_hp - damage
+            if next_hp > 0:
+                next_state = pack(boss_idx, next_hp, next_c)
+                h = bisect_left(bounds[next_c], next_hp) + later_turns[boss_idx + 1]
+            elif boss_idx + 1 == num_bosses:
+                next_state, h = goal, 0
+            else:
+                next_state = pack(boss_idx + 1, boss_hps[boss_idx + 1], next_c)
+                h = bisect_left(bounds[next_c], boss_hps[boss_idx + 1]) + later_turns[boss_idx + 2]
 
-        if boss_idx >= len(boss_hp_list):
-            return {"turns": g, "sequence": path}
+            if upper_bound is not None and new_g + h > upper_bound:
+                continue
+            known = best_g.get(next_state)
+            if known is not None and known <= new_g:
+                continue
+            best_g[next_state] = new_g
+            parent[next_state] = (state, i)
+            counter += 1
+            pushed += 1
+            heapq.heappush(pq, (new_g + h, -new_g, counter, next_state))
 
-        for i in range(num_skills):
-            if cooldowns[i] == 0:
-                current_skill = skills[i]
-                dmg = current_skill['Damage']
-                cd = current_skill['Cooldown']
-                
-                new_g = g + 1
-                new_path = path + [current_skill]
-                next_hp = boss_hp - dmg
-
-                next_cooldowns = list(cooldowns)
-                next_cooldowns[i] = cd
-                for j in range(num_skills):
-                    if j != i and next_cooldowns[j] > 0:
-                        next_cooldowns[j] -= 1
-                final_cooldowns_tuple = tuple(next_cooldowns)
-
-                if next_hp <= 0:
-                    new_boss_idx = boss_idx + 1
-                    if new_boss_idx >= len(boss_hp_list):
-                        return {"turns": new_g, "sequence": new_path}
-                    
-                    next_boss_hp = boss_hp_list[new_boss_idx]
-                    next_state = (new_boss_idx, next_boss_hp, final_cooldowns_tuple)
-                else:
-                    next_state = (boss_idx, next_hp, final_cooldowns_tuple)
-
-                h = heuristic(next_state[0], next_state[1])
-                
-                heapq.heappush(pq, (new_g + h, new_g, entry_count, new_path, next_state))
-                entry_count += 1 
-                
-    return {"turns": -1, "sequence": []}
-
-
-def find_best_attack_sequence(player, boss, skills):
+    return finish(-1, ())
+
+
+def _solve_beam(boss_hps, skill_specs, beam_width, stats):
+    return _drain(_iter_beam(boss_hps, skill_specs, beam_width, stats))
+
+
+def _iter_beam(boss_hps, skill_specs, beam_width, stats):
+    """
+    集束模式（生成器，每展开完一层产出一次下界）：逐个 Boss 求解，Boss 之间只传递冷却状态（每种冷却组合保留最早的击杀回合）。
+    单个 Boss 内按回合分层展开，每层只保留剩余血量最低（其次冷却总和最小）的 beam_width 个状态；
+    首次击杀后再多搜索“最长冷却”个回合，以收集冷却状态更好的击杀方式。
+    不保证最优；另用各 Boss 最少回合数之和作为下界，给出最优性差距。
+    返回 (回合数, 技能下标序列, 下界)，无解时回合数为 -1。
+    """
+    num_skills = len(skill_specs)
+    max_cooldown = max(c for _, c in skill_specs)
+    expanded = 0
+
+    ready_bounds, _ = _ready_bounds(skill_specs, max(boss_hps, default=0), BEAM_EXACT_BOUND_STATE_LIMIT)
+    lower_bound = sum(bisect_left(ready_bounds, hp) for hp in boss_hps) if ready_bounds else 0
+
+    def finish(turns, node):
+        sequence = []
+        while node is not None:
+            node, skill_index = node
+            sequence.append(skill_index)
+        if stats is not None:
+            stats.update(expanded=expanded, lower_bound=lower_bound, gap=turns - lower_bound if turns >= 0 else None,
+                         cache_hit=False)
+        return turns, tuple(reversed(sequence)), lower_bound
+
+    if ready_bounds is None:
+        return finish(-1, None)
+
+    # 冷却元组 -> (回合数, 序列节点)；序列节点为 (父节点, 技能下标) 的链表，各状态共享前缀
+    frontier = {(0,) * num_skills: (0, None)}
+    for boss_hp in boss_hps:
+        # 回合数 -> {(剩余血量, 冷却总和, 冷却元组): 序列节点}；键本身即排序依据，省去 key 函数
+        buckets = defaultdict(dict)
+        for cooldowns, (g, node) in frontier.items():
+            buckets[g][(boss_hp, sum(cooldowns), cooldowns)] = node
+        exits = {}
+        deadline = None
+        t = min(buckets)
+        while buckets and (deadline is None or t < deadline):
+            layer = buckets.pop(t, None)
+            t += 1
+            if not layer:
+                continue
+            yield lower_bound
+            keys = heapq.nsmallest(beam_width, layer) if len(layer) > beam_width else layer
+            for state in keys:
+                hp, _, cooldowns = state
+                node = layer[state]
+                expanded += 1
+                ticked = [cd - 1 if cd > 0 else 0 for cd in cooldowns]
+                ticked_sum = sum(ticked)
+                for i, (damage, cooldown) in enumerate(skill_specs):
+                    if cooldowns[i]:
+                        continue
+                    next_cooldowns = list(ticked)
+                    next_cooldowns[i] = cooldown
+                    next_cooldowns = tuple(next_cooldowns)
+                    if damage >= hp:
+                        if next_cooldowns not in exits:
+                            exits[next_cooldowns] = (t, (node, i))
+                            if deadline is None:
+                                deadline = t + max_cooldown
+                    else:
+                        buckets[t].setdefault((hp - damage, ticked_sum + cooldown, next_cooldowns), (node, i))
+        if not exits:
+            return finish(-1, None)
+        frontier = dict(heapq.nsmallest(beam_width, exits.items(), key=lambda item: (item[1][0], sum(item[0]))))
+
+    turns, node = min(frontier.values(), key=lambda entry: entry[0])
+    return finish(turns, node)
+
+
+def _exact_overflow(boss_hp_list, skills):
+    """A* 的打包状态放不下时返回原因，否则返回 None。冷却组合数以各技能 (冷却 + 1) 之积为上界"""
+    if len(boss_hp_list) >= 1 << BOSS_INDEX_BITS:
+        return f"{len(boss_hp_list)} bosses exceed {BOSS_INDEX_BITS}-bit boss index"
+    if max(boss_hp_list, default=0) >= 1 << HP_BITS:
+        return f"boss HP {max(boss_hp_list)} exceeds {HP_BITS}-bit HP field"
+    combinations = 1
+    for skill in skills:
+        combinations *= skill['Cooldown'] + 1
+        if combinations > 1 << COOLDOWN_ID_BITS:
+            return f"cooldown combinations exceed {COOLDOWN_ID_BITS}-bit cooldown id"
+    return None
+
+
+def _choose_mode(boss_hp_list, skills):
+    if len(skills) <= AUTO_EXACT_MAX_SKILLS and sum(boss_hp_list) <= AUTO_EXACT_MAX_TOTAL_HP and \
+            _exact_overflow(boss_hp_list, skills) is None:
+        return 'exact'
+    return 'beam'
+
+
+def _resolve_mode(boss_hp_list, skills, mode):
+    """auto 按规模选择模式；显式要求 exact 但状态无法打包时抛出 ValueError"""
+    if mode == 'auto':
+        return _choose_mode(boss_hp_list, skills)
+    if mode == 'exact':
+        reason = _exact_overflow(boss_hp_list, skills)
+        if reason is not None:
+            raise ValueError(f"battle too large for exact mode ({reason}); use mode='beam' or 'auto'")
+    return mode
+
+
+class GauntletCache:
+    """
+    求解结果的内存 LRU 缓存，键为 (Boss 血量元组, 技能元组, 模式, 集束宽度)，重复的战斗直接返回。
+    由调用方持有并传给 solve_boss_gauntlet / iter_boss_gauntlet（游戏与每次无界面模拟各自持有一个）；
+    命中时移到最近使用的位置，超过容量时淘汰最久未用的条目。
+    """
+
+    def __init__(self, max_entries=GAUNTLET_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+
+    def get(self, key):
+        result = self.entries.get(key)
+        if result is not None:
+            self.entries.move_to_end(key)
+        return result
+
+    def put(self, key, result):
+        self.entries[key] = result
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+
+    def __len__(self):
+        return len(self.entries)
+
+
+def solve_boss_gauntlet(boss_hp_list, skills, stats=None, cache=None, mode='exact', beam_width=BEAM_WIDTH):
+    """
+    求击败依次出场的全部 Boss 所需的最少回合数及技能序列。
+    - skills: [{'Damage': d, 'Cooldown': c}, ...]
+    - stats: 可选字典，写入展开的状态数 expanded、是否命中缓存 cache_hit；
+      exact 模式另有入队次数 pushed，beam 模式另有下界 lower_bound 与差距 gap
+    - cache: 可选的 GauntletCache，按 (血量列表, 技能, 模式) 记忆化结果；None 时总是真实求解
+    - mode: 'exact'（A*，最优）、'beam'（逐 Boss 集束搜索，见 _solve_beam）或 'auto'（按规模选择）
+    返回 {"turns": 回合数, "sequence": [技能字典, ...], "lower_bound": 回合数下界, "optimal": 是否已证明最优}，
+    无解时 turns 为 -1。exact 模式下血量、Boss 数或冷却组合数超出状态打包的位宽时抛出 ValueError。
+    """
+    mode = _resolve_mode(boss_hp_list, skills, mode)
+    specs = tuple((s['Damage'], s['Cooldown']) for s in skills)
+    key = (tuple(boss_hp_list), specs, mode, beam_width if mode == 'beam' else None)
+    result = cache.get(key) if cache is not None else None
+    if result is None:
+        if mode == 'beam':
+            result = _solve_beam(key[0], specs, beam_width, stats)
+        else:
+            turns, sequence = _solve(key[0], specs, stats)
+            result = (turns, sequence, turns)
+        if cache is not None:
+            cache.put(key, result)
+    elif stats is not None:
+        stats.update(expanded=0, pushed=0, cache_hit=True)
+
+    turns, sequence, lower_bound = result
+    return {"turns": turns, "sequence": [skills[i] for i in sequence],
+            "lower_bound": lower_bound, "optimal": turns != -1 and turns == lower_bound}
+
+
+def _relay(steps, progress):
+    """转发子求解器产出的下界到 progress 并产出 progress，返回子求解器的结果"""
+    while True:
+        try:
+            bound = next(steps)
+        except StopIteration as stop:
+            return stop.value
+        if bound > progress['lower_bound']:
+            progress['lower_bound'] = bound
+        yield progress
+
+
+def iter_boss_gauntlet(boss_hp_list, skills, stats=None, cache=None, mode='auto', beam_width=BEAM_WIDTH):
+    """
+    solve_boss_gauntlet 的分步版本，供游戏循环按帧分片运行（与密码谜题的逐步求解器同样用法）。
+    每次产出进度字典 {"turns", "sequence", "lower_bound", "optimal", "done"}：当前最好的可行解（尚无时 turns 为 -1）
+    与已证明的回合数下界；最后一次产出 done 为 True，此时即最终结果。为避免每步复制，产出的始终是同一个字典。
+    exact 模式先用集束搜索得到可行解，再以其回合数为上界运行 A*，逐步抬高下界直到证明最优。
+    与 solve_boss_gauntlet 相同，exact 模式的规模超出状态打包位宽时在调用时即抛出 ValueError。
+    """
+    mode = _resolve_mode(boss_hp_list, skills, mode)
+    return _iter_gauntlet(boss_hp_list, skills, stats, cache, mode, beam_width)
+
+
+def _iter_gauntlet(boss_hp_list, skills, stats, cache, mode, beam_width):
+    specs = tuple((s['Damage'], s['Cooldown']) for s in skills)
+    key = (tuple(boss_hp_list), specs, mode, beam_width if mode == 'beam' else None)
+    progress = {"turns": -1, "sequence": [], "lower_bound": 0, "optimal": False, "done": False}
+
+    result = cache.get(key) if cache is not None else None
+    if result is None:
+        turns, sequence, lower_bound = yield from _relay(_iter_beam(key[0], specs, beam_width, stats), progress)
+        progress.update(turns=turns, sequence=[skills[i] for i in sequence],
+                        lower_bound=max(lower_bound, progress['lower_bound']))
+        if mode == 'exact' and turns != progress['lower_bound']:
+            upper_bound = turns if turns != -1 else None
+            turns, sequence = yield from _relay(_iter_exact(key[0], specs, stats, upper_bound), progress)
+        result = (turns, sequence, turns if mode == 'exact' else lower_bound)
+        if cache is not None:
+            cache.put(key, result)
+    elif stats is not None:
+        stats.update(expanded=0, pushed=0, cache_hit=True)
+
+    turns, sequence, lower_bound = result
+    progress.update(turns=turns, sequence=[skills[i] for i in sequence], lower_bound=lower_bound,
+                    optimal=turns != -1 and turns == lower_bound, done=True)
+    yield progress
+
+
+def find_best_attack_sequence(player, boss, skills, stats=None, mode='exact', cache=None):
     """
     统一的入口函数，负责将不同格式的数据适配并传入核心求解器。
     """
     boss_hp_list = boss.health
-    
+
     if skills and isinstance(skills[0], list):
         skills_dict = [{"Damage": d, "Cooldown": c} for d, c in skills]
     else:
         skills_dict = skills
-        
-    return solve_boss_gauntlet(boss_hp_list, skills_dict)
\ No newline at end of file
+
+    return solve_boss_gauntlet(boss_hp_list, skills_dict, stats, cache=cache, mode=mode)
@@ -0,0 +1,107 @@
+# 在后台进程中运行 DP 路径规划，避免阻塞 pygame 事件循环。
+# 主线程先查磁盘缓存，未命中时为迷宫快照启动一个专用进程，结果经管道传回；每帧调用 poll() 取回结果。
+# 选择新迷宫时 submit() 会终止尚未完成的旧进程，不会留下仍在占用 CPU 的规划进程。
+
+import multiprocessing
+
+import instrumentation
+from algorithms.dp_path_cache import DPPathCache, maze_cache_key
+from algorithms.dynamic_programming import calculate_dp_path
+
+
+class MazeSnapshot:
+    """可跨进程传递的迷宫快照，只包含规划所需的字段（Maze 本身持有无法序列化的图标表面）"""
+
+    def __init__(self, maze):
+        self.size = maze.size
+        self.grid = maze.pristine_grid.copy()
+        self.pristine_grid = self.grid
+        self.start_pos = maze.start_pos
+        self.end_pos = maze.end_pos
+
+
+def _plan_in_worker(snapshot, planner, pruning, sender):
+    """子进程入口：把 (路径, 分数) 或异常描述发送回主进程"""
+    try:
+        sender.send(('ok', calculate_dp_path(snapshot, pruning=pruning, planner=planner)))
+    except Exception as e:
+        sender.send(('error', repr(e)))
+    finally:
+        sender.close()
+
+
+class BackgroundDPPlanner:
+    """
+    单个规划任务的后台执行器。
+    - submit(maze): 开始规划（缓存命中时立即完成），并终止上一个任务
+    - poll(): 任务完成后返回一次 (路径, 分数)，其余时候返回 None
+    - pending: 是否有尚未取回结果的任务
+    """
+
+    def __init__(self, planner='grid', pruning=False, cache=None):
+        self.planner = planner
+        self.pruning = pruning
+        self.cache = DPPathCache() if cache is None else cache
+        self.process = None
+        self.receiver = None
+        self.key = None
+        self.result = None
+
+    @property
+    def pending(self):
+        return self.process is not None or self.result is not None
+
+    def submit(self, maze):
+        self.cancel()
+        self.key = maze_cache_key(maze, self.planner, self.pruning)
+        hit = self.cache.get(self.key)
+        if hit is not None:
+            instrumentation.count('dp.cache_hits')
+            instrumentation.log('DP Cache', "Hit for maze {}, skipping path planning.", self.key[:12])
+            self.result = hit
+            return
+        context = multiprocessing.get_context()
+        self.receiver, sender = context.Pipe(duplex=False)
+        self.process = context.Process(target=_plan_in_worker, daemon=True,
+                                       args=(MazeSnapshot(maze), self.planner, self.pruning, sender))
+        self.process.start()
+        sender.close()  # 只保留子进程中的发送端，子进程异常退出时 recv() 才会得到 EOFError
+
+    def poll(self):
+        if self.result is not None:
+            result, self.result = self.result, None
+            return result
+        if self.process is None or not self.receiver.poll():
+            return None
+
+        try:
+            status, payload = self.receiver.recv()
+        except EOFError:
+            status, payload = 'error', f"worker exited with code {self.process.exitcode}"
+        self._release()
+        if status != 'ok':
+            print(f"[DP Path] Background planning failed: {payload}")
+            return [], 0
+        path, score = payload
+        self.cache.put(self.key, path, score)
+        return path, score
+
+    def _release(self):
+        """回收已结束的规划进程和管道"""
+        self.process.join()
+        self.process = None
+        self.receiver.close()
+        self.receiver = None
+
+    def cancel(self):
+        """放弃当前任务：仍在运行的规划进程直接终止并回收"""
+        self.result = None
+        if self.process is None:
+            return
+        if self.process.is_alive():
+            self.process.terminate()
+        self._release()
+
+    def shutdown(self):
+        self.cancel()
+        self.cache.flush()
@@ -0,0 +1,63 @@
+# DP 最优路径的磁盘缓存。
+# 键为 迷宫网格字节 + 规划参数 的 SHA-256，值为 (路径, 分数)；所有条目保存在一个 JSON 文件中，
+# 文件格式、LRU 淘汰和写回时机见 algorithms/lru_json_store.py。
+
+import hashlib
+import json
+import os
+
+from config import *
+from algorithms import dynamic_programming
+from algorithms.lru_json_store import LRUJsonStore
+
+CACHE_VERSION = 1
+CACHE_FILENAME = "dp_paths.json"
+
+
+def planner_signature(planner='grid', pruning=False):
+    """影响规划结果的全部参数；任一参数变化都会使旧的缓存条目失效"""
+    return {
+        'version': CACHE_VERSION,
+        'planner': planner,
+        'pruning': pruning,
+        'boss_cost': dynamic_programming.ESTIMATED_BOSS_COST_IN_TURNS,
+        'puzzle_cost': dynamic_programming.ESTIMATED_PUZZLE_COST_IN_TRIES,
+        'quotas': [sorted(dynamic_programming.PHASE1_QUOTAS_SMALL.items()),
+                   sorted(dynamic_programming.PHASE1_QUOTAS_LARGE.items())],
+        'limits': [dynamic_programming.SINGLE_PHASE_RESOURCE_LIMIT,
+                   dynamic_programming.PHASE2_RESOURCE_LIMIT,
+                   dynamic_programming.RESOURCE_PLANNER_LIMIT],
+    }
+
+
+def maze_cache_key(maze, planner='grid', pruning=False):
+    """迷宫初始网格与规划参数的哈希"""
+    digest = hashlib.sha256()
+    digest.update(bytes(maze.pristine_grid.cells))
+    header = {'size': maze.size, 'start': list(maze.start_pos), 'end': list(maze.end_pos),
+              'params': planner_signature(planner, pruning)}
+    digest.update(json.dumps(header, sort_keys=True).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _decode_entry(entry):
+    path = [(int(x), int(y)) for x, y in entry['path']]
+    score = entry['score']
+    if not isinstance(score, (int, float)):
+        raise TypeError("score is not a number")
+    return path, score
+
+
+class DPPathCache(LRUJsonStore):
+    """迷宫 -> (路径, 分数) 的 LRU 缓存，存储与淘汰见 LRUJsonStore"""
+
+    def __init__(self, cache_dir=DP_CACHE_DIR, max_entries=DP_CACHE_MAX_ENTRIES):
+        super().__init__(os.path.join(cache_dir, CACHE_FILENAME), CACHE_VERSION, max_entries, "DP Cache")
+
+    def get(self, key):
+        """命中时返回 (路径, 分数)；未命中或条目损坏时返回 None"""
+        return self.lookup(key, _decode_entry)
+
+    def put(self, key, path, score):
+        self.store(key, {'path': [list(p) for p in path], 'score': score})
+
@@ -0,0 +1,117 @@
+# 动态规划（A*）搜索的状态存储。
+# 两种实现提供相同的接口，_run_a_star_phase 通过 pack/unpack 得到的键来读写状态：
+# - TupleStateStore: 原始布局，dp[(x, y, mask)] = (score, parent, health, gold)
+# - PackedStateStore: 把 (格子, 掩码) 打包成一个 Python int，分数、父状态、生命和金币存放在并行的 array 列中
+
+from array import array
+
+
+class TupleStateStore:
+    """以元组为键和值的字典存储（原始实现）"""
+
+    def __init__(self, size, num_resources):
+        self.dp = {}
+
+    def pack(self, x, y, mask):
+        return (x, y, mask)
+
+    def unpack(self, key):
+        return key
+
+    def heap_entry(self, priority, key):
+        """优先队列元素，按 (priority, key) 排序"""
+        return (priority, key)
+
+    def heap_split(self, entry):
+        """拆分优先队列元素，返回 (priority, key)"""
+        return entry
+
+    def score(self, key):
+        """返回状态当前的最佳分数，不存在时返回 None"""
+        entry = self.dp.get(key)
+        return None if entry is None else entry[0]
+
+    def get(self, key):
+        """返回 (score, health, gold)"""
+        score, _, health, gold = self.dp[key]
+        return score, health, gold
+
+    def parent(self, key):
+        return self.dp[key][1]
+
+    def put(self, key, score, parent, health, gold):
+        self.dp[key] = (score, parent, health, gold)
+
+    def __len__(self):
+        return len(self.dp)
+
+
+class PackedStateStore:
+    """
+    紧凑存储：键为 ((x * size + y) << 资源数) | mask。
+    键的大小顺序与 (x, y, mask) 元组的字典序一致，因此优先队列中同分状态的出队顺序不变。
+    字典只保存 键 -> 行号，分数、父状态、生命和金币存放在并行的 array 列中；
+    优先队列元素也合并为单个整数 (priority << 键位数) | key，排序结果与 (priority, key) 元组相同。
+    """
+
+    def __init__(self, size, num_resources):
+        self.size = size
+        self.mask_bits = num_resources
+        self.mask_filter = (1 << num_resources) - 1
+        self.key_bits = (size * size - 1).bit_length() + num_resources
+        self.key_filter = (1 << self.key_bits) - 1
+        self.slots = {}
+        # 键超过 63 位时 array('q') 放不下父状态，退回到普通列表
+        self.scores = array('q')
+        self.parents = [] if self.key_bits > 63 else array('q')
+        self.healths = array('h')
+        self.golds = array('q')
+
+    def pack(self, x, y, mask):
+        return ((x * self.size + y) << self.mask_bits) | mask
+
+    def unpack(self, key):
+        x, y = divmod(key >> self.mask_bits, self.size)
+        return x, y, key & self.mask_filter
+
+    def heap_entry(self, priority, key):
+        return (priority << self.key_bits) | key
+
+    def heap_split(self, entry):
+        return entry >> self.key_bits, entry & self.key_filter
+
+    def score(self, key):
+        slot = self.slots.get(key)
+        return None if slot is None else self.scores[slot]
+
+    def get(self, key):
+        slot = self.slots[key]
+        return self.scores[slot], self.healths[slot], self.golds[slot]
+
+    def parent(self, key):
+        parent = self.parents[self.slots[key]]
+        return None if parent == -1 else parent
+
+    def put(self, key, score, parent, health, gold):
+        parent = -1 if parent is None else parent
+        slot = self.slots.get(key)
+        if slot is None:
+            self.slots[key] = len(self.scores)
+            self.scores.append(score)
+            self.parents.append(parent)
+            self.healths.append(health)
+            self.golds.append(gold)
+        else:
+            self.scores[slot] = score
+            self.parents[slot] = parent
+            self.healths[slot] = health
+            self.golds[slot] = gold
+
+    def __len__(self):
+        return len(self.slots)
+
+
+STATE_STORES = {
+    'tuple': TupleStateStore,
+    'packed': PackedStateStore,
+}
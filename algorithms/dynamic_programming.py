@@ -1,20 +1,54 @@
 from config import *
 import numpy as np
 import heapq
+import time
 from collections import defaultdict
+import instrumentation
+from algorithms.dp_state_store import STATE_STORES
+from utils import bfs_distances, bfs_path
 
 # 为动态规划（路径规划）设定预估成本
 # 这些成本现在是DP算法内部的启发式参数，用于评估复杂目标的未来消耗。
 ESTIMATED_BOSS_COST_IN_TURNS = 10  # 预估Boss战需要的回合数 (对应资源值扣减)
 ESTIMATED_PUZZLE_COST_IN_TRIES = 30 # 预估解谜的尝试次数 (对应资源值扣减)
 
+# grid 模式下各阶段参与搜索的资源数上限（状态数随资源数指数增长）
+PHASE1_QUOTAS_SMALL = {GOLD: 20}  # 迷宫尺寸 <= 15 时第一阶段的资源配额
+PHASE1_QUOTAS_LARGE = {GOLD: 30}  # 迷宫尺寸 > 15 时第一阶段的资源配额
+SINGLE_PHASE_RESOURCE_LIMIT = 18  # 没有 Boss 时单阶段搜索的资源数
+PHASE2_RESOURCE_LIMIT = 14        # 第二阶段（Boss -> 终点）的资源数
 
-def _run_a_star_phase(maze, start_pos, end_pos, resources, initial_context):
+
+# 剪枝模式下，拾取各类资源对最终得分（score + 生命 * 2 + 金币 * 3）的最大增益，用于上界估计
+# 金币: +50 分且金币 +10（终点折算 +30）；宝箱: +70；Boss: +590；陷阱只会减分，增益为 0
+_MAX_FINAL_GAIN = {
+    GOLD: 50 + 10 * 3,
+    LOCKER: 100 - ESTIMATED_PUZZLE_COST_IN_TRIES,
+    BOSS: 600 - ESTIMATED_BOSS_COST_IN_TURNS,
+    TRAP: 0,
+}
+
+
+def _run_a_star_phase(maze, start_pos, end_pos, resources, initial_context, state_store='packed',
+                      pruning=False, stats=None):
     """
     A*搜索阶段函数。
+    返回 (终点处最优状态的键, 状态存储)，状态存储的接口见 dp_state_store。
+    pruning=True 时启用剪枝模式（结果的最优得分不变）：
+    - 启发式改为“当前最终得分 + 剩余资源增益上界 - BFS 到终点的距离”，当队首上界不超过
+      已找到的最优终点得分时提前结束
+    - 支配剪枝：同一格子上存在掩码为其超集、陷阱相同且潜力值不低的状态时，丢弃该状态
+    stats 若给出，写入 expanded（展开）/ pushed（入队）/ pruned（入队前剪掉）/ skipped（出队后跳过）/ states 计数。
     """
     size = maze.size
-    dp = {}
+    cells = maze.grid.cells
+    dp = STATE_STORES[state_store](size, len(resources))
+
+    # 格子编号 -> 资源在 resources 中的位序（即掩码中的位），无资源为 -1；每个阶段只构建一次
+    resource_at = [-1] * (size * size)
+    for i, (rx, ry, _) in enumerate(resources):
+        if resource_at[ry * size + rx] == -1:
+            resource_at[ry * size + rx] = i
 
     def heuristic(x, y):
         return abs(x - end_pos[0]) + abs(y - end_pos[1])
@@ -29,30 +63,116 @@ def _run_a_star_phase(maze, start_pos, end_pos, resources, initial_context):
         if res_type == BOSS: return 600 - ESTIMATED_BOSS_COST_IN_TURNS if health > 30 else -float('inf')
         return 0
 
+    if pruning:
+        dist_to_goal = bfs_distances(cells, size, end_pos)
+        resource_gains = [_MAX_FINAL_GAIN.get(res_type, 0) for _, _, res_type in resources]
+        # 阶段内生命值只取决于掩码中已触发的陷阱，陷阱位相同即生命相同
+        trap_bits = sum(1 << i for i, (_, _, res_type) in enumerate(resources) if res_type == TRAP)
+        remaining_gain_cache = {}
+        labels = defaultdict(dict)  # 格子编号 -> {mask: 潜力值}，只保留未被支配的状态
+        # 支配只可能发生在同一格、陷阱位相同的状态之间，且支配者的掩码位数更多：
+        # (格子编号, 陷阱位) -> {掩码位数: [{mask: 潜力值}, 潜力值下限, 潜力值上限, 掩码并集, 掩码交集]}。
+        # 这些汇总只在登记时更新、删除时不收紧，仍是有效的界，用来整桶跳过不可能满足条件的比较
+        label_buckets = defaultdict(dict)
+
+        def remaining_gain(mask):
+            """尚未拾取的资源可能带来的最大增益"""
+            gain = remaining_gain_cache.get(mask)
+            if gain is None:
+                gain = sum(g for i, g in enumerate(resource_gains) if not mask & (1 << i))
+                remaining_gain_cache[mask] = gain
+            return gain
+
+        def potential(score, health, gold, mask):
+            """当前最终得分 + 剩余资源增益上界；再减去到终点的 BFS 距离即为可采纳上界"""
+            return score + health * 2 + gold * 3 + remaining_gain(mask)
+
+        def admit_label(cell, mask, value):
+            """
+            同一格上存在掩码为真超集、陷阱位相同且潜力值不低的状态时，本状态被支配，返回 False：
+            两者生命相同，沿任意后续路线的拾取结果一致，本状态至多再多拿差集中的增益，
+            而潜力值已把这部分增益计入。否则登记（或更新）本状态的潜力值并返回 True。
+            同一遍扫描中移除被本状态支配的旧状态（掩码为真子集、潜力值不高）；即使本状态随后被判为被支配，
+            这些旧状态也同样被那个支配者支配，移除依然成立。
+            只扫描同一陷阱位下可能满足条件的桶：找支配者时要求位数更多、潜力值上限不低于 value 且并集覆盖 mask；
+            找被支配者时要求位数更少、下限不高于 value 且交集包含于 mask。
+            """
+            buckets = label_buckets[(cell, mask & trap_bits)]
+            cell_labels = labels[cell]
+            bits = bin(mask).count('1')
+            for count, entry in buckets.items():
+                bucket, low, high, union, common = entry
+                if count > bits:
+                    if high >= value and union & mask == mask:
+                        for other, other_value in bucket.items():
+                            if other_value >= value and other & mask == mask:
+                                return False
+                elif count < bits and low <= value and common & mask == common:
+                    dominated = [other for other, other_value in bucket.items()
+                                 if other_value <= value and other & mask == other]
+                    for other in dominated:
+                        del bucket[other]
+                        del cell_labels[other]
+
+            entry = buckets.get(bits)
+            if entry is None:
+                buckets[bits] = [{mask: value}, value, value, mask, mask]
+            else:
+                entry[0][mask] = value
+                if value < entry[1]:
+                    entry[1] = value
+                if value > entry[2]:
+                    entry[2] = value
+                entry[3] |= mask
+                entry[4] &= mask
+            cell_labels[mask] = value
+            return True
+
     # 初始化A*搜索的起点
-    initial_state = (start_pos[0], start_pos[1], 0)
+    initial_state = dp.pack(start_pos[0], start_pos[1], 0)
     initial_score = initial_context['score']
-    dp[initial_state] = (
-        initial_score,
-        initial_context.get('prev_state'),
-        initial_context['health'],
-        initial_context['gold']
-    )
-
-    pq = [(heuristic(start_pos[0], start_pos[1]) - initial_score, initial_state)]
+    initial_health, initial_gold = initial_context['health'], initial_context['gold']
+    dp.put(initial_state, initial_score, None, initial_health, initial_gold)
+
+    if pruning:
+        start_cell = start_pos[1] * size + start_pos[0]
+        if dist_to_goal[start_cell] == -1:
+            return None, dp
+        initial_value = potential(initial_score, initial_health, initial_gold, 0)
+        admit_label(start_cell, 0, initial_value)
+        initial_priority = dist_to_goal[start_cell] - initial_value
+    else:
+        initial_priority = heuristic(start_pos[0], start_pos[1]) - initial_score
+    pq = [dp.heap_entry(initial_priority, initial_state)]
 
     best_at_end = None
     best_score_at_end = float('-inf')
-    visited_count = 0
+    expanded = pushed = pruned = skipped = 0
+    # 埋点开关在循环外读取一次，关闭时循环内只多一次局部布尔判断
+    trace = instrumentation.ENABLED
+    max_queue = 0
+    started = time.perf_counter()
 
     while pq:
-        visited_count += 1
-        if visited_count % 500 == 0:
-            print(f"  [A* Status] Visited states: {visited_count}, Queue size: {len(pq)}")
-
-        _, current = heapq.heappop(pq)
-        current_score, _, health, gold = dp[current]
-        x, y, resources_mask = current
+        if trace and len(pq) > max_queue:
+            max_queue = len(pq)
+
+        priority, current = dp.heap_split(heapq.heappop(pq))
+        current_score, health, gold = dp.get(current)
+        x, y, resources_mask = dp.unpack(current)
+
+        if pruning:
+            cell = y * size + x
+            # 上界不超过已知最优时，队列中剩余状态都不可能更优
+            if -priority <= best_score_at_end:
+                break
+            # 过期的队列元素（该状态之后被更高分数更新过）或入队后被新状态支配、已移出标签的状态直接跳过
+            if labels[cell].get(resources_mask) != dist_to_goal[cell] - priority:
+                skipped += 1
+                continue
+            # 后继状态的剩余增益在此基础上扣除新拾取资源的增益，不必逐个掩码求和
+            current_gain = remaining_gain(resources_mask)
+        expanded += 1
 
         if (x, y) == end_pos:
             # 到达终点时，计算最终得分（包括剩余生命和金币的奖励）
@@ -64,16 +184,16 @@ def _run_a_star_phase(maze, start_pos, end_pos, resources, initial_context):
 
         for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
             next_x, next_y = x + dx, y + dy
-            if not (0 <= next_x < size and 0 <= next_y < size and maze.grid[next_y][next_x].type != WALL):
+            if not (0 <= next_x < size and 0 <= next_y < size and cells[next_y * size + next_x] != WALL):
                 continue
 
             new_health, new_gold, new_mask, score_change = health, gold, resources_mask, 0
 
-            for i, (rx, ry, res_type) in enumerate(resources):
-                if (rx, ry) == (next_x, next_y) and not (new_mask & (1 << i)):
-                    reward = calculate_reward(res_type, new_health, new_gold)
-                    if reward == -float('inf'): continue
-
+            i = resource_at[next_y * size + next_x]
+            if i != -1 and not (new_mask & (1 << i)):
+                res_type = resources[i][2]
+                reward = calculate_reward(res_type, new_health, new_gold)
+                if reward != -float('inf'):
                     # 模拟拾取资源后的状态变化（这部分用于路径模拟，非最终计分）
                     temp_health, temp_gold = new_health, new_gold
                     if res_type == TRAP:
@@ -86,46 +206,277 @@ def _run_a_star_phase(maze, start_pos, end_pos, resources, initial_context):
                         new_health, new_gold = temp_health, temp_gold
                         new_mask |= (1 << i)
                         score_change += reward
-                    break
 
-            new_state = (next_x, next_y, new_mask)
+            new_state = dp.pack(next_x, next_y, new_mask)
             new_score = current_score + score_change - 1
 
-            if new_state not in dp or new_score > dp[new_state][0]:
-                dp[new_state] = (new_score, current, new_health, new_gold)
-                f_value = -new_score + heuristic(next_x, next_y)
-                heapq.heappush(pq, (f_value, new_state))
-
+            best_known = dp.score(new_state)
+            if best_known is None or new_score > best_known:
+                if pruning:
+                    next_cell = next_y * size + next_x
+                    next_dist = dist_to_goal[next_cell]
+                    gain = current_gain if new_mask == resources_mask else current_gain - resource_gains[i]
+                    value = new_score + new_health * 2 + new_gold * 3 + gain  # 即 potential(...)，内联以省去两次调用
+                    if next_dist == -1 or value - next_dist <= best_score_at_end or \
+                            not admit_label(next_cell, new_mask, value):
+                        pruned += 1
+                        continue
+                    dp.put(new_state, new_score, current, new_health, new_gold)
+                    f_value = next_dist - value
+                else:
+                    dp.put(new_state, new_score, current, new_health, new_gold)
+                    f_value = -new_score + heuristic(next_x, next_y)
+                pushed += 1
+                heapq.heappush(pq, dp.heap_entry(f_value, new_state))
+
+    if stats is not None:
+        stats.update(expanded=expanded, pushed=pushed, pruned=pruned, skipped=skipped, states=len(dp))
+    if trace:
+        instrumentation.phase('dp.a_star', expanded=expanded, pushed=pushed, pruned=pruned, skipped=skipped,
+                              states=len(dp), max_queue=max_queue, seconds=time.perf_counter() - started)
     return best_at_end, dp
 
 
-def calculate_dp_path(maze):
+def _reconstruct_phase_path(dp, state, stop_at=None):
+    """沿父状态回溯，返回该阶段从起点到 state 的坐标路径；遇到与 stop_at 相同的 (x, y, mask) 时停止"""
+    path = []
+    while state is not None:
+        x, y, mask = dp.unpack(state)
+        if (x, y, mask) == stop_at:
+            break
+        path.append((x, y))
+        state = dp.parent(state)
+    path.reverse()
+    return path
+
+
+# 资源图规划模式一次最多对这么多个资源做 Held-Karp（状态数为 2^n * n）
+RESOURCE_PLANNER_LIMIT = 18
+
+
+def _replay_path(cells, size, path, context, collected):
+    """
+    按网格 A* 的拾取规则重放路径：每步 -1 分，首次踏上金币 / 宝箱 / 陷阱时结算（陷阱致死则不触发）。
+    collected 为已拾取的格子编号集合，会被原地更新。返回 (score, health, gold)。
+    """
+    score, health, gold = context['score'], context['health'], context['gold']
+    for x, y in path[1:]:
+        score -= 1
+        cell = y * size + x
+        if cell in collected:
+            continue
+        tile_type = cells[cell]
+        if tile_type == GOLD:
+            score, gold = score + 50, gold + 10
+        elif tile_type == LOCKER:
+            score += 100 - ESTIMATED_PUZZLE_COST_IN_TRIES
+        elif tile_type == TRAP and health - 20 > 0:
+            score, health = score - 30, health - 20
+        else:
+            continue
+        collected.add(cell)
+    return score, health, gold
+
+
+def _held_karp(start_dist, pair_dist, goal_dist, gains, direct_dist):
+    """
+    奖励收集型 Held-Karp：起点和终点固定，可任选资源子集并决定访问顺序，
+    最大化 “增益之和 - 总步数”。dp[mask, k] 为访问完 mask、停在资源 k 时的最优值，
+    按掩码中 1 的个数逐层用 numpy 向量化转移。返回 (访问顺序, 最优值)。
+    """
+    n = len(gains)
+    best_order, best_value = [], -direct_dist
+    if n == 0:
+        return best_order, best_value
+
+    full = 1 << n
+    bits = 1 << np.arange(n)
+    gains = np.asarray(gains, dtype=np.float32)
+    edge = gains[None, :] - np.asarray(pair_dist, dtype=np.float32)  # edge[j, k]: 从 j 走到 k 并拾取 k
+    dp = np.full((full, n), -np.inf, dtype=np.float32)
+    parent = np.full((full, n), -1, dtype=np.int8)
+    dp[bits, np.arange(n)] = gains - np.asarray(start_dist, dtype=np.float32)
+
+    masks = np.arange(full)
+    popcount = np.zeros(full, dtype=np.int8)
+    for i in range(n):
+        popcount += (masks >> i) & 1
+
+    for layer_size in range(1, n):
+        layer = masks[popcount == layer_size]
+        values = dp[layer]
+        for k in range(n):
+            free = (layer & bits[k]) == 0
+            candidates = values[free] + edge[:, k]
+            choice = candidates.argmax(axis=1)
+            targets = layer[free] | bits[k]
+            dp[targets, k] = candidates[np.arange(len(choice)), choice]
+            parent[targets, k] = choice
+
+    finals = dp - np.asarray(goal_dist, dtype=np.float32)[None, :]
+    mask, last = np.unravel_index(finals.argmax(), finals.shape)
+    if finals[mask, last] <= best_value:
+        return best_order, best_value
+
+    best_value = float(finals[mask, last])
+    mask, last = int(mask), int(last)
+    while last != -1:
+        best_order.append(last)
+        previous = int(parent[mask, last])
+        mask ^= 1 << last
+        last = previous
+    best_order.reverse()
+    return best_order, best_value
+
+
+def _plan_resource_route(maze, start_pos, end_pos, collected, avoid, stats):
+    """
+    对起点、终点和各资源分别 BFS 建立距离矩阵（avoid 中的格子不可通行），在资源上做 Held-Karp，
+    再用 BFS 把选中的访问顺序展开成格子路径。
+    返回 (路径, 因 avoid 而不可达的资源数)，终点不可达时路径为 None。
+    """
+    size = maze.size
+    cells = maze.grid.cells
+    start_cell = start_pos[1] * size + start_pos[0]
+    end_cell = end_pos[1] * size + end_pos[0]
+
+    start_field = bfs_distances(cells, size, start_pos, avoid)
+    if start_field[end_cell] == -1:
+        return None, 0
+    goal_field = bfs_distances(cells, size, end_pos, avoid)
+
+    candidates, unreachable = [], 0
+    for cell, tile_type in enumerate(cells):
+        if tile_type not in (GOLD, LOCKER) or cell in collected or cell in (start_cell, end_cell):
+            continue
+        if start_field[cell] == -1:
+            unreachable += 1
+        else:
+            candidates.append(cell)
+    # 资源过多时保留绕行代价最小的若干个；未入选的资源若恰好在路线上，重放时仍会拾取
+    direct = start_field[end_cell]
+    candidates.sort(key=lambda cell: start_field[cell] + goal_field[cell] - direct)
+    candidates = candidates[:RESOURCE_PLANNER_LIMIT]
+
+    fields = [bfs_distances(cells, size, (cell % size, cell // size), avoid) for cell in candidates]
+    pair_dist = [[field[other] for other in candidates] for field in fields]
+    gains = [_MAX_FINAL_GAIN[cells[cell]] for cell in candidates]
+    order, _ = _held_karp([start_field[cell] for cell in candidates], pair_dist,
+                          [goal_field[cell] for cell in candidates], gains, direct)
+    if stats is not None:
+        stats.append({'resources': len(candidates), 'states': (1 << len(candidates)) * len(candidates)})
+    instrumentation.phase('dp.resource_route', resources=len(candidates), avoid_traps=avoid is not None)
+
+    waypoints = [start_pos] + [(candidates[i] % size, candidates[i] // size) for i in order] + [end_pos]
+    path = [start_pos]
+    for source, target in zip(waypoints, waypoints[1:]):
+        path += bfs_path(cells, size, source, target, avoid)[1:]
+    return path, unreachable
+
+
+def _run_resource_phase(maze, start_pos, end_pos, context, collected, stats):
+    """
+    资源图规划的单个阶段。先绕开陷阱规划；若因此有资源或终点不可达，再允许踩陷阱规划一次，
+    按重放后的最终得分取较优者。返回 (路径, (score, health, gold))，终点不可达时返回 (None, None)。
+    """
+    cells = maze.grid.cells
+    traps = {cell for cell, tile_type in enumerate(cells) if tile_type == TRAP and cell not in collected}
+
+    best = None
+    for avoid in (traps, None):
+        path, unreachable = _plan_resource_route(maze, start_pos, end_pos, collected, avoid, stats)
+        if path is not None:
+            picked = set(collected)
+            score, health, gold = result = _replay_path(cells, maze.size, path, context, picked)
+            value = score + health * 2 + gold * 3
+            if best is None or value > best[0]:
+                best = (value, path, result, picked)
+        if path is not None and not unreachable:
+            break
+
+    if best is None:
+        return None, None
+    _, path, result, picked = best
+    collected |= picked
+    return path, result
+
+
+def _calculate_resource_path(maze, stats=None):
+    """资源图规划模式：阶段划分与 calculate_dp_path 相同（起点 -> Boss -> 终点），但不再按配额截断资源"""
+    phase_stats = None if stats is None else stats.setdefault('phases', [])
+    context = {'score': 0, 'health': 100, 'gold': 20}
+    collected = set()
+    cells = maze.grid.cells
+    boss_pos = next(((cell % maze.size, cell // maze.size) for cell, tile_type in enumerate(cells)
+                     if tile_type == BOSS), None)
+
+    if not boss_pos:
+        instrumentation.log('DP Path', "No boss found. Planning over resources directly to end.")
+        path, result = _run_resource_phase(maze, maze.start_pos, maze.end_pos, context, collected, phase_stats)
+        if path is None: return [], 0
+        return path, result[0]
+
+    path_p1, result_p1 = _run_resource_phase(maze, maze.start_pos, boss_pos, context, collected, phase_stats)
+    if path_p1 is None:
+        instrumentation.log('DP Path', "CRITICAL: Could not find a path to the boss.")
+        return [], 0
+    context_p2 = dict(zip(('score', 'health', 'gold'), result_p1))
+
+    path_p2, result_p2 = _run_resource_phase(maze, boss_pos, maze.end_pos, context_p2, collected, phase_stats)
+    if path_p2 is None:
+        instrumentation.log('DP Path', "CRITICAL: Could not find a path from boss to end.")
+        return [], 0
+
+    end_score, end_health, end_gold = result_p2
+    return path_p1 + path_p2[1:], end_score + end_health * 2 + end_gold * 3
+
+
+def calculate_dp_path(maze, state_store='packed', pruning=False, planner='grid', stats=None):
     """
     核心入口函数
+    - state_store: 'packed'（紧凑整数编码 + 并行数组列）或 'tuple'（原始字典布局）
+    - pruning: 启用支配剪枝与可采纳上界（最优得分不变，展开的状态数减少）
+    - planner: 'grid'（逐格 A*，资源按配额截断）或 'resource'（资源距离矩阵 + Held-Karp，见 _calculate_resource_path）
+    - stats: 可选字典，stats['phases'] 为每个阶段的计数；grid 模式为 expanded / pushed / pruned / states，
+      resource 模式为 resources / states
     """
+    with instrumentation.profile(), instrumentation.timer(f'dp.plan.{planner}'):
+        if planner == 'resource':
+            return _calculate_resource_path(maze, stats)
+        return _calculate_grid_path(maze, state_store, pruning, stats)
+
+
+def _calculate_grid_path(maze, state_store, pruning, stats):
+    """逐格 A* 规划：起点 -> Boss、Boss -> 终点两个阶段，每阶段的资源按配额截断"""
+    phase_stats = []
+    if stats is not None:
+        stats['phases'] = phase_stats
+
+    def run_phase(start_pos, end_pos, resources, context):
+        counters = {}
+        result = _run_a_star_phase(maze, start_pos, end_pos, resources, context, state_store, pruning, counters)
+        phase_stats.append(counters)
+        return result
+
     all_resources = []
     boss_pos = None
+    cells = maze.grid.cells
     for y in range(maze.size):
         for x in range(maze.size):
-            tile_type = maze.grid[y][x].type
+            tile_type = cells[y * maze.size + x]
             if tile_type in {GOLD, LOCKER, TRAP, BOSS}:
                 if tile_type == BOSS: boss_pos = (x, y)
                 all_resources.append((x, y, tile_type))
 
     if not boss_pos:
-        print("[DP Path] No boss found. Running single-phase A* to end.")
-        resources = sorted(all_resources, key=lambda r: r[2], reverse=True)[:18]
-        best_end_state, dp = _run_a_star_phase(maze, maze.start_pos, maze.end_pos, resources,
-                                               {'score': 0, 'health': 100, 'gold': 20})
-        if not best_end_state: return [], 0
-        path, score = [], dp[best_end_state][0]
-        curr = best_end_state
-        while curr:
-            path.append((curr[0], curr[1]));
-            curr = dp[curr][1]
-        return list(reversed(path)), score
-
-    print(f"\n[DP Path] Starting Phase 1: Start {maze.start_pos} -> Boss {boss_pos}")
+        instrumentation.log('DP Path', "No boss found. Running single-phase A* to end.")
+        resources = sorted(all_resources, key=lambda r: r[2], reverse=True)[:SINGLE_PHASE_RESOURCE_LIMIT]
+        best_end_state, dp = run_phase(maze.start_pos, maze.end_pos, resources,
+                                       {'score': 0, 'health': 100, 'gold': 20})
+        if best_end_state is None: return [], 0
+        return _reconstruct_phase_path(dp, best_end_state), dp.get(best_end_state)[0]
+
+    instrumentation.log('DP Path', "Starting Phase 1: Start {} -> Boss {}", maze.start_pos, boss_pos)
     
     resources_by_type = defaultdict(list)
     for res in all_resources:
@@ -134,9 +485,9 @@ def calculate_dp_path(maze):
 
     # 资源配额现在只包含金币
     if maze.size <= 15:
-        quotas = {GOLD: 20}
+        quotas = PHASE1_QUOTAS_SMALL
     else:
-        quotas = {GOLD: 30}
+        quotas = PHASE1_QUOTAS_LARGE
 
     resources_p1 = []
     sorted_types = sorted(quotas.keys(), reverse=True)
@@ -150,22 +501,21 @@ def calculate_dp_path(maze):
         )
         resources_p1.extend(candidates[:quota])
 
-    best_boss_state, dp1 = _run_a_star_phase(maze, maze.start_pos, boss_pos, resources_p1,
-                                             {'score': 0, 'health': 100, 'gold': 20})
+    best_boss_state, dp1 = run_phase(maze.start_pos, boss_pos, resources_p1,
+                                     {'score': 0, 'health': 100, 'gold': 20})
 
-    if not best_boss_state:
-        print("[DP Path] CRITICAL: Could not find a path to the boss.")
+    if best_boss_state is None:
+        instrumentation.log('DP Path', "CRITICAL: Could not find a path to the boss.")
         return [], 0
-    print(f"[DP Path] Phase 1 Complete! Arrived at boss with score {dp1[best_boss_state][0]:.0f}.")
+    s1_score, s1_health, s1_gold = dp1.get(best_boss_state)
+    instrumentation.log('DP Path', "Phase 1 Complete! Arrived at boss with score {:.0f}.", s1_score)
 
-    s1_score, _, s1_health, s1_gold = dp1[best_boss_state]
-    s1_mask = best_boss_state[2]
+    s1_mask = dp1.unpack(best_boss_state)[2]
 
     context_p2 = {
         'score': s1_score,
         'health': s1_health,
         'gold': s1_gold,
-        'prev_state': best_boss_state
     }
 
     res_p1_set = set(resources_p1)
@@ -173,28 +523,24 @@ def calculate_dp_path(maze):
     for res in all_resources:
         if res not in res_p1_set and res[2] != BOSS:
             resources_p2.append(res)
-    resources_p2 = sorted(resources_p2, key=lambda r: r[2], reverse=True)[:14]
+    resources_p2 = sorted(resources_p2, key=lambda r: r[2], reverse=True)[:PHASE2_RESOURCE_LIMIT]
 
-    print(f"\n[DP Path] Starting Phase 2: Boss {boss_pos} -> End {maze.end_pos}")
-    best_end_state, dp2 = _run_a_star_phase(maze, boss_pos, maze.end_pos, resources_p2, context_p2)
+    instrumentation.log('DP Path', "Starting Phase 2: Boss {} -> End {}", boss_pos, maze.end_pos)
+    best_end_state, dp2 = run_phase(boss_pos, maze.end_pos, resources_p2, context_p2)
 
-    if not best_end_state:
-        print("[DP Path] CRITICAL: Could not find a path from boss to end.")
+    if best_end_state is None:
+        instrumentation.log('DP Path', "CRITICAL: Could not find a path from boss to end.")
         return [], 0
-    print("[DP Path] Phase 2 Complete! Path to end found.")
-
-    path, final_score = [], dp2[best_end_state][0] + dp2[best_end_state][2] * 2 + dp2[best_end_state][3] * 3
+    instrumentation.log('DP Path', "Phase 2 Complete! Path to end found.")
 
-    curr = best_end_state
-    while curr and curr != best_boss_state:
-        path.append((curr[0], curr[1]))
-        curr = dp2[curr][1]
+    end_score, end_health, end_gold = dp2.get(best_end_state)
+    final_score = end_score + end_health * 2 + end_gold * 3
 
-    curr = best_boss_state
-    while curr:
-        path.append((curr[0], curr[1]))
-        curr = dp1[curr][1]
+    # 第二阶段回溯到与第一阶段终态相同的 (x, y, mask) 即止，随后接上第一阶段的路径
+    boss_state = dp1.unpack(best_boss_state)
+    path = _reconstruct_phase_path(dp1, best_boss_state) + \
+        _reconstruct_phase_path(dp2, best_end_state, stop_at=boss_state)
 
-    print("[DP Path] Final path reconstruction complete.")
+    instrumentation.log('DP Path', "Final path reconstruction complete.")
 
-    return list(reversed(path)), final_score
+    return path, final_score
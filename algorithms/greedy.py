@@ -1,6 +1,6 @@
 import random
 from config import *
-from utils import bfs_path_avoiding_history
+from utils import bfs_path_avoiding_history, bfs_multi_target
 
 def get_tile_value(tile_type, player):
     """
@@ -30,8 +30,9 @@ def decide_move_greedy(player, maze):
     严格遵循“视野受限”原则，只在有限视野内寻找性价比最高的资源。
     """
     history_set = set(player.path_history)
+    cells, size = maze.grid.cells, maze.size
     view_radius = 3  # 3x3 视野
-    local_targets = []
+    candidates = []
 
     # 1. 扫描视野内的所有地块
     for r_offset in range(-view_radius, view_radius + 1):
@@ -41,33 +42,34 @@ def decide_move_greedy(player, maze):
 
             tx, ty = player.x + c_offset, player.y + r_offset
 
-            if 0 <= tx < maze.size and 0 <= ty < maze.size:
-                tile_type = maze.grid[ty][tx].type
+            if 0 <= tx < size and 0 <= ty < size:
+                tile_type = cells[ty * size + tx]
                 
                 # 2. 只关注有价值的资源
                 if tile_type in {GOLD, LOCKER, BOSS}:
                     value = get_tile_value(tile_type, player)
                     if value > 0:
-                        # 3. 计算到视野内资源的实际距离
-                        path = bfs_path_avoiding_history(
-                            start=(player.x, player.y),
-                            end=(tx, ty),
-                            maze_grid=maze.grid,
-                            history_path=history_set
-                        )
-                        if path:
-                            distance = len(path) - 1
-                            if distance > 0:
-                                # 4. 计算“性价比”（单位距离收益）
-                                score = value / distance
-                                local_targets.append({'score': score, 'pos': (tx, ty), 'path': path})
+                        candidates.append((ty * size + tx, value))
+
+    # 3. 一次 BFS 同时求出到视野内所有资源的实际距离（遵循相同的避开历史路径规则）
+    local_targets = []
+    if candidates:
+        avoid = {y * size + x for x, y in history_set}
+        reached = bfs_multi_target(cells, size, (player.x, player.y),
+                                   {cell for cell, _ in candidates}, avoid)
+        for cell, value in candidates:
+            if cell in reached:
+                distance, first_step = reached[cell]
+                # 4. 计算“性价比”（单位距离收益）
+                score = value / distance
+                local_targets.append({'score': score, 'pos': (cell % size, cell // size), 'first_step': first_step})
 
     # 5. 从视野内的目标中，选择性价比最高的一个
     if local_targets:
         best_target = max(local_targets, key=lambda x: x['score'])
         # 移动向该目标路径上的下一步
-        next_step = best_target['path'][1]
-        return (next_step[0] - player.x, next_step[1] - player.y)
+        next_x, next_y = best_target['first_step'] % size, best_target['first_step'] // size
+        return (next_x - player.x, next_y - player.y)
 
     # 6. 备用策略：如果视野内没有任何有价值的目标，则朝终点移动以进行探索
     path_to_end = bfs_path_avoiding_history(start=(player.x, player.y), end=maze.end_pos, maze_grid=maze.grid, history_path=history_set)
@@ -77,7 +79,7 @@ def decide_move_greedy(player, maze):
     # 7. 最后手段：如果被困，尝试随机移动
     for dx, dy in sorted([(0, 1), (0, -1), (1, 0), (-1, 0)], key=lambda k: random.random()):
         nx, ny = player.x + dx, player.y + dy
-        if (nx, ny) not in history_set and (0 <= nx < maze.size and 0 <= ny < maze.size and maze.grid[ny][nx].type != WALL):
+        if (nx, ny) not in history_set and (0 <= nx < size and 0 <= ny < size and cells[ny * size + nx] != WALL):
             return (dx, dy)
     
     return (0, 0)
@@ -0,0 +1,85 @@
+# DP 路径缓存与密码锁缓存共用的 LRU 存储：条目保存在一个带版本号的 JSON 文件中。
+# dict 的插入顺序即使用顺序，最久未用的条目在最前，超过容量时从前面淘汰。
+# 文件损坏或版本不符时视为空缓存，下次写入时覆盖；写入先写临时文件再替换，避免中途退出留下半个文件。
+# 命中只在内存中调整使用顺序，文件在 store() 或 flush()（退出前调用）时才重写。
+# 具体的缓存只负责构造键以及条目的编码 / 解码。
+
+import json
+import os
+
+
+class LRUJsonStore:
+    """
+    - path: JSON 文件路径，为 None 时只保存在内存中
+    - version: 文件格式版本，与文件中记录的不同时丢弃旧内容
+    - label: 日志前缀，如 "DP Cache"
+    """
+
+    def __init__(self, path, version, max_entries, label):
+        self.path = path
+        self.version = version
+        self.max_entries = max_entries
+        self.label = label
+        self.entries = self._load() if path else {}
+        self.dirty = False  # 内存中的使用顺序或条目与文件不一致
+
+    def _load(self):
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            print(f"[{self.label}] Ignoring unreadable cache '{self.path}': {e}")
+            return {}
+        if not isinstance(data, dict) or data.get('version') != self.version or \
+                not isinstance(data.get('entries'), dict):
+            print(f"[{self.label}] Ignoring cache '{self.path}' with unexpected format.")
+            return {}
+        return data['entries']
+
+    def _save(self):
+        if self.path is None:
+            self.dirty = False
+            return
+        temp_path = self.path + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(temp_path, 'w') as f:
+                json.dump({'version': self.version, 'entries': self.entries}, f)
+            os.replace(temp_path, self.path)
+            self.dirty = False
+        except OSError as e:
+            print(f"[{self.label}] Failed to write cache '{self.path}': {e}")
+
+    def lookup(self, key, decode):
+        """
+        命中时返回 decode(条目) 并把条目移到最近使用的位置；未命中时返回 None。
+        decode 抛出 KeyError / TypeError / ValueError 表示条目损坏，该条目被丢弃。
+        """
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return None
+        self.dirty = True
+        try:
+            value = decode(entry)
+        except (KeyError, TypeError, ValueError):
+            return None
+        self.entries[key] = entry
+        return value
+
+    def store(self, key, entry):
+        """写入可 JSON 序列化的条目，必要时淘汰最久未用的条目，并立即写回文件"""
+        self.entries.pop(key, None)
+        self.entries[key] = entry
+        while len(self.entries) > self.max_entries:
+            del self.entries[next(iter(self.entries))]
+        self._save()
+
+    def flush(self):
+        """把命中后调整过的使用顺序写回文件；没有变化时不写"""
+        if self.dirty:
+            self._save()
+
+    def __len__(self):
+        return len(self.entries)
@@ -0,0 +1,111 @@
+# 多进程密码搜索：按前几位数字把搜索树切成若干子树，分发到进程池并行哈希。
+# 任一进程找到密码后置位共享事件，其余进程在下一批比对前退出。
+# 尝试次数与顺序搜索一致：前缀按顺序搜索访问的次序排列，排在命中子树之前的子树的叶子数由
+# 线索掩码直接计数（不必真的搜完），再加上命中子树内的尝试次数。
+# method3 的访问顺序取决于随机数，无法与顺序搜索对齐，这里只支持 method1 / method2。
+
+import multiprocessing
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from algorithms.backtracking import SaltedHasher, compile_clues, iter_digits, search_silently
+
+PARALLEL_METHODS = ("method1", "method2")
+DEFAULT_PREFIX_DEPTH = 2  # 两位前缀最多 90 个子树，足以在各进程间均衡负载
+
+_stop_event = None
+
+
+def _init_worker(stop_event):
+    global _stop_event
+    _stop_event = stop_event
+
+
+def _search_subtree(prefix, masks, target_hash, length, salt):
+    """
+    在工作进程中按顺序搜索以 prefix 开头的全部密码。
+    返回 (密码字符串或 None, 子树内的尝试次数)；收到停止信号时提前返回 (None, -1)。
+    """
+    hasher = SaltedHasher(salt, target_hash, length)
+    used = 0
+    for pos, digit in enumerate(prefix):
+        hasher.buffer[pos] = 48 + digit
+        used |= 1 << digit
+    should_stop = _stop_event.is_set if _stop_event is not None else None
+    found, tries = search_silently(masks, hasher, len(prefix), used, should_stop=should_stop)
+    return (hasher.buffer.decode() if found else None), tries
+
+
+def count_completions(masks, pos=0, used=0, memo=None):
+    """从第 pos 位开始、已用数字为 used 时满足线索掩码的完整密码个数（即顺序搜索在该子树中的尝试次数）"""
+    if pos == len(masks):
+        return 1
+    if memo is None:
+        memo = {}
+    key = (pos, used)
+    total = memo.get(key)
+    if total is None:
+        total = sum(count_completions(masks, pos + 1, used | (1 << digit), memo)
+                    for digit in iter_digits(masks[pos] & ~used))
+        memo[key] = total
+    return total
+
+
+def split_prefixes(masks, depth):
+    """按顺序搜索的访问次序列出长度为 depth 的合法前缀 [(数字元组, 已用掩码)]"""
+    prefixes = [((), 0)]
+    for pos in range(min(depth, len(masks))):
+        prefixes = [(prefix + (digit,), used | (1 << digit))
+                    for prefix, used in prefixes for digit in iter_digits(masks[pos] & ~used)]
+    return prefixes
+
+
+def solve_puzzle_parallel(method, clues, target_hash, length, salt, tries_counter, workers=None,
+                          prefix_depth=DEFAULT_PREFIX_DEPTH, poll_timeout=0):
+    """
+    并行求解，返回与 solve_puzzle_by_method 相同协议的生成器：每步产出 (当前路径, 状态文本, 尝试次数)，
+    成功时产出 "Success! Password: ..."，搜完仍未找到则结束（StopIteration）。
+    等待期间每步最多阻塞 poll_timeout 秒（游戏每帧推进一步，默认不阻塞；None 表示一直等到有子树完成）。
+    tries_counter["count"] 增加的次数与顺序搜索报告的相同。
+    """
+    if method not in PARALLEL_METHODS:
+        raise ValueError(f"parallel search supports {PARALLEL_METHODS}, got {method!r}")
+    masks = compile_clues(clues, length, stop_at_fixed=(method == "method1"))
+    prefixes = split_prefixes(masks, prefix_depth)
+    memo = {}
+    subtree_sizes = [count_completions(masks, len(prefix), used, memo) for prefix, used in prefixes]
+
+    context = multiprocessing.get_context()
+    stop_event = context.Event()
+    executor = ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                   initializer=_init_worker, initargs=(stop_event,))
+    try:
+        pending = {executor.submit(_search_subtree, prefix, masks, target_hash, length, salt): i
+                   for i, (prefix, _) in enumerate(prefixes)}
+        searched = 0
+        while pending:
+            done, _ = wait(pending, timeout=poll_timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = pending.pop(future)
+                password, tries = future.result()
+                if password is not None:
+                    stop_event.set()
+                    tries_counter["count"] += sum(subtree_sizes[:index]) + tries
+                    yield [int(c) for c in password], f"Success! Password: {password}", tries_counter["count"]
+                    return
+                searched += subtree_sizes[index]
+            yield [], f"Searching {len(prefixes)} prefixes in parallel... {len(prefixes) - len(pending)} done", searched
+        tries_counter["count"] += sum(subtree_sizes)
+    finally:
+        stop_event.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def crack_password_parallel(method, clues, target_hash, length, salt, workers=None,
+                            prefix_depth=DEFAULT_PREFIX_DEPTH):
+    """阻塞直到得出结果，返回 (密码字符串或 None, 尝试次数)"""
+    tries_counter = {"count": 0}
+    for _, status, _ in solve_puzzle_parallel(method, clues, target_hash, length, salt, tries_counter,
+                                              workers, prefix_depth, poll_timeout=None):
+        if "Success!" in status:
+            return status.split(": ")[-1], tries_counter["count"]
+    return None, tries_counter["count"]
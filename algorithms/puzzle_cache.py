@@ -0,0 +1,75 @@
+# 已解密码锁的缓存：同一谜题（目标哈希、盐值、线索、长度）用同一方法求解时，密码和尝试次数都是确定的，
+# 再次遇到时直接复用，扣分与重新求解完全相同。
+# 内存中总是保留；给出 cache_dir 时同时保存到一个 JSON 文件（与 DP 路径缓存共用 LRUJsonStore）。
+# method3 按随机顺序搜索，尝试次数每次不同，不缓存。
+
+import hashlib
+import json
+import os
+
+from config import *
+import instrumentation
+from algorithms.lru_json_store import LRUJsonStore
+
+CACHE_VERSION = 1
+CACHE_FILENAME = "puzzles.json"
+CACHEABLE_METHODS = ("method1", "method2")
+
+
+def puzzle_cache_key(puzzle, method):
+    """谜题内容与求解方法的哈希；不可缓存的方法返回 None"""
+    if method not in CACHEABLE_METHODS:
+        return None
+    header = {'version': CACHE_VERSION, 'target': puzzle["L"], 'salt': bytes(puzzle["salt"]).hex(),
+              'clues': puzzle["C"], 'length': puzzle["length"], 'method': method}
+    return hashlib.sha256(json.dumps(header, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def _decode_entry(entry):
+    password, tries = entry['password'], entry['tries']
+    if not (password is None or isinstance(password, str)) or not isinstance(tries, int):
+        raise TypeError("malformed entry")
+    return password, tries
+
+
+class PuzzleCache(LRUJsonStore):
+    """(密码或 None, 尝试次数) 的 LRU 缓存，存储与淘汰见 LRUJsonStore"""
+
+    def __init__(self, cache_dir=None, max_entries=PUZZLE_CACHE_MAX_ENTRIES):
+        path = os.path.join(cache_dir, CACHE_FILENAME) if cache_dir else None
+        super().__init__(path, CACHE_VERSION, max_entries, "Puzzle Cache")
+
+    def get(self, key):
+        """命中时返回 (密码字符串或 None, 尝试次数)；未命中、key 为 None 或条目损坏时返回 None"""
+        if key is None:
+            return None
+        hit = self.lookup(key, _decode_entry)
+        if hit is not None:
+            instrumentation.count('puzzle.cache_hits')
+        return hit
+
+    def put(self, key, password, tries):
+        if key is not None:
+            self.store(key, {'password': password, 'tries': tries})
+
+
+def replay_solution(password, tries):
+    """把缓存的结果包装成逐步求解器：成功时只产出一步成功状态，无解时直接结束"""
+    if password is not None:
+        yield [int(c) for c in password], f"Success! Password: {password}", tries
+
+
+def record_solution(solver, cache, key):
+    """
+    透传逐步求解器的每一步，求解结束时把结果写入缓存。中途放弃的求解不写入。
+    搜完无解时记录最后一步的尝试次数（失败不按尝试次数扣分）。
+    """
+    tries = 0
+    for step in solver:
+        tries = step[2]
+        if "Success!" in step[1]:
+            cache.put(key, step[1].split(": ")[-1], tries)
+            yield step
+            return
+        yield step
+    cache.put(key, None, tries)
@@ -0,0 +1,132 @@
+# 批量评估：对一组迷宫并行运行 DP 规划与贪心 / DP 无界面模拟，逐行输出 JSONL 结果。
+# 迷宫来源二选一：目录下的 JSON 文件（{"maze": [...]} 格式），或按 尺寸 + 种子范围 生成。
+# 每个迷宫是一个独立任务，由 ProcessPoolExecutor 分发到各个核心，结果按输入顺序流式写出。
+#
+# 用法（在项目根目录）：
+#     python batch.py --maze-dir test_mazes --output results.jsonl
+#     python batch.py --size 15 --count 1000 --seed-start 0 --workers 8 > results.jsonl
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")  # pygame 的欢迎信息会混入标准输出的 JSONL
+
+from config import *
+from maze import Maze
+from simulation import Simulation
+from algorithms.dynamic_programming import calculate_dp_path
+
+
+def _build_maze(task):
+    """task 为 ('file', 路径) 或 ('generate', 尺寸, 种子)"""
+    if task[0] == 'file':
+        with open(task[1], 'r') as f:
+            return Maze(source_data=json.load(f)['maze'], load_icons=False)
+    _, size, seed = task
+    random.seed(seed)
+    return Maze(size=size, load_icons=False)
+
+
+def _task_name(task):
+    if task[0] == 'file':
+        return os.path.basename(task[1])
+    return f"generated-{task[1]}-{task[2]}"
+
+
+def evaluate_maze(task, planner='grid', pruning=False):
+    """在工作进程中评估单个迷宫，返回可直接写入 JSONL 的结果字典"""
+    timings = {}
+    seed = task[2] if task[0] == 'generate' else 0
+    # 规划与模拟过程中的进度日志不写入结果流
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        maze = _build_maze(task)
+        timings['build'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        dp_path, dp_planned_score = calculate_dp_path(maze, pruning=pruning, planner=planner)
+        timings['dp_plan'] = time.perf_counter() - start
+
+        random.seed(seed)  # 贪心 AI 被困时随机选方向，固定种子保证结果可复现
+        start = time.perf_counter()
+        greedy = Simulation(maze, ALGO_GREEDY).run()
+        timings['greedy'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        dp = Simulation(maze, ALGO_DP_VISUALIZATION, dp_path=dp_path).run()
+        timings['dp_walk'] = time.perf_counter() - start
+
+    return {
+        "maze": _task_name(task),
+        "size": maze.size,
+        "seed": seed,
+        "dp_planned_score": dp_planned_score,
+        "dp_path_length": len(dp_path),
+        "dp_score": dp['score'],
+        "dp_reached_end": dp['reached_end'],
+        "greedy_score": greedy['score'],
+        "greedy_steps": greedy['steps'],
+        "greedy_reached_end": greedy['reached_end'],
+        "timings": {name: round(seconds, 6) for name, seconds in timings.items()},
+    }
+
+
+def _evaluate_with_options(args):
+    task, planner, pruning = args
+    try:
+        return evaluate_maze(task, planner, pruning)
+    except Exception as e:
+        return {"maze": _task_name(task), "error": str(e)}
+
+
+def build_tasks(args):
+    if args.maze_dir:
+        names = sorted(name for name in os.listdir(args.maze_dir) if name.endswith('.json'))
+        return [('file', os.path.join(args.maze_dir, name)) for name in names]
+    return [('generate', args.size, seed) for seed in range(args.seed_start, args.seed_start + args.count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="并行批量评估贪心与 DP 结果")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--maze-dir", help="迷宫 JSON 文件所在目录")
+    source.add_argument("--size", type=int, help="生成迷宫的尺寸")
+    parser.add_argument("--count", type=int, default=100, help="生成的迷宫数量")
+    parser.add_argument("--seed-start", type=int, default=0, help="第一个迷宫的随机种子")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="工作进程数")
+    parser.add_argument("--planner", choices=['grid', 'resource'], default='grid')
+    parser.add_argument("--pruning", action='store_true', help="grid 规划器启用支配剪枝")
+    parser.add_argument("--output", default='-', help="JSONL 输出文件，默认写到标准输出")
+    args = parser.parse_args()
+
+    tasks = build_tasks(args)
+    # 每批任务的数量：减少进程间往返，同时保证各进程负载均衡
+    chunksize = max(1, len(tasks) // (args.workers * 8))
+    out = sys.stdout if args.output == '-' else open(args.output, 'w')
+    start = time.perf_counter()
+    failures = 0
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            jobs = ((task, args.planner, args.pruning) for task in tasks)
+            for result in executor.map(_evaluate_with_options, jobs, chunksize=chunksize):
+                failures += 'error' in result
+                out.write(json.dumps(result, ensure_ascii=False) + "\n")
+                out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"Evaluated {len(tasks)} mazes ({failures} failed) in {elapsed:.2f}s "
+          f"with {args.workers} workers ({len(tasks) / elapsed:.1f} mazes/s).", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
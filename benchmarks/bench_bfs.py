@@ -0,0 +1,69 @@
+# BFS 微基准：对比“队列中保存完整路径副本”的旧写法与 utils.bfs_path 父节点数组引擎
+# 在大迷宫上的内存峰值与耗时。
+# 用法（在项目根目录）：python -m benchmarks.bench_bfs
+
+import argparse
+import random
+import time
+import tracemalloc
+from collections import deque
+
+from config import *
+from grid import Grid
+from maze_generator import generate_base_maze
+from utils import bfs_path
+
+
+def path_copy_bfs(cells, size, start, end):
+    """旧实现的等价写法：每个队列元素都携带一份完整路径"""
+    queue = deque([[start]])
+    visited = {start}
+    while queue:
+        path = queue.popleft()
+        x, y = path[-1]
+        if (x, y) == end:
+            return path
+        for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < size and 0 <= ny < size and cells[ny * size + nx] != WALL and (nx, ny) not in visited:
+                visited.add((nx, ny))
+                queue.append(path + [(nx, ny)])
+    return None
+
+
+def profile(search, *args):
+    """返回 (结果, 耗时秒, tracemalloc 峰值字节数)；计时与内存追踪分两次运行，避免追踪开销影响计时"""
+    start = time.perf_counter()
+    result = search(*args)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    search(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BFS 分配与耗时对比")
+    parser.add_argument("--size", type=int, default=301)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    grid = Grid(args.size)
+    generate_base_maze(grid)
+    start, end = (1, 1), (args.size - 2, args.size - 2)
+
+    old_path, old_time, old_peak = profile(path_copy_bfs, grid.cells, args.size, start, end)
+    new_path, new_time, new_peak = profile(bfs_path, grid.cells, args.size, start, end)
+    assert old_path == new_path, "两种 BFS 的结果不一致"
+
+    print(f"maze {args.size}x{args.size}, path length {len(new_path)}")
+    print(f"{'variant':<12} {'seconds':>9} {'peak KiB':>10}")
+    print(f"{'path-copy':<12} {old_time:>9.3f} {old_peak / 1024:>10.1f}")
+    print(f"{'parent-array':<12} {new_time:>9.3f} {new_peak / 1024:>10.1f}")
+    print(f"peak allocation reduced {old_peak / max(new_peak, 1):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+# DP 状态存储内存基准：对比原始元组字典布局与紧凑整数编码布局的每状态字节数。
+# 用法（在项目根目录）：python -m benchmarks.bench_dp_memory [--maze test_maze.json] [--size 15 --seed 0]
+
+import argparse
+import contextlib
+import io
+import time
+import tracemalloc
+
+from algorithms.dynamic_programming import calculate_dp_path
+from algorithms.dp_state_store import STATE_STORES
+from benchmarks.fixtures import generate_maze, load_maze
+
+
+def measure(maze, state_store):
+    """返回 (路径, 分数, 存储的状态数, tracemalloc 峰值字节数, 耗时秒)"""
+    stats = {}
+    tracemalloc.start()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        path, score = calculate_dp_path(maze, state_store=state_store, stats=stats)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return path, score, sum(phase['states'] for phase in stats['phases']), peak, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DP 状态存储内存对比")
+    parser.add_argument("--maze", default="test_maze.json", help="迷宫 JSON 文件；与 --size 二选一")
+    parser.add_argument("--size", type=int, help="随机生成迷宫的尺寸")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    maze = generate_maze(args.size, args.seed) if args.size else load_maze(args.maze)
+
+    print(f"{'store':<8} {'states':>9} {'peak KiB':>10} {'bytes/state':>12} {'seconds':>9}")
+    results, per_state = {}, {}
+    for name in STATE_STORES:
+        path, score, states, peak, elapsed = measure(maze, name)
+        results[name] = (path, score)
+        per_state[name] = peak / max(states, 1)
+        print(f"{name:<8} {states:>9} {peak / 1024:>10.1f} {per_state[name]:>12.1f} {elapsed:>9.2f}")
+    assert len({(tuple(p), s) for p, s in results.values()}) == 1, "不同存储得到的路径或分数不一致"
+    print(f"bytes per state: tuple -> packed reduced {per_state['tuple'] / per_state['packed']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+# DP 规划模式基准：对比逐格 A*（grid）与资源距离矩阵 + Held-Karp（resource）的耗时和得分。
+# 两种模式报告的分数口径不同（grid 只结算各阶段资源列表中的资源），因此另按完整拾取规则重放路径给出可比得分。
+# 用法（在项目根目录）：python -m benchmarks.bench_dp_planner [--maze test_maze.json] [--size 21 --seed 0] [--skip-grid]
+
+import argparse
+import contextlib
+import io
+import time
+
+from algorithms.dynamic_programming import calculate_dp_path, _replay_path
+from benchmarks.fixtures import generate_maze, load_maze
+from config import *
+
+
+def measure(maze, planner):
+    """返回 (报告的分数, 重放得分, 各阶段规划的资源数, 耗时秒)"""
+    stats = {}
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        path, score = calculate_dp_path(maze, planner=planner, stats=stats)
+    elapsed = time.perf_counter() - start
+    replayed = 0
+    if path:
+        final_score, health, gold = _replay_path(maze.grid.cells, maze.size, path,
+                                                 {'score': 0, 'health': 100, 'gold': 20}, set())
+        replayed = final_score + health * 2 + gold * 3
+    resources = [phase.get('resources', '-') for phase in stats.get('phases', [])]
+    return score, replayed, resources, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DP 规划模式对比")
+    parser.add_argument("--maze", default="test_maze.json", help="迷宫 JSON 文件；与 --size 二选一")
+    parser.add_argument("--size", type=int, help="随机生成迷宫的尺寸")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--skip-grid", action="store_true", help="大迷宫上跳过逐格 A*")
+    args = parser.parse_args()
+
+    maze = generate_maze(args.size, args.seed) if args.size else load_maze(args.maze)
+    total = sum(1 for tile_type in maze.grid.cells if tile_type in (GOLD, LOCKER))
+    print(f"maze {maze.size}x{maze.size}, {total} gold / locker tiles")
+
+    print(f"{'planner':<9} {'reported':>9} {'replayed':>9} {'seconds':>9}  resources per phase")
+    for planner in ('grid', 'resource'):
+        if planner == 'grid' and args.skip_grid:
+            continue
+        score, replayed, resources, elapsed = measure(maze, planner)
+        print(f"{planner:<9} {score:>9} {replayed:>9} {elapsed:>9.2f}  {resources}")
+
+
+if __name__ == "__main__":
+    main()
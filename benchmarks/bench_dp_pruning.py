@@ -0,0 +1,49 @@
+# DP 剪枝基准：对比默认 A* 与支配剪枝 + BFS 距离上界模式的展开状态数、耗时和最优得分。
+# 用法（在项目根目录）：python -m benchmarks.bench_dp_pruning [--maze test_maze.json] [--size 13 --seed 0]
+
+import argparse
+import contextlib
+import io
+import time
+
+from algorithms.dynamic_programming import calculate_dp_path
+from benchmarks.fixtures import generate_maze, load_maze
+
+
+def measure(maze, pruning):
+    """返回 (分数, 各阶段计数之和, 耗时秒)"""
+    stats = {}
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        _, score = calculate_dp_path(maze, pruning=pruning, stats=stats)
+    elapsed = time.perf_counter() - start
+    totals = {}
+    for phase in stats['phases']:
+        for name, count in phase.items():
+            totals[name] = totals.get(name, 0) + count
+    return score, totals, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DP 剪枝展开状态数对比")
+    parser.add_argument("--maze", default="test_maze.json", help="迷宫 JSON 文件；与 --size 二选一")
+    parser.add_argument("--size", type=int, help="随机生成迷宫的尺寸")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    maze = generate_maze(args.size, args.seed) if args.size else load_maze(args.maze)
+
+    print(f"{'mode':<8} {'score':>7} {'expanded':>9} {'pushed':>9} {'pruned':>9} {'states':>9} {'seconds':>9}")
+    results = {}
+    for name, pruning in (('default', False), ('pruning', True)):
+        score, totals, elapsed = measure(maze, pruning)
+        results[name] = (score, totals['expanded'])
+        print(f"{name:<8} {score:>7} {totals['expanded']:>9} {totals['pushed']:>9} {totals['pruned']:>9} "
+              f"{totals['states']:>9} {elapsed:>9.2f}")
+    assert results['default'][0] == results['pruning'][0], "剪枝模式的最优得分与默认模式不一致"
+    print(f"expanded states: default -> pruning reduced "
+          f"{results['default'][1] / max(results['pruning'][1], 1):.2f}x")
+
+
+if __name__ == "__main__":
+    main()
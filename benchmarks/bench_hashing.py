@@ -0,0 +1,74 @@
+# 密码破解的哈希吞吐量：对同一批候选密码比较三种哈希方式每秒能比对的次数，
+# 并确认新的哈希阶段能解出游戏内谜题（simulation.PUZZLES，即 Game.initiate_puzzle 使用的目标哈希）。
+#   naive   每个候选 sha256(salt + 密码).hexdigest() 与目标十六进制串比较（原实现）
+#   salted  sha256(salt) 预先计算，每个候选从副本继续，比较摘要字节
+#   solver  求解器实际使用的路径：search_silently 按字典序回溯，每个叶子调用 SaltedHasher.matches()，
+#           候选顺序与另外两种相同，吞吐量含回溯本身的开销
+# 用法（在项目根目录）：python -m benchmarks.bench_hashing [--length 6] [--candidates 200000]
+
+import argparse
+import hashlib
+import itertools
+import time
+
+from simulation import PUZZLES
+from algorithms.backtracking import ALL_DIGITS_MASK, SaltedHasher, search_silently, solve_puzzle_by_method
+from benchmarks.fixtures import generate_puzzle
+
+
+def _naive(salt, target_hash, passwords):
+    for password in passwords:
+        if hashlib.sha256(salt + password.encode('utf-8')).hexdigest() == target_hash:
+            return password
+    return None
+
+
+def _salted(salt, target_hash, passwords):
+    salted = hashlib.sha256(salt)
+    target = bytes.fromhex(target_hash)
+    for password in passwords:
+        h = salted.copy()
+        h.update(password.encode('utf-8'))
+        if h.digest() == target:
+            return password
+    return None
+
+
+def _solver(salt, target_hash, passwords):
+    """无线索的顺序搜索按字典序访问全部排列，与 passwords 的顺序一致"""
+    length = len(passwords[0])
+    hasher = SaltedHasher(salt, target_hash, length)
+    found, tries = search_silently([ALL_DIGITS_MASK] * length, hasher)
+    assert tries == len(passwords)
+    return hasher.buffer.decode() if found else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="密码哈希吞吐量")
+    parser.add_argument("--length", type=int, default=6)
+    parser.add_argument("--candidates", type=int, default=200000)
+    args = parser.parse_args()
+
+    for puzzle in PUZZLES:
+        for method in ("method1", "method2", "method3"):
+            solver = solve_puzzle_by_method(method, puzzle["C"], puzzle["L"], puzzle["length"], puzzle["salt"],
+                                            {"count": 0})
+            status = next((status for _, status, _ in solver if "Success!" in status), "not found")
+            print(f"game puzzle {puzzle['L'][:12]}... {method}: {status}")
+
+    puzzle = generate_puzzle(args.length, 0)
+    passwords = ["".join(map(str, p)) for p in
+                 itertools.islice(itertools.permutations(range(10), args.length), args.candidates)]
+    target = hashlib.sha256(puzzle["salt"] + passwords[-1].encode('utf-8')).hexdigest()  # 最后一个才匹配
+
+    print(f"{'stage':<10} {'hashes/s':>12}")
+    for name, check in (("naive", _naive), ("salted", _salted), ("solver", _solver)):
+        start = time.perf_counter()
+        found = check(puzzle["salt"], target, passwords)
+        elapsed = time.perf_counter() - start
+        assert found == passwords[-1], name
+        print(f"{name:<10} {len(passwords) / elapsed:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
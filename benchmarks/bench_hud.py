@@ -0,0 +1,49 @@
+# HUD 绘制基准：统计信息面板每帧的文字渲染次数（即新分配的文字表面数）和耗时，
+# 对比启用文字缓存与关闭缓存（容量为 0，每次都重新渲染）两种情况。
+# 用法（在项目根目录）：python -m benchmarks.bench_hud [--frames 300]
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from game import Game
+
+
+def measure(game, frames, max_entries):
+    """返回 (每帧渲染次数, 每帧毫秒)"""
+    cache = game.text_cache
+    cache.max_entries = max_entries
+    cache.surfaces.clear()
+    game.draw_info_panel()  # 预热
+    cache.reset_stats()
+    start = time.perf_counter()
+    for _ in range(frames):
+        game.draw_info_panel()
+    elapsed = time.perf_counter() - start
+    return cache.misses / frames, elapsed * 1000 / frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HUD 文字缓存对比")
+    parser.add_argument("--frames", type=int, default=300)
+    args = parser.parse_args()
+
+    game = Game()
+    with open('test_maze.json', 'r') as f, contextlib.redirect_stdout(io.StringIO()):
+        game.start_new_game(source_data=json.load(f)['maze'])
+
+    print(f"{'text cache':<11} {'renders/frame':>14} {'ms/frame':>9}")
+    for name, max_entries in (('off', 0), ('on', 256)):
+        renders, ms = measure(game, args.frames, max_entries)
+        print(f"{name:<11} {renders:>14.1f} {ms:>9.3f}")
+    game.dp_planner.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+# 迷宫生成引擎基准测试：统计不同尺寸下每秒可生成的基础迷宫数量。
+# 用法（在项目根目录）：python -m benchmarks.bench_maze_generation
+
+import argparse
+import random
+import time
+
+from grid import Grid
+from maze_generator import generate_base_maze
+
+DEFAULT_SIZES = [15, 101, 501, 1001]
+
+
+def measure(size, min_seconds=1.0, seed=0):
+    """在 min_seconds 内反复生成 size x size 迷宫，返回 (生成数量, 耗时秒)"""
+    random.seed(seed)
+    count = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < min_seconds or count == 0:
+        generate_base_maze(Grid(size))
+        count += 1
+        elapsed = time.perf_counter() - start
+    return count, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="迷宫生成引擎基准测试")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--seconds", type=float, default=1.0, help="每个尺寸的最短测量时间")
+    args = parser.parse_args()
+
+    print(f"{'size':>6} {'mazes':>8} {'seconds':>9} {'mazes/s':>10}")
+    for size in args.sizes:
+        count, elapsed = measure(size, args.seconds)
+        print(f"{size:>6} {count:>8} {elapsed:>9.3f} {count / elapsed:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+# 多进程密码搜索与顺序搜索的耗时对比，并核对两者报告的尝试次数一致。
+# 谜题只给出首位奇偶性，长度 8 时顺序搜索要尝试数十万个候选。
+# 用法（在项目根目录）：python -m benchmarks.bench_parallel_puzzle [--lengths 6 7 8] [--workers 4]
+
+import argparse
+import os
+import time
+
+from algorithms.backtracking import solve_puzzle_by_method
+from algorithms.parallel_backtracking import crack_password_parallel
+from benchmarks.fixtures import generate_puzzle
+
+
+def _sequential(method, puzzle, length):
+    tries_counter = {"count": 0}
+    for _, status, _ in solve_puzzle_by_method(method, puzzle["C"], puzzle["L"], length, puzzle["salt"],
+                                               tries_counter):
+        if "Success!" in status:
+            return status.split(": ")[-1], tries_counter["count"]
+    return None, tries_counter["count"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="多进程密码搜索耗时")
+    parser.add_argument("--lengths", type=int, nargs='+', default=[6, 7, 8])
+    parser.add_argument("--method", choices=['method1', 'method2'], default='method1')
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    print(f"{'length':>6} {'tries':>9} {'sequential s':>13} {'parallel s':>11} {'speedup':>8}")
+    for length in args.lengths:
+        puzzle = generate_puzzle(length, 0)
+        start = time.perf_counter()
+        expected = _sequential(args.method, puzzle, length)
+        sequential = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = crack_password_parallel(args.method, puzzle["C"], puzzle["L"], length, puzzle["salt"],
+                                         workers=args.workers)
+        parallel = time.perf_counter() - start
+        assert result == expected, (result, expected)
+        print(f"{length:>6} {result[1]:>9} {sequential:>13.3f} {parallel:>11.3f} {sequential / parallel:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
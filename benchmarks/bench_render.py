@@ -0,0 +1,85 @@
+# 迷宫绘制基准：对比每帧整图重绘与缓存静态图层 + 脏格局部重绘的单帧耗时。
+# 每帧模拟一次 AI 移动：拾取一个金币（一个脏格）并刷新玩家前后所在的两个格子。
+# 另对比 DP 路径逐段画线与预渲染路径图层（含进度图层）的单帧耗时。
+# 用法（在项目根目录）：python -m benchmarks.bench_render [--size 301] [--frames 120]
+
+import argparse
+import os
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from config import *
+from benchmarks.fixtures import generate_maze
+from utils import bfs_path
+
+
+def bench_full(maze, surface, frames):
+    """旧写法的等价开销：每帧重建并拷贝整张图层"""
+    start = time.perf_counter()
+    for _ in range(frames):
+        maze._static_surface = None
+        maze.draw(surface)
+    return (time.perf_counter() - start) / frames
+
+
+def bench_incremental(maze, surface, frames):
+    gold_cells = [(i % maze.size, i // maze.size) for i, t in enumerate(maze.grid.cells) if t == GOLD]
+    maze.draw(surface, full=True)
+    previous = maze.start_pos
+    start = time.perf_counter()
+    for frame in range(frames):
+        x, y = gold_cells[frame % len(gold_cells)]
+        maze.grid[y][x].type = PATH if maze.grid.get(x, y) == GOLD else GOLD
+        maze.draw(surface, refresh_cells=(previous, (x, y)))
+        previous = (x, y)
+    return (time.perf_counter() - start) / frames
+
+
+def bench_path_lines(maze, surface, path, frames):
+    """旧写法：每帧为每个路径段调用一次 pygame.draw.line"""
+    start = time.perf_counter()
+    for _ in range(frames):
+        for i in range(len(path) - 1):
+            pygame.draw.line(surface, COLOR_DP_PATH, *maze._segment_endpoints(path, i), 4)
+    return (time.perf_counter() - start) / frames
+
+
+def bench_path_overlay(maze, surface, path, frames):
+    """路径图层已缓存：每帧只拷贝脏矩形，进度每帧前进一段"""
+    maze.draw(surface, dp_path_to_show=path, full=True, dp_progress=0)
+    start = time.perf_counter()
+    for frame in range(frames):
+        maze.draw(surface, dp_path_to_show=path, refresh_cells=(path[frame], path[frame + 1]),
+                  dp_progress=frame + 1)
+    return (time.perf_counter() - start) / frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description="迷宫绘制耗时对比")
+    parser.add_argument("--size", type=int, default=301)
+    parser.add_argument("--frames", type=int, default=120)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    maze = generate_maze(args.size, args.seed)
+    surface = pygame.Surface((MAZE_AREA_SIZE, MAZE_AREA_SIZE))
+    full = bench_full(maze, surface, max(args.frames // 10, 3))
+    incremental = bench_incremental(maze, surface, args.frames)
+    print(f"maze {maze.size}x{maze.size}")
+    print(f"full redraw : {full * 1000:8.2f} ms/frame ({1 / full:7.1f} FPS)")
+    print(f"dirty cells : {incremental * 1000:8.2f} ms/frame ({1 / incremental:7.1f} FPS)")
+
+    path = bfs_path(maze.grid.cells, maze.size, maze.start_pos, maze.end_pos)
+    frames = min(args.frames, len(path) - 1)
+    lines = bench_path_lines(maze, surface, path, max(frames // 10, 3))
+    overlay = bench_path_overlay(maze, surface, path, frames)
+    print(f"DP path of {len(path) - 1} segments")
+    print(f"line per segment : {lines * 1000:8.2f} ms/frame")
+    print(f"cached overlay   : {overlay * 1000:8.2f} ms/frame")
+
+
+if __name__ == "__main__":
+    main()
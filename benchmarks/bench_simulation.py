@@ -0,0 +1,45 @@
+# 无界面模拟吞吐量：对一批固定种子生成的迷宫分别跑贪心和 DP 模拟，统计每分钟可完成的次数。
+# DP 路径在计时前预先规划，只测量 AI 行走、战斗与解谜的开销。
+# 用法（在项目根目录）：python -m benchmarks.bench_simulation [--size 15] [--mazes 50]
+
+import argparse
+import contextlib
+import io
+import random
+import time
+
+from config import *
+from maze import Maze
+from simulation import Simulation
+from algorithms.dynamic_programming import calculate_dp_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="无界面模拟吞吐量")
+    parser.add_argument("--size", type=int, default=15)
+    parser.add_argument("--mazes", type=int, default=50)
+    args = parser.parse_args()
+
+    mazes, dp_paths = [], []
+    for seed in range(args.mazes):
+        random.seed(seed)
+        maze = Maze(size=args.size, load_icons=False)
+        with contextlib.redirect_stdout(io.StringIO()):
+            dp_paths.append(calculate_dp_path(maze)[0])
+        mazes.append(maze)
+
+    print(f"{'algorithm':<20} {'runs/min':>10} {'avg steps':>10} {'avg score':>10}")
+    for algorithm in (ALGO_GREEDY, ALGO_DP_VISUALIZATION):
+        random.seed(0)
+        results = []
+        start = time.perf_counter()
+        for maze, path in zip(mazes, dp_paths):
+            results.append(Simulation(maze, algorithm, dp_path=path).run())
+        elapsed = time.perf_counter() - start
+        steps = sum(r['steps'] for r in results) / len(results)
+        score = sum(r['score'] for r in results) / len(results)
+        print(f"{algorithm:<20} {len(results) * 60 / elapsed:>10.0f} {steps:>10.1f} {score:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
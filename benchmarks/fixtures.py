@@ -0,0 +1,58 @@
+# 基准测试共用的夹具：固定种子生成或从 JSON 文件加载的迷宫，以及固定种子生成的 Boss 战配置和密码谜题。
+
+import hashlib
+import json
+import random
+
+import pygame
+
+from maze import Maze
+
+
+def _ensure_fonts():
+    # Maze 构造时会生成图标，需要字体模块（无需打开窗口）
+    if not pygame.font.get_init():
+        pygame.font.init()
+
+
+def generate_maze(size, seed):
+    """用固定种子生成 size x size 的迷宫"""
+    _ensure_fonts()
+    random.seed(seed)
+    return Maze(size=size)
+
+
+def load_maze(filepath):
+    """从 JSON 文件（{"maze": [...]} 格式）加载迷宫"""
+    _ensure_fonts()
+    with open(filepath, 'r') as f:
+        return Maze(source_data=json.load(f)['maze'])
+
+
+def generate_battle(boss_count, seed, hp_range=(8, 16), skill_count=None):
+    """
+    固定种子生成 boss_count 个 Boss 的血量列表。技能默认沿用 battle_config.json 中的玩家技能；
+    给出 skill_count 时随机生成该数量的技能（伤害 5-60，冷却 0-6）。
+    """
+    rng = random.Random(seed)
+    boss_hp_list = [rng.randint(*hp_range) for _ in range(boss_count)]
+    if skill_count is None:
+        skills = [{"Damage": 8, "Cooldown": 4}, {"Damage": 2, "Cooldown": 0},
+                  {"Damage": 4, "Cooldown": 2}, {"Damage": 6, "Cooldown": 3}]
+    else:
+        skills = [{"Damage": rng.randint(5, 60), "Cooldown": rng.randint(0, 6)} for _ in range(skill_count)]
+    return boss_hp_list, skills
+
+
+def generate_puzzle(length, seed, parity_positions=1):
+    """
+    固定种子生成长度为 length 的密码锁谜题（与游戏内谜题同格式：L 目标哈希、C 线索、salt）。
+    线索给出前 parity_positions 位的奇偶性；默认只给首位，搜索空间随长度近似按排列数增长，
+    给出全部位时长度 10 的谜题也只有 5! * 5! 种候选。
+    """
+    rng = random.Random(seed)
+    digits = rng.sample(range(10), length)
+    salt = bytes(rng.randrange(256) for _ in range(16))
+    password = "".join(map(str, digits))
+    return {"L": hashlib.sha256(salt + password.encode('utf-8')).hexdigest(),
+            "C": [[pos + 1, digits[pos] % 2] for pos in range(parity_positions)], "length": length, "salt": salt}
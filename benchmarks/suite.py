@@ -0,0 +1,266 @@
+# 算法基准套件：贪心、DP、Boss 战 A*、密码回溯四类算法在逐级增大的固定种子输入上的
+# 耗时（多次运行取最小值）、内存峰值（tracemalloc，单独运行一次）和展开状态数，并与保存的基线 JSON 比较。
+# 以下任一项超出基线即为性能回退，以退出码 1 结束：
+# - 状态数：确定性的，超过基线 (1 + threshold) 倍
+# - 相对耗时：用例耗时除以紧挨着它运行的校准负载耗时，抵消机器快慢；计时噪声大，
+#   超过基线 (1 + time_threshold) 倍才算回退，且只比较足够长的用例
+# - 内存峰值：tracemalloc 统计只取决于解释器，与基线同一 Python 小版本时超过 (1 + threshold) 倍
+# 绝对耗时仅当基线记录于完全相同的环境时才比较，超出阈值只提示。
+# 用法（在项目根目录）：
+#     python -m benchmarks.suite                        # 与 benchmarks/baseline.json 比较
+#     python -m benchmarks.suite --update-baseline --reason "..."   # 重新生成基线，须写明原因
+#     python -m benchmarks.suite --only dp --threshold 0.5
+
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from config import *
+from simulation import Simulation
+from algorithms.dynamic_programming import calculate_dp_path
+from algorithms.branch_and_bound import solve_boss_gauntlet
+from algorithms.backtracking import solve_puzzle_by_method, solve_puzzle_instant
+from benchmarks.fixtures import generate_maze, load_maze, generate_battle, generate_puzzle
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baseline.json')
+TEST_MAZE_PATH = os.path.join(os.path.dirname(__file__), os.pardir, 'test_maze.json')
+
+GREEDY_SIZES = [15, 31, 61]
+DP_SIZES = [9, 11, 13, 15]
+BOSS_COUNTS = [2, 4, 8, 16, 24]
+LARGE_BATTLE = (20, (100, 300))  # 20 个血量上百的 Boss
+BEAM_BATTLES = [(40, 10), (80, 10)]  # (Boss 数, 技能数)，集束模式，目标是单帧（约 16 ms）内完成
+PUZZLE_LENGTHS = [3, 4, 5, 6]
+PARITY_PUZZLE_LENGTHS = [6, 7, 8, 9, 10]  # 每一位都给出奇偶性线索，主要考察候选筛选
+SEED = 0
+
+# 决定退出码的指标；peak_kb 只在解释器版本相同时比较，seconds 只在环境完全相同时作参考
+GATED_METRICS = ('states', 'relative')
+MEMORY_METRICS = ('peak_kb',)
+INFORMATIONAL_METRICS = ('seconds',)
+MIN_COMPARED_SECONDS = 0.02  # 更短的用例计时噪声大于阈值，不比较耗时
+CALIBRATION_ROUNDS = 20000
+METADATA_KEY = '_recorded'  # 基线中记录生成环境与重新生成原因的条目，不是用例
+
+
+def _greedy_case(size):
+    maze = generate_maze(size, SEED)
+
+    def run():
+        random.seed(SEED)
+        return Simulation(maze, ALGO_GREEDY).run()['steps']
+    return run
+
+
+def _dp_case(size, pruning=False):
+    """size 为 None 时使用项目自带的 test_maze.json"""
+    maze = generate_maze(size, SEED) if size else load_maze(TEST_MAZE_PATH)
+
+    def run():
+        stats = {}
+        with contextlib.redirect_stdout(io.StringIO()):
+            calculate_dp_path(maze, stats=stats, pruning=pruning)
+        return sum(phase['expanded'] for phase in stats['phases'])
+    return run
+
+
+def _battle_case(boss_count, hp_range=(8, 16)):
+    boss_hp_list, skills = generate_battle(boss_count, SEED, hp_range)
+
+    def run():
+        stats = {}
+        solve_boss_gauntlet(boss_hp_list, skills, stats)
+        return stats['expanded']
+    return run
+
+
+def _beam_battle_case(boss_count, skill_count):
+    boss_hp_list, skills = generate_battle(boss_count, SEED, (100, 300), skill_count)
+
+    def run():
+        stats = {}
+        solve_boss_gauntlet(boss_hp_list, skills, stats, mode='beam')
+        return stats['expanded']
+    return run
+
+
+def _puzzle_case(length, parity_positions=1, method="method1"):
+    puzzle = generate_puzzle(length, SEED, parity_positions)
+
+    def run():
+        tries_counter = {"count": 0}
+        solver = solve_puzzle_by_method(method, puzzle["C"], puzzle["L"], length, puzzle["salt"], tries_counter)
+        for _, status, _ in solver:
+            if "Success!" in status:
+                break
+        return tries_counter["count"]
+    return run
+
+
+def _instant_puzzle_case(length):
+    puzzle = generate_puzzle(length, SEED, length)
+
+    def run():
+        tries_counter = {"count": 0}
+        solve_puzzle_instant("method1", puzzle["C"], puzzle["L"], length, puzzle["salt"], tries_counter)
+        return tries_counter["count"]
+    return run
+
+
+def build_cases(only=None):
+    """返回 [(名称, 无参可调用对象)]，可调用对象返回展开的状态数（贪心为决策步数，回溯为尝试次数）"""
+    groups = {
+        'greedy': [(f"greedy/size={size}", lambda size=size: _greedy_case(size)) for size in GREEDY_SIZES],
+        'dp': [(f"dp/size={size}", lambda size=size: _dp_case(size)) for size in DP_SIZES] +
+              [("dp/test_maze", lambda: _dp_case(None))] +
+              [(f"dp-pruning/size={size}", lambda size=size: _dp_case(size, pruning=True)) for size in DP_SIZES] +
+              [("dp-pruning/test_maze", lambda: _dp_case(None, pruning=True))],
+        'battle': [(f"battle/bosses={n}", lambda n=n: _battle_case(n)) for n in BOSS_COUNTS] +
+                  [(f"battle/bosses={LARGE_BATTLE[0]},hp={LARGE_BATTLE[1][0]}-{LARGE_BATTLE[1][1]}",
+                    lambda: _battle_case(*LARGE_BATTLE))] +
+                  [(f"battle-beam/bosses={n},skills={k}", lambda n=n, k=k: _beam_battle_case(n, k))
+                   for n, k in BEAM_BATTLES],
+        'puzzle': [(f"puzzle/length={n}", lambda n=n: _puzzle_case(n)) for n in PUZZLE_LENGTHS] +
+                  [(f"puzzle-{method}/length={n},parity=all", lambda n=n, method=method: _puzzle_case(n, n, method))
+                   for method in ("method1", "method2") for n in PARITY_PUZZLE_LENGTHS] +
+                  [(f"puzzle-instant/length={n},parity=all", lambda n=n: _instant_puzzle_case(n))
+                   for n in PARITY_PUZZLE_LENGTHS],
+    }
+    cases = []
+    for group, entries in groups.items():
+        if only is None or group in only:
+            cases.extend(entries)
+    return cases
+
+
+def calibrate():
+    """
+    与仓库代码无关的固定纯 Python 负载（整数运算、dict 与 list 操作、小块 sha256），
+    用例耗时除以它的耗时即为相对耗时，在不同机器与负载下大致可比
+    """
+    table, queue, digest = {}, [], hashlib.sha256()
+    for i in range(CALIBRATION_ROUNDS):
+        key = (i * 2654435761) & 0xFFF
+        table[key] = table.get(key, 0) + 1
+        queue.append(key)
+        if len(queue) > 64:
+            queue.pop(0)
+        digest.update(key.to_bytes(2, 'little'))
+    return len(table) + len(queue)
+
+
+def _best_time(run, repeat):
+    best, value = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        value = run()
+        best = min(best, time.perf_counter() - start)
+    return best, value
+
+
+def measure(run, repeat):
+    best, states = _best_time(run, repeat)
+    calibration, _ = _best_time(calibrate, repeat)  # 紧接着用例运行，两者处于相近的机器负载下
+
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": round(best, 6), "relative": round(best / calibration, 3),
+            "peak_kb": round(peak / 1024, 1), "states": states}
+
+
+def environment():
+    """绝对耗时可比较的前提：相同的硬件平台、CPU 数和解释器版本"""
+    return {'platform': platform.platform(), 'machine': platform.machine(), 'cpus': os.cpu_count(),
+            'python': platform.python_version()}
+
+
+def _python_minor(env):
+    return '.'.join(str(env.get('python', '')).split('.')[:2])
+
+
+def compare(name, result, baseline, thresholds, metrics):
+    """返回 metrics 中超出基线的指标描述列表；thresholds 为 {指标: 允许超出的比例}，基线中没有的用例或指标不比较"""
+    reference = baseline.get(name)
+    if reference is None:
+        return []
+    regressions = []
+    for metric in metrics:
+        old, new = reference.get(metric), result[metric]
+        if metric in ('seconds', 'relative') and (reference.get('seconds') or 0) < MIN_COMPARED_SECONDS:
+            continue
+        if old and new > old * (1 + thresholds[metric]):
+            regressions.append(f"{metric} {old} -> {new} (+{(new / old - 1) * 100:.0f}%)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="算法基准套件与回退检查")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action='store_true', help="把本次结果写入基线文件")
+    parser.add_argument("--reason", help="重新生成基线的原因（--update-baseline 时必填），记录在基线文件中")
+    parser.add_argument("--threshold", type=float, default=0.25, help="状态数与内存峰值允许超出基线的比例")
+    parser.add_argument("--time-threshold", type=float, default=1.0, help="相对耗时允许超出基线的比例")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", nargs='+', choices=['greedy', 'dp', 'battle', 'puzzle'])
+    args = parser.parse_args()
+    if args.update_baseline and not (args.reason and args.reason.strip()):
+        parser.error("--update-baseline requires --reason: say why the recorded numbers are allowed to change")
+    thresholds = {'states': args.threshold, 'peak_kb': args.threshold, 'relative': args.time_threshold,
+                  'seconds': args.threshold}
+
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.update_baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+    recorded_environment = baseline.get(METADATA_KEY, {}).get('environment', {})
+    same_environment = recorded_environment == environment()
+    same_python = _python_minor(recorded_environment) == _python_minor(environment())
+    if baseline and not same_python:
+        print("Baseline was recorded with a different Python version; memory peaks are not compared.")
+    gated = GATED_METRICS + (MEMORY_METRICS if same_python else ())
+    informational = INFORMATIONAL_METRICS if same_environment else ()
+
+    results = {}
+    failed = []
+    print(f"{'case':<36} {'seconds':>10} {'relative':>9} {'peak KB':>10} {'states':>9}  status")
+    for name, make_case in build_cases(args.only):
+        result = measure(make_case(), args.repeat)
+        results[name] = result
+        regressions = compare(name, result, baseline, thresholds, gated)
+        notes = compare(name, result, baseline, thresholds, informational)
+        if regressions:
+            failed.append(name)
+            status = "REGRESSION: " + "; ".join(regressions + notes)
+        elif notes:
+            status = "slower (informational): " + "; ".join(notes)
+        else:
+            status = "ok" if name in baseline else "-"
+        print(f"{name:<36} {result['seconds']:>10.4f} {result['relative']:>9.2f} {result['peak_kb']:>10.1f} "
+              f"{result['states']:>9}  {status}")
+
+    if args.update_baseline:
+        if args.only and os.path.exists(args.baseline):
+            with open(args.baseline, 'r') as f:
+                results = {**json.load(f), **results}
+        results[METADATA_KEY] = {'environment': environment(), 'reason': args.reason.strip()}
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Baseline written to {args.baseline}")
+    elif failed:
+        print(f"{len(failed)} case(s) regressed beyond the baseline.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -14,7 +14,7 @@ FPS = 60
 COLOR_BG = (135, 206, 235); COLOR_WALL = (146, 209, 79); COLOR_PATH = (245, 245, 245)
 COLOR_GRID = (189, 215, 166); COLOR_HUD_BG = (44, 62, 80); COLOR_TEXT = (255, 255, 255)
 COLOR_SUBTEXT = (255, 236, 139); COLOR_BTN = (221, 46, 68); COLOR_BTN_HOVER = (252, 212, 0)
-COLOR_BTN_SHADOW = (161, 26, 48); COLOR_DP_PATH = (255, 69, 0, 150)
+COLOR_BTN_SHADOW = (161, 26, 48); COLOR_DP_PATH = (255, 69, 0, 150); COLOR_DP_PATH_WALKED = (90, 90, 90, 170)
 COLOR_POPUP_BG = (44, 62, 80, 190) # 背景透明
 COLOR_HEALTH_PLAYER = (0, 255, 127); COLOR_HEALTH_BOSS = (255, 69, 0); COLOR_HEALTH_BG = (70, 70, 70)
 COLOR_BATTLE_LOG_BG = (30, 40, 50, 220) # 日志背景
@@ -34,3 +34,8 @@ TILE_TYPE_COLORS = {
 # 用于保存生成迷宫的配置
 TEST_MAZE_DIR = "test_mazes" # 存放测试迷宫的文件夹名称
 TEST_MAZE_FILENAME = "current_test_maze.json" # 固定的测试迷宫文件名
+
+# DP 最优路径的磁盘缓存
+DP_CACHE_DIR = TEST_MAZE_DIR + "/.cache" # 缓存目录
+DP_CACHE_MAX_ENTRIES = 64 # 最多缓存的迷宫数，超出后按最近最少使用淘汰
+PUZZLE_CACHE_MAX_ENTRIES = 256 # 已解密码锁缓存的条目上限（与 DP 缓存放在同一目录）
@@ -72,7 +72,7 @@ class AIPlayer:
 
     def move(self, dx, dy, maze):
         next_x, next_y = self.x + dx, self.y + dy
-        if 0 <= next_x < maze.size and 0 <= next_y < maze.size and maze.grid[next_y][next_x].type != WALL:
+        if 0 <= next_x < maze.size and 0 <= next_y < maze.size and maze.grid.cells[next_y * maze.size + next_x] != WALL:
             self.x, self.y = next_x, next_y
             self.path_history.append((self.x, self.y))
             # 记录贪心算法的完整路径
@@ -2,16 +2,21 @@ import pygame
 import sys
 import random
 import hashlib
+import time
 from collections import deque
 import json
 from config import *
 from utils import SoundManager, create_all_icons
+from text_cache import TextCache
+import instrumentation
 from maze import Maze
 from entities import AIPlayer, Boss
-from algorithms.dynamic_programming import calculate_dp_path
-from algorithms.branch_and_bound import find_best_attack_sequence
-from algorithms.backtracking import solve_puzzle_by_method
-from algorithms.greedy import get_tile_value
+from algorithms.dp_background import BackgroundDPPlanner
+from algorithms.backtracking import GRANULARITY_STEP, drain_steps
+from algorithms.branch_and_bound import GauntletCache
+from algorithms.puzzle_cache import PuzzleCache
+from simulation import (PUZZLES, PUZZLE_METHOD, score_interaction, load_battle_config, create_battle_solver,
+                        apply_battle_result, create_puzzle_solver, apply_puzzle_success, apply_puzzle_failure)
 
 
 class Game:
@@ -32,14 +37,25 @@ class Game:
         self.battle_result = None
         self.battle_end_timer = 0
         self.battle_display_duration = 5000
+        # 战斗求解器分步运行：每帧最多占用 battle_slice_ms 毫秒，求解完成后才开始计时展示结果
+        self.battle_solver = None
+        self.battle_slice_ms = 8
+        self.battle_cache = GauntletCache()  # 重复的战斗（如失败后再次挑战）直接取用求解结果
 
         self.active_algorithm = ALGO_GREEDY
         self.dp_optimal_path, self.dp_max_score = [], 0
+        self.dp_planner = BackgroundDPPlanner()  # 后台进程中规划 DP 路径，完成前 "Show DP Path" 不可用
         self.battle_log = deque(maxlen=8)
 
         self.puzzle_solver = None
         self.puzzle_timer = 0
         self.puzzle_update_interval = 100
+        # 求解器产出粒度（见 backtracking.GRANULARITY_*）；快进时每帧在 puzzle_frame_budget_ms 内尽量多推进（F 键切换）
+        self.puzzle_granularity = GRANULARITY_STEP
+        self.puzzle_fast_forward = False
+        self.puzzle_frame_budget_ms = 8
+        # 已解过的密码锁直接复用密码与尝试次数（保存在 DP 缓存目录，重启游戏后仍有效）
+        self.puzzle_cache = PuzzleCache(DP_CACHE_DIR)
         self.puzzle_current_path = []
         self.puzzle_status_text = ""
         self.puzzle_clue_texts = []
@@ -48,53 +64,58 @@ class Game:
         self.puzzle_tries_count = 0
         self.puzzle_active_method = ""
 
-        try:
-            font_name = 'sans-serif'
-            self.font_title = pygame.font.SysFont(font_name, 80);
-            self.font_button = pygame.font.SysFont(font_name, 50)
-            self.font_info = pygame.font.SysFont(font_name, 32);
-            self.font_info_bold = pygame.font.SysFont(font_name, 36, bold=True)
-            self.font_legend = pygame.font.SysFont(font_name, 40);
-            self.font_battle = pygame.font.SysFont(font_name, 24)
-            self.font_vs = pygame.font.SysFont(font_name, 100, bold=True)
-            self.font_result = pygame.font.SysFont(font_name, 120, bold=True)
-        except pygame.error:
-            self.font_title = pygame.font.SysFont(None, 80);
-            self.font_button = pygame.font.SysFont(None, 50)
-            self.font_info = pygame.font.SysFont(None, 32);
-            self.font_info_bold = pygame.font.SysFont(None, 36, bold=True)
-            self.font_legend = pygame.font.SysFont(None, 40);
-            self.font_battle = pygame.font.SysFont(None, 24)
-            self.font_vs = pygame.font.SysFont(None, 100, bold=True)
-            self.font_result = pygame.font.SysFont(None, 120, bold=True)
+        # 字体只在启动时解析一次，文字表面由 text_cache 按 LRU 缓存
+        self.text_cache = TextCache('sans-serif')
+        self.font_title = self.text_cache.font(80)
+        self.font_button = self.text_cache.font(50)
+        self.font_info = self.text_cache.font(32)
+        self.font_info_bold = self.text_cache.font(36, bold=True)
+        self.font_legend = self.text_cache.font(40)
+        self.font_battle = self.text_cache.font(24)
+        self.font_vs = self.text_cache.font(100, bold=True)
+        self.font_result = self.text_cache.font(120, bold=True)
+        self.font_control = self.text_cache.font(35)
+        # 战斗 / 谜题弹窗复用的全屏透明图层
+        self.overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
 
         self.buttons = {}
         self.icons = create_all_icons(50)
 
+        # 增量绘制：上一帧的画面布局和玩家位置
+        self.last_frame_key = None
+        self.last_player_pos = None
+
     def load_battle_config(self, filepath='battle_config.json'):
-        """加载Boss战配置文件。"""
+        """加载并校验Boss战配置文件，失败时使用默认的 Boss 与技能。"""
         try:
-            with open(filepath, 'r') as f:
-                self.battle_config = json.load(f)
-            print(f"Battle config '{filepath}' loaded successfully.")
+            self.battle_config = load_battle_config(filepath)
+            instrumentation.log('Game', "Battle config '{}' loaded successfully.", filepath)
         except FileNotFoundError:
-            print(f"Error: Battle config file '{filepath}' not found.")
+            print(f"Error: Battle config file '{filepath}' not found. Using default battle settings.")
             self.battle_config = None
-        except json.JSONDecodeError:
-            print(f"Error: Battle config file '{filepath}' has invalid format.")
+        except ValueError as e:
+            print(f"Error: Battle config file '{filepath}' has invalid format ({e}). Using default battle settings.")
             self.battle_config = None
 
     def start_new_game(self, size=None, source_data=None):
-        """开始新游戏，创建所有实体并计算初始资源值。"""
+        """开始新游戏，创建所有实体并在后台规划 DP 路径。"""
         self.maze = Maze(size=15, source_data=source_data)
         if size is not None and source_data is None:
             self.maze.save_to_json()
         self.boss = Boss()
         self.load_battle_config()
 
-        self.dp_optimal_path, _ = calculate_dp_path(self.maze)
+        # 规划在后台进行（会取消上一张迷宫尚未完成的规划），先以贪心 AI 进入游戏
+        self.dp_optimal_path, self.dp_max_score = [], 0
+        self.dp_planner.submit(self.maze)
 
         self.reset_simulation(ALGO_GREEDY)
+        self.game_state = STATE_GAMEPLAY
+        self.sound_manager.play('coin')
+
+    def on_dp_path_ready(self, path, score):
+        """后台规划完成：保存最优路径并计算初始资源值。"""
+        self.dp_optimal_path, self.dp_max_score = path, score
 
         resource_count = 0
         trap_count = 0
@@ -110,44 +131,29 @@ class Game:
         initial_value = (resource_count * 50) + (trap_count * -30)
         self.ai_player.resource_value = initial_value
 
-        print("\n--- 任务3: 动态规划阶段 ---")
-        print(f"最优路径已规划，覆盖 {resource_count} 个资源和 {trap_count} 个陷阱。")
-        print(f"路径: {self.dp_optimal_path}")
-        print(f"初始资源值计算完成: {initial_value}")
-        print("---------------------------\n")
-
-        self.game_state = STATE_GAMEPLAY
-        self.sound_manager.play('coin')
+        instrumentation.log('任务3: 动态规划阶段', "最优路径已规划，覆盖 {} 个资源和 {} 个陷阱。\n路径: {}\n初始资源值计算完成: {}",
+                            resource_count, trap_count, self.dp_optimal_path, initial_value)
 
     def update_state(self):
         """更新游戏状态机。"""
+        if self.dp_planner.pending:
+            result = self.dp_planner.poll()
+            if result is not None:
+                self.on_dp_path_ready(*result)
+
         if self.game_state == STATE_GAMEPLAY and self.ai_player and self.ai_player.is_active:
             self.ai_timer += self.clock.get_time()
             if self.ai_timer >= self.ai_move_interval:
                 self.ai_timer = 0
                 interaction_result = self.ai_player.update(self.maze, self.sound_manager, self.active_algorithm)
 
-                # 更新D-score
-                if self.active_algorithm == ALGO_DP_VISUALIZATION:
-                    if interaction_result == GOLD:
-                        self.ai_player.resource_value += 50
-                    elif interaction_result == TRAP:
-                        self.ai_player.resource_value -= 30
-                if self.active_algorithm == ALGO_GREEDY:
-                    if isinstance(interaction_result, int):  # 检查返回的是否为地块类型常量
-                        # 陷阱的价值本身是负数，所以直接相加即可
-                        value_change = get_tile_value(interaction_result, self.ai_player)
-                        self.ai_player.greedy_score += value_change
-
-                        # 如果到达终点，则输出贪心算法的结果
-                        if interaction_result == END:
-                            print("\n--- 贪心算法执行完毕 ---")
-                            # 移除重复的坐标点，使路径更清晰
-                            unique_path = list(dict.fromkeys(self.ai_player.greedy_path))
-                            print(f"  资源拾取路径: {unique_path}")
-                            print(f"  最终资源得分: {self.ai_player.greedy_score}")
-                            print("--------------------------\n")
-                            self.ai_player.is_active = False  # 停止AI
+                # 计分规则与无界面模拟共用（见 simulation.score_interaction）
+                if score_interaction(self.ai_player, self.active_algorithm, interaction_result):
+                    # 贪心 AI 到达终点，输出贪心算法的结果（移除重复的坐标点，使路径更清晰）
+                    if instrumentation.ENABLED:
+                        unique_path = list(dict.fromkeys(self.ai_player.greedy_path))
+                        instrumentation.log('贪心算法执行完毕', "资源拾取路径: {}\n最终资源得分: {}",
+                                            unique_path, self.ai_player.greedy_score)
 
                 if interaction_result == 'start_battle':
                     self.initiate_battle()
@@ -155,44 +161,65 @@ class Game:
                     self.initiate_puzzle()
 
         elif self.game_state == STATE_BATTLE:
+            if self.battle_solver:
+                self.update_battle()
+                return
             self.battle_end_timer += self.clock.get_time()
             if self.battle_end_timer >= self.battle_display_duration:
                 self.conclude_battle()
 
         elif self.game_state == STATE_PUZZLE:
             self.puzzle_timer += self.clock.get_time()
-            if self.puzzle_timer >= self.puzzle_update_interval:
+            if self.puzzle_fast_forward or self.puzzle_timer >= self.puzzle_update_interval:
                 self.puzzle_timer = 0
                 self.update_puzzle()
 
     def initiate_battle(self):
-        """初始化战斗，计算结果并准备扣分。"""
+        """初始化战斗，创建分步求解器；求解在之后的帧中按时间片推进（见 update_battle）。"""
         self.game_state = STATE_BATTLE
+        self.battle_result = None
+        self.battle_solver = create_battle_solver(self.ai_player, self.boss, self.battle_config, self.battle_cache)
+        self.battle_log.clear()
+        self.battle_log.append("Boss Gauntlet! Analyzing...")
+        self.battle_end_timer = 0
 
-        boss_hp_list = [11, 13, 9, 15]
-        skills = [
-            {"Damage": 8, "Cooldown": 4},
-            {"Damage": 2, "Cooldown": 0},
-            {"Damage": 4, "Cooldown": 2},
-            {"Damage": 6, "Cooldown": 3}
-        ]
-
-        self.boss.health = boss_hp_list
-        self.ai_player.skills = skills
-
-        self.battle_result = find_best_attack_sequence(self.ai_player, self.boss, self.ai_player.skills)
-
-        print("\n--- 任务5: Boss 战阶段 ---")
+    def update_battle(self):
+        """运行一个时间片的战斗求解，刷新当前最好解与下界；求解完成后写出结果。"""
+        deadline = time.perf_counter() + self.battle_slice_ms / 1000
+        progress = None
+        with instrumentation.timer('battle.slice'):
+            for progress in self.battle_solver:
+                if progress['done'] or time.perf_counter() >= deadline:
+                    break
+        if progress is not None and not progress['done']:
+            best = progress['turns'] if progress['turns'] != -1 else '-'
+            status = f"Searching... best {best} turns, lower bound {progress['lower_bound']}"
+            if len(self.battle_log) > 1:
+                self.battle_log[1] = status
+            else:
+                self.battle_log.append(status)
+            return
+        self.battle_solver = None
+        self.finish_battle_analysis(progress)
+
+    def finish_battle_analysis(self, result):
+        """求解完成：记录结果并写出战斗日志。"""
+        self.battle_result = result
         if self.battle_result and self.battle_result['turns'] != -1:
-            print(f"分析完成! 最优解需要 {self.battle_result['turns']} 回合。")
-            print(f"技能序列: {self.battle_result['sequence']}")
+            instrumentation.log('任务5: Boss 战阶段', "分析完成! 最优解需要 {} 回合。\n技能序列: {}",
+                                self.battle_result['turns'], self.battle_result['sequence'])
         else:
-            print("分析完成! 未找到获胜序列。")
+            instrumentation.log('任务5: Boss 战阶段', "分析完成! 未找到获胜序列。")
 
         self.battle_log.clear()
         self.battle_log.append("Boss Gauntlet! Analyzing...")
         if self.battle_result and self.battle_result['turns'] != -1:
-            self.battle_log.append(f"Optimal solution: {self.battle_result['turns']} turns.")
+            if self.battle_result['optimal']:
+                self.battle_log.append(f"Optimal solution: {self.battle_result['turns']} turns.")
+            else:
+                gap = self.battle_result['turns'] - self.battle_result['lower_bound']
+                self.battle_log.append(f"Best found: {self.battle_result['turns']} turns "
+                                       f"(lower bound {self.battle_result['lower_bound']}, gap {gap}).")
             self.battle_log.append("Skill Sequence (Dmg, CD):")
             seq_str_ui = ' -> '.join([f"[{s['Damage']},{s['Cooldown']}]" for s in self.battle_result['sequence']])
             max_len = 45
@@ -203,26 +230,15 @@ class Game:
                 self.battle_log.append(seq_str_ui)
         else:
             self.battle_log.append("Analysis complete: Victory is not possible!")
-        self.battle_end_timer = 0
 
     def conclude_battle(self):
         """根据战斗结果扣减资源值。"""
-        if self.battle_result and self.battle_result['turns'] != -1:
-            self.ai_player.boss_defeated = True
-            self.maze.grid[self.ai_player.y][self.ai_player.x].type = PATH
-            self.ai_player.needs_new_target = True
-
-            deduction = self.battle_result['turns']
-            # DP分数的扣减
-            self.ai_player.resource_value -= deduction
-            print(f"Boss战胜利！扣除资源值: {deduction}。")
-            print(f"当前剩余资源值: {self.ai_player.resource_value}")
-            print("------------------------\n")
-            if self.active_algorithm == ALGO_GREEDY:
-                self.ai_player.greedy_score -= deduction
+        deduction = apply_battle_result(self.maze, self.ai_player, self.battle_result, self.active_algorithm)
+        if deduction is not None:
+            instrumentation.log('任务5: Boss 战阶段', "Boss战胜利！扣除资源值: {}。当前剩余资源值: {}",
+                                deduction, self.ai_player.resource_value)
         else:
-            self.ai_player.x, self.ai_player.y = self.ai_player.start_pos
-            print("AI was defeated and has respawned.")
+            instrumentation.log('任务5: Boss 战阶段', "AI was defeated and has respawned.")
 
         self.battle_result = None
         self.game_state = STATE_GAMEPLAY
@@ -230,56 +246,45 @@ class Game:
     def initiate_puzzle(self):
         """初始化解谜环节。"""
         self.game_state = STATE_PUZZLE
-        salt = b'\xb2\x53\x22\x65\x7d\xdf\xb0\xfe\x9c\xde\xde\xfe\xf3\x1d\xdc\x3e'
-        puzzles = [{"L": "81d5400ab2eca801a80837500be67485d0f8b297db1fa8ecbe4a23b66b65f6b8", "C": [[3, 1], [-1, -1, 5]],
-                    "length": 3, "salt": salt}]
-        chosen_puzzle = random.choice(puzzles)
+        chosen_puzzle = random.choice(PUZZLES)
         self.puzzle_length = chosen_puzzle["length"]
         self.puzzle_clue_texts = self.generate_clue_texts(chosen_puzzle["C"], chosen_puzzle["length"])
         self.puzzle_target_hash = chosen_puzzle["L"]
-        self.puzzle_active_method = "method1"
-        self.puzzle_solver = solve_puzzle_by_method(self.puzzle_active_method, chosen_puzzle["C"],
-                                                    self.puzzle_target_hash, self.puzzle_length, chosen_puzzle["salt"],
-                                                    {"count": 0})
+        self.puzzle_active_method = PUZZLE_METHOD
+        self.puzzle_solver = create_puzzle_solver(chosen_puzzle, self.puzzle_active_method,
+                                                  granularity=self.puzzle_granularity, cache=self.puzzle_cache)
         self.puzzle_current_path, self.puzzle_status_text, self.puzzle_timer, self.puzzle_tries_count = [], "Initializing...", 0, 0
 
     def update_puzzle(self):
         """更新谜题求解进程并扣减资源值。"""
         if not self.puzzle_solver: return
         try:
-            self.puzzle_current_path, self.puzzle_status_text, self.puzzle_tries_count = next(self.puzzle_solver)
+            if self.puzzle_fast_forward:
+                step, exhausted = drain_steps(self.puzzle_solver, self.puzzle_frame_budget_ms / 1000)
+                # 先显示最后一批的进度，再处理求解器耗尽，失败画面上的尝试次数才是最新的
+                if step is not None:
+                    self.puzzle_current_path, self.puzzle_status_text, self.puzzle_tries_count = step
+                if exhausted:
+                    raise StopIteration
+            else:
+                self.puzzle_current_path, self.puzzle_status_text, self.puzzle_tries_count = next(self.puzzle_solver)
             if "Success!" in self.puzzle_status_text:
                 self.draw_puzzle_screen();
                 self.draw_final_puzzle_result("SUCCESS", COLOR_HEALTH_PLAYER)
 
                 deduction = self.puzzle_tries_count
-                # DP分数的扣减
-                self.ai_player.resource_value -= deduction
-                print("\n--- 任务4: 解谜阶段 ---")
+                apply_puzzle_success(self.maze, self.ai_player, deduction, self.active_algorithm)
                 password = self.puzzle_status_text.split(": ")[-1]
-                print(f"密码破解成功！密码: {password}，尝试次数: {self.puzzle_tries_count}")
-                print(f"扣除资源值: {deduction}。当前剩余资源值: {self.ai_player.resource_value}")
-                print("-----------------------\n")
+                instrumentation.log('任务4: 解谜阶段', "密码破解成功！密码: {}，尝试次数: {}\n扣除资源值: {}。当前剩余资源值: {}",
+                                    password, self.puzzle_tries_count, deduction, self.ai_player.resource_value)
 
-                if self.active_algorithm == ALGO_GREEDY:
-                    self.ai_player.greedy_score -= deduction
-
-                locker_tile = self.maze.grid[self.ai_player.y][self.ai_player.x];
-                locker_tile.type = PATH
-                self.ai_player.needs_new_target = True
                 self.game_state = STATE_GAMEPLAY;
                 self.puzzle_solver = None;
                 self.sound_manager.play('coin')
         except StopIteration:
             self.draw_puzzle_screen();
             self.draw_final_puzzle_result("FAILURE", COLOR_HEALTH_BOSS)
-            locker_tile = self.maze.grid[self.ai_player.y][self.ai_player.x];
-            locker_tile.type = WALL
-            if len(self.ai_player.path_history) > 1:
-                self.ai_player.path_history.pop();
-                prev_pos = self.ai_player.path_history[-1]
-                self.ai_player.x, self.ai_player.y = prev_pos
-            self.ai_player.needs_new_target = True;
+            apply_puzzle_failure(self.maze, self.ai_player)
             self.game_state = STATE_GAMEPLAY;
             self.puzzle_solver = None
 
@@ -287,9 +292,13 @@ class Game:
         """游戏主循环。"""
         while self.game_state != STATE_QUIT:
             self.handle_events()
-            self.update_state()
-            self.draw()
+            with instrumentation.timer('game.update'):
+                self.update_state()
+            with instrumentation.timer('game.draw'):
+                self.draw()
             self.clock.tick(FPS)
+        self.dp_planner.shutdown()
+        self.puzzle_cache.flush()
         pygame.quit()
         sys.exit()
 
@@ -298,6 +307,8 @@ class Game:
         for event in pygame.event.get():
             if event.type == pygame.QUIT: self.game_state = STATE_QUIT
             if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1: self.handle_mouse_click(event.pos)
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_f and self.game_state == STATE_PUZZLE:
+                self.puzzle_fast_forward = not self.puzzle_fast_forward
 
     def handle_mouse_click(self, mouse_pos):
         """处理鼠标点击。"""
@@ -327,7 +338,7 @@ class Game:
         elif self.game_state == STATE_GAMEPLAY:
             if button_name == ALGO_GREEDY:
                 self.reset_simulation(ALGO_GREEDY)
-            elif button_name == ALGO_DP_VISUALIZATION:
+            elif button_name == ALGO_DP_VISUALIZATION and not self.dp_planner.pending:
                 self.reset_simulation(ALGO_DP_VISUALIZATION)
             elif button_name == 'main_menu':
                 self.game_state = STATE_MAIN_MENU
@@ -379,17 +390,39 @@ class Game:
         return texts
 
     def draw(self):
-        """绘制所有游戏元素。"""
-        self.screen.fill(COLOR_BG)
+        """
+        绘制所有游戏元素。
+        游戏进行中且画面布局未变（同一迷宫、玩家和算法）时只重绘变化的格子、玩家前后所在的格子和信息面板，
+        并用 pygame.display.update(rects) 提交；其余情况整屏重绘后 flip()。
+        """
         if self.game_state in [STATE_GAMEPLAY, STATE_BATTLE, STATE_PUZZLE] and self.maze:
+            frame_key = (self.game_state, self.maze, self.ai_player, self.active_algorithm)
+            incremental = self.game_state == STATE_GAMEPLAY and frame_key == self.last_frame_key
+            self.last_frame_key = frame_key
+            if not incremental:
+                self.screen.fill(COLOR_BG)
+
             maze_surface = self.screen.subsurface((MAZE_AREA_X, MAZE_AREA_Y, MAZE_AREA_SIZE, MAZE_AREA_SIZE))
             path_to_draw = self.dp_optimal_path if self.active_algorithm == ALGO_DP_VISUALIZATION else None
-            self.maze.draw(maze_surface, dp_path_to_show=path_to_draw)
+            player_pos = (self.ai_player.x, self.ai_player.y) if self.ai_player else None
+            refresh_cells = {pos for pos in (self.last_player_pos, player_pos) if pos is not None}
+            self.last_player_pos = player_pos
+            dp_progress = None
+            if path_to_draw and self.ai_player:
+                dp_progress = len(path_to_draw) - len(self.ai_player.path_to_follow)
+            maze_rects = self.maze.draw(maze_surface, dp_path_to_show=path_to_draw, refresh_cells=refresh_cells,
+                                        full=not incremental, dp_progress=dp_progress)
             if self.ai_player: self.ai_player.draw(maze_surface, self.maze.cell_width, self.maze.cell_height)
             self.draw_info_panel()
+            if incremental:
+                panel_rect = pygame.Rect(INFO_PANEL_X, MAZE_AREA_Y, INFO_PANEL_WIDTH, MAZE_AREA_SIZE)
+                pygame.display.update([rect.move(MAZE_AREA_X, MAZE_AREA_Y) for rect in maze_rects] + [panel_rect])
+                return
             if self.game_state == STATE_BATTLE: self.draw_battle_screen()
             if self.game_state == STATE_PUZZLE: self.draw_puzzle_screen()
         else:
+            self.last_frame_key = None
+            self.screen.fill(COLOR_BG)
             if self.game_state == STATE_MAIN_MENU:
                 self.draw_main_menu()
             elif self.game_state == STATE_INSTRUCTIONS:
@@ -398,9 +431,14 @@ class Game:
                 self.draw_choose_maze_source()
         pygame.display.flip()
 
+    def clear_overlay(self):
+        """清空并返回复用的全屏弹窗图层。"""
+        self.overlay.fill((0, 0, 0, 0))
+        return self.overlay
+
     def draw_text_on_surface(self, surface, text, font, color, pos, centered=False):
         """在指定表面绘制文本。"""
-        text_surface = font.render(text, True, color)
+        text_surface = self.text_cache.render(font, text, color)
         rect = text_surface.get_rect(center=pos) if centered else text_surface.get_rect(topleft=pos)
         surface.blit(text_surface, rect)
 
@@ -408,14 +446,19 @@ class Game:
         """在主屏幕上绘制文本。"""
         self.draw_text_on_surface(self.screen, text, font, color, pos, centered)
 
-    def draw_button(self, name, text, center_pos, size, font=None):
-        """绘制按钮。"""
+    def draw_button(self, name, text, center_pos, size, font=None, enabled=True):
+        """绘制按钮；禁用的按钮显示为灰色且不响应点击。"""
         if font is None: font = self.font_button
         rect = pygame.Rect((0, 0), size);
         rect.center = center_pos;
         shadow_rect = rect.copy();
         shadow_rect.move_ip(5, 5)
         pygame.draw.rect(self.screen, COLOR_BTN_SHADOW, shadow_rect, border_radius=20)
+        if not enabled:
+            pygame.draw.rect(self.screen, COLOR_HEALTH_BG, rect, border_radius=20)
+            self.draw_text(text, font, COLOR_GRID, rect.center, centered=True)
+            self.buttons.pop(name, None)
+            return
         bg_color = COLOR_BTN_HOVER if rect.collidepoint(pygame.mouse.get_pos()) else COLOR_BTN
         pygame.draw.rect(self.screen, bg_color, rect, border_radius=20)
         self.draw_text(text, font, COLOR_TEXT, rect.center, centered=True);
@@ -473,17 +516,19 @@ class Game:
                 self.draw_text(f"{stat}:", self.font_info_bold, COLOR_TEXT, (INFO_PANEL_X + 25, y_offset))
                 self.draw_text(value, self.font_info, COLOR_SUBTEXT, (INFO_PANEL_X + 180, y_offset))
                 y_offset += 40
+        if self.dp_planner.pending:
+            self.draw_text("DP: planning...", self.font_info, COLOR_SUBTEXT, (INFO_PANEL_X + 25, 400))
 
         y_offset = 450
         self.draw_text("CONTROL", self.font_button, COLOR_BTN_HOVER, (INFO_PANEL_X + INFO_PANEL_WIDTH / 2, y_offset),
                        centered=True)
         y_offset += 60;
-        btn_w, btn_h, btn_font = 240, 55, pygame.font.SysFont('sans-serif', 35)
+        btn_w, btn_h, btn_font = 240, 55, self.font_control
         self.draw_button(ALGO_GREEDY, "Run Greedy AI", (INFO_PANEL_X + INFO_PANEL_WIDTH / 2, y_offset), (btn_w, btn_h),
                          font=btn_font)
         y_offset += 75
         self.draw_button(ALGO_DP_VISUALIZATION, "Show DP Path", (INFO_PANEL_X + INFO_PANEL_WIDTH / 2, y_offset),
-                         (btn_w, btn_h), font=btn_font)
+                         (btn_w, btn_h), font=btn_font, enabled=not self.dp_planner.pending)
         y_offset = 650
         self.draw_text("RUNNING:", self.font_info_bold, COLOR_TEXT, (INFO_PANEL_X + INFO_PANEL_WIDTH / 2, y_offset),
                        centered=True)
@@ -493,7 +538,7 @@ class Game:
 
     def draw_battle_screen(self):
         """重构后的战斗界面，以展示车轮战进度。"""
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+        overlay = self.clear_overlay()
         popup_width, popup_height = 800, 500
         popup_x, popup_y = (SCREEN_WIDTH - popup_width) / 2, (SCREEN_HEIGHT - popup_height) / 2
         popup_rect = pygame.Rect(popup_x, popup_y, popup_width, popup_height)
@@ -530,8 +575,8 @@ class Game:
 
     def draw_final_puzzle_result(self, message, color):
         """绘制谜题的最终结果。"""
-        result_overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-        text_surf = self.font_result.render(message, True, color)
+        result_overlay = self.clear_overlay()
+        text_surf = self.text_cache.render(self.font_result, message, color)
         text_rect = text_surf.get_rect(center=(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2))
         bg_rect = text_rect.inflate(40, 40)
         pygame.draw.rect(result_overlay, (*COLOR_HUD_BG, 230), bg_rect, border_radius=15)
@@ -542,7 +587,7 @@ class Game:
 
     def draw_puzzle_screen(self):
         """绘制谜题界面。"""
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA);
+        overlay = self.clear_overlay()
         pygame.draw.rect(overlay, COLOR_POPUP_BG, (0, 0, SCREEN_WIDTH, SCREEN_HEIGHT))
         title_font, info_font = self.font_title, self.font_info
         self.draw_text_on_surface(overlay, "Password Lock", title_font, COLOR_TEXT, (SCREEN_WIDTH / 2, 80),
@@ -570,4 +615,7 @@ class Game:
                                   (start_x + total_width, y_pos - 40))
         self.draw_text_on_surface(overlay, self.puzzle_status_text, self.font_info_bold, COLOR_SUBTEXT,
                                   (SCREEN_WIDTH / 2, y_pos + 150), centered=True)
+        speed_text = "Fast-forward: ON (F)" if self.puzzle_fast_forward else "Fast-forward: OFF (F)"
+        self.draw_text_on_surface(overlay, speed_text, info_font, COLOR_TEXT, (SCREEN_WIDTH / 2, y_pos + 200),
+                                  centered=True)
         self.screen.blit(overlay, (0, 0))
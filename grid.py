@@ -0,0 +1,99 @@
+# 紧凑的迷宫网格存储：用一个按行优先排列的 bytearray 保存所有地块类型，
+# 并提供与 Tile 兼容的视图，方便旧代码继续使用 grid[y][x].type 的写法。
+
+from config import *
+
+
+class TileView:
+    """指向 Grid 中某个单元格的轻量视图，接口与 entities.Tile 保持一致；写入时把格子登记为脏格"""
+    __slots__ = ('_cells', '_index', '_dirty')
+    is_visible = True
+
+    def __init__(self, cells, index, dirty):
+        self._cells = cells
+        self._index = index
+        self._dirty = dirty
+
+    @property
+    def type(self):
+        return self._cells[self._index]
+
+    @type.setter
+    def type(self, tile_type):
+        self._cells[self._index] = tile_type
+        self._dirty.add(self._index)
+
+
+class GridRow:
+    """网格中的一行，支持 row[x] 取得 TileView 以及迭代"""
+    __slots__ = ('_cells', '_offset', '_size', '_dirty')
+
+    def __init__(self, cells, offset, size, dirty):
+        self._cells = cells
+        self._offset = offset
+        self._size = size
+        self._dirty = dirty
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, x):
+        if not 0 <= x < self._size:
+            raise IndexError("grid column out of range")
+        return TileView(self._cells, self._offset + x, self._dirty)
+
+    def __iter__(self):
+        for x in range(self._size):
+            yield TileView(self._cells, self._offset + x, self._dirty)
+
+
+class Grid:
+    """
+    基于 bytearray 的方形迷宫网格。
+    - cells[y * size + x] 即为 (x, y) 处的地块类型，寻路等热点代码直接读取它
+    - grid[y][x].type 的旧式访问通过 GridRow/TileView 视图实现
+    - 经由 set() 或视图写入的格子编号记入 dirty，供 Maze.draw 只重绘变化的格子；
+      直接写 cells 的批量操作（生成、copy_from）不登记，调用方需要整体重绘
+    """
+
+    def __init__(self, size, cells=None, fill=PATH):
+        self.size = size
+        if cells is None:
+            self.cells = bytearray([fill]) * (size * size)
+        else:
+            if len(cells) != size * size:
+                raise ValueError("网格数据长度与尺寸不匹配。")
+            self.cells = bytearray(cells)
+        self.dirty = set()
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, y):
+        if not 0 <= y < self.size:
+            raise IndexError("grid row out of range")
+        return GridRow(self.cells, y * self.size, self.size, self.dirty)
+
+    def __iter__(self):
+        for y in range(self.size):
+            yield GridRow(self.cells, y * self.size, self.size, self.dirty)
+
+    def get(self, x, y):
+        return self.cells[y * self.size + x]
+
+    def set(self, x, y, tile_type):
+        self.cells[y * self.size + x] = tile_type
+        self.dirty.add(y * self.size + x)
+
+    def copy(self):
+        return Grid(self.size, self.cells)
+
+    def take_dirty(self):
+        """返回并清空自上次调用以来被修改的格子编号"""
+        dirty = list(self.dirty)
+        self.dirty.clear()
+        return dirty
+
+    def copy_from(self, other):
+        """整块复制另一个同尺寸网格的数据（单次缓冲区拷贝）"""
+        self.cells[:] = other.cells
@@ -0,0 +1,123 @@
+# 轻量级埋点：计数器、计时器、按阶段记录的搜索统计、日志事件，以及可选的 cProfile 钩子。
+# 默认关闭，关闭时的开销只有一次布尔判断：热点循环在循环外读取 ENABLED，日志消息延迟到启用时才格式化。
+# 打开方式：环境变量 MAZE_INSTRUMENT=1（或调用 enable()）；MAZE_PROFILE=<文件> 额外对 profile() 包住的
+# 代码段启用 cProfile，进程退出时写出 pstats 文件。启用时进程退出前把汇总打印到 stderr。
+#
+# 用法：
+#     if instrumentation.ENABLED: instrumentation.count('dp.pushed')
+#     with instrumentation.timer('battle.solve'): ...
+#     instrumentation.log('dp', "Phase 1 Complete! Arrived at boss with score {:.0f}.", score)
+#     instrumentation.phase('dp.a_star', expanded=..., max_queue=..., seconds=...)
+
+import atexit
+import contextlib
+import cProfile
+import os
+import sys
+import time
+from collections import defaultdict
+
+ENABLED = os.environ.get("MAZE_INSTRUMENT", "0") not in ("", "0")
+PROFILE_PATH = os.environ.get("MAZE_PROFILE") or None
+
+counters = defaultdict(int)
+timers = defaultdict(lambda: [0, 0.0, 0.0])  # 名称 -> [次数, 总秒数, 最长秒数]
+phases = []  # 每个搜索阶段一条记录：{'name': ..., 字段...}
+
+_NULL_CONTEXT = contextlib.nullcontext()
+_profiler = None
+_profile_depth = 0
+
+
+def enable(flag=True):
+    global ENABLED
+    ENABLED = flag
+
+
+def reset():
+    counters.clear()
+    timers.clear()
+    phases.clear()
+
+
+def count(name, n=1):
+    if ENABLED:
+        counters[name] += n
+
+
+@contextlib.contextmanager
+def _timed(name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        entry = timers[name]
+        entry[0] += 1
+        entry[1] += elapsed
+        entry[2] = max(entry[2], elapsed)
+
+
+def timer(name):
+    """计时上下文；关闭时返回共享的空上下文"""
+    return _timed(name) if ENABLED else _NULL_CONTEXT
+
+
+def phase(name, **fields):
+    """记录一个搜索阶段的统计（展开数、队列峰值、耗时等）"""
+    if ENABLED:
+        phases.append({'name': name, **fields})
+
+
+def log(category, template, *args):
+    """替代调试 print：启用时才格式化并输出"""
+    if ENABLED:
+        print(f"[{category}] " + (template.format(*args) if args else template))
+
+
+@contextlib.contextmanager
+def _profiled():
+    global _profiler, _profile_depth
+    if _profiler is None:
+        _profiler = cProfile.Profile()
+    _profile_depth += 1
+    if _profile_depth == 1:
+        _profiler.enable()
+    try:
+        yield
+    finally:
+        _profile_depth -= 1
+        if _profile_depth == 0:
+            _profiler.disable()
+
+
+def profile():
+    """设置 MAZE_PROFILE 时对包住的代码段启用 cProfile（可嵌套，结果累计到同一份统计）"""
+    return _profiled() if PROFILE_PATH else _NULL_CONTEXT
+
+
+def report():
+    """返回当前统计的文字汇总"""
+    lines = []
+    if counters:
+        lines.append("counters:")
+        lines.extend(f"  {name:<36} {value:>12}" for name, value in sorted(counters.items()))
+    if timers:
+        lines.append(f"{'timers:':<38} {'calls':>5} {'total s':>11} {'max s':>11}")
+        lines.extend(f"  {name:<36} {calls:>5} {total:>11.4f} {longest:>11.4f}"
+                     for name, (calls, total, longest) in sorted(timers.items()))
+    if phases:
+        lines.append("phases:")
+        for record in phases:
+            fields = ", ".join(f"{key}={value:.4f}" if isinstance(value, float) else f"{key}={value}"
+                               for key, value in record.items() if key != 'name')
+            lines.append(f"  {record['name']}: {fields}")
+    return "\n".join(lines)
+
+
+@atexit.register
+def _finish():
+    if _profiler is not None and PROFILE_PATH:
+        _profiler.dump_stats(PROFILE_PATH)
+    if ENABLED and (counters or timers or phases):
+        print("\n--- instrumentation ---\n" + report(), file=sys.stderr)
@@ -1,23 +1,23 @@
 import os
 import pygame
 import random
-from collections import deque
 from config import *  # 配置文件：颜色、迷宫区域大小、常量等
-from entities import Tile  # Tile类代表迷宫中的单元格
-from utils import create_all_icons  # 加载图标资源
+from grid import Grid  # 基于 bytearray 的紧凑网格，提供 Tile 兼容视图
+from maze_generator import generate_base_maze  # 迭代式分治迷宫生成引擎
+from utils import create_all_icons, bfs_path  # 加载图标资源、BFS 寻路
 import json
 
 class Maze:
     """迷宫生成与管理类（支持从文件加载或随机生成）"""
 
-    def __init__(self, size=None, source_data=None):
+    def __init__(self, size=None, source_data=None, load_icons=True):
         if source_data:
             # 如果传入字符矩阵，则从数据中加载迷宫
             self._load_from_data(source_data)
         elif size:
             # 如果传入尺寸，则生成一个新的随机迷宫（确保为奇数）
             self.size = size if size % 2 != 0 else size + 1
-            self.grid = [[Tile(PATH) for _ in range(self.size)] for _ in range(self.size)]
+            self.grid = Grid(self.size)
             self._generate_base_maze()  # 生成基本通路结构（分治法）
             self._place_start_end_points()  # 设置起点与终点
             main_path = self._find_main_path()  # 计算主路径（起点到终点的路径）
@@ -35,8 +35,15 @@ class Maze:
         self.cell_height = MAZE_AREA_SIZE // self.size
 
         # 保存初始迷宫状态，用于重置
-        self.pristine_grid = [[Tile(tile.type) for tile in row] for row in self.grid]
-        self._load_icons()  # 加载图标资源
+        self.pristine_grid = self.grid.copy()
+        self.tile_icons = {}
+        if load_icons:
+            self._load_icons()  # 加载图标资源（需要 pygame 字体模块；无界面模拟时跳过）
+        self._static_surface = None  # 缓存的地块 + 网格线图层，首次绘制时生成
+        self._path_overlay = None    # DP 路径图层（SRCALPHA），路径变化时重新生成
+        self._walked_overlay = None  # 已走过的路径段图层，随进度逐段追加
+        self._overlay_path = None
+        self._walked_segments = 0
 
     def _load_from_data(self, maze_data):
         """从字符数组加载迷宫结构（#墙、空格、S起点、E终点、G金币等）"""
@@ -45,7 +52,8 @@ class Maze:
             'L': LOCKER, 'G': GOLD, 'T': TRAP
         }
         self.size = len(maze_data)
-        self.grid = [[Tile(PATH) for _ in range(self.size)] for _ in range(self.size)]
+        self.grid = Grid(self.size)
+        cells = self.grid.cells
 
         found_start = False
         found_end = False
@@ -53,7 +61,7 @@ class Maze:
         for r, row_list in enumerate(maze_data):
             for c, char in enumerate(row_list):
                 tile_type = CHAR_TO_TILE.get(char, PATH)
-                self.grid[r][c].type = tile_type
+                cells[r * self.size + c] = tile_type
                 if tile_type == START:
                     self.start_pos = (c, r)
                     found_start = True
@@ -64,16 +72,17 @@ class Maze:
         # 若缺少起点或终点，则设为默认位置
         if not found_start:
             self.start_pos = (1, 1)
-            self.grid[1][1].type = START
+            self.grid.set(1, 1, START)
             print("警告: 未找到起点 'S'，使用默认位置 (1,1)")
         if not found_end:
             self.end_pos = (self.size - 2, self.size - 2)
-            self.grid[self.size - 2][self.size - 2].type = END
+            self.grid.set(self.size - 2, self.size - 2, END)
             print("警告: 未找到终点 'E'，使用默认位置")
 
     def reset(self):
-        """将迷宫恢复为初始状态"""
-        self.grid = [[Tile(tile.type) for tile in row] for row in self.pristine_grid]
+        """将迷宫恢复为初始状态（整块拷贝初始网格数据）"""
+        self.grid.copy_from(self.pristine_grid)
+        self._static_surface = None  # 整块拷贝不登记脏格，下次绘制时整体重建
 
     def _load_icons(self):
         """加载图标资源，并缩放为合适大小"""
@@ -83,69 +92,34 @@ class Maze:
         self.tile_icons = create_all_icons(icon_size)
 
     def _generate_base_maze(self):
-        """使用递归分治法构建基础迷宫结构（四周为墙）"""
-        for i in range(self.size):
-            self.grid[0][i].type = WALL
-            self.grid[self.size - 1][i].type = WALL
-            self.grid[i][0].type = WALL
-            self.grid[i][self.size - 1].type = WALL
-        self._divide(1, 1, self.size - 2, self.size - 2)
-
-    def _divide(self, x, y, width, height):
-        """递归地划分区域并添加墙壁"""
-        if width < 2 or height < 2: return
-        horizontal = width < height or (width == height and random.choice([True, False]))
-        if horizontal:
-            wall_y = y + (random.randrange(height // 2) * 2 + 1)
-            passage_x = x + (random.randrange((width + 1) // 2) * 2)
-            for i in range(x, x + width + 1):
-                self.grid[wall_y][i].type = WALL
-            self.grid[wall_y][passage_x].type = PATH  # 保留一个通道
-            self._divide(x, y, width, wall_y - y)
-            self._divide(x, wall_y + 1, width, y + height - wall_y - 1)
-        else:
-            wall_x = x + (random.randrange(width // 2) * 2 + 1)
-            passage_y = y + (random.randrange((height + 1) // 2) * 2)
-            for i in range(y, y + height + 1):
-                self.grid[i][wall_x].type = WALL
-            self.grid[passage_y][wall_x].type = PATH
-            self._divide(x, y, wall_x - x, height)
-            self._divide(wall_x + 1, y, x + width - wall_x - 1, height)
+        """使用迭代分治法构建基础迷宫结构（四周为墙），见 maze_generator"""
+        generate_base_maze(self.grid)
 
     def _place_start_end_points(self):
         """设置起点终点坐标并标记在网格上"""
         self.start_pos = (1, 1)
         self.end_pos = (self.size - 2, self.size - 2)
-        self.grid[self.start_pos[1]][self.start_pos[0]].type = START
-        self.grid[self.end_pos[1]][self.end_pos[0]].type = END
+        self.grid.set(*self.start_pos, START)
+        self.grid.set(*self.end_pos, END)
 
     def _find_main_path(self):
         """使用 BFS 寻找从起点到终点的路径"""
-        queue = deque([(self.start_pos, [self.start_pos])])
-        visited = {self.start_pos}
-        while queue:
-            (x, y), path = queue.popleft()
-            if (x, y) == self.end_pos:
-                return path
-            for dx, dy in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
-                nx, ny = x + dx, y + dy
-                if 0 <= nx < self.size and 0 <= ny < self.size and \
-                   self.grid[ny][nx].type != WALL and (nx, ny) not in visited:
-                    visited.add((nx, ny))
-                    queue.append(((nx, ny), path + [(nx, ny)]))
-        return []
+        path = bfs_path(self.grid.cells, self.size, self.start_pos, self.end_pos,
+                        directions=[(0, 1), (0, -1), (1, 0), (-1, 0)])
+        return path or []
 
     def _find_dead_ends(self, maze_grid):
         """找到所有死胡同（仅一个邻居的路径格）"""
         dead_ends = []
         directions = [(0, 1), (0, -1), (1, 0), (-1, 0)]
-        for r in range(self.size):
-            for c in range(self.size):
-                if maze_grid[r][c].type == PATH:
+        cells, size = maze_grid.cells, self.size
+        for r in range(size):
+            for c in range(size):
+                if cells[r * size + c] == PATH:
                     path_neighbors = 0
                     for dr, dc in directions:
                         nr, nc = r + dr, c + dc
-                        if 0 <= nr < self.size and 0 <= nc < self.size and maze_grid[nr][nc].type != WALL:
+                        if 0 <= nr < size and 0 <= nc < size and cells[nr * size + nc] != WALL:
                             path_neighbors += 1
                     if path_neighbors == 1:
                         dead_ends.append((c, r))
@@ -168,11 +142,11 @@ class Maze:
         rooms = []
         for i in range(min(count, len(potential))):
             lx, ly = potential[i]
-            self.grid[ly][lx].type = LOCKER  # 放置上锁门
+            self.grid.set(lx, ly, LOCKER)  # 放置上锁门
             for dr, dc in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
                 nr, nc = ly + dr, lx + dc
-                if 0 <= nr < self.size and 0 <= nc < self.size and self.grid[nr][nc].type == PATH:
-                    self.grid[nr][nc].type = GOLD
+                if 0 <= nr < self.size and 0 <= nc < self.size and self.grid.get(nc, nr) == PATH:
+                    self.grid.set(nc, nr, GOLD)
                     rooms.append([(lx, ly), (nc, nr)])
                     break
         return rooms
@@ -182,38 +156,39 @@ class Maze:
         boss_placed = False
         if large_rooms and random.random() < 0.6:
             pos = random.choice(large_rooms)[1]
-            if self.grid[pos[1]][pos[0]].type not in [START, END]:
-                self.grid[pos[1]][pos[0]].type = BOSS
+            if self.grid.get(*pos) not in [START, END]:
+                self.grid.set(*pos, BOSS)
                 boss_placed = True
 
         if not boss_placed and len(main_path) > 2:
             start_i = int(len(main_path) * 0.2)
             end_i = int(len(main_path) * 0.8)
-            choices = [p for p in main_path[start_i:end_i] if self.grid[p[1]][p[0]].type == PATH]
+            choices = [p for p in main_path[start_i:end_i] if self.grid.get(*p) == PATH]
             if choices:
                 px, py = random.choice(choices)
-                self.grid[py][px].type = BOSS
+                self.grid.set(px, py, BOSS)
                 boss_placed = True
 
         if not boss_placed:
             # 最后保底策略：强制放置
             for r in range(1, self.size - 1):
                 for c in range(1, self.size - 1):
-                    if self.grid[r][c].type == PATH:
-                        self.grid[r][c].type = BOSS
+                    if self.grid.get(c, r) == PATH:
+                        self.grid.set(c, r, BOSS)
                         return
             print("警告: Boss 无法放置")
 
     def _place_traps_on_main_path(self, main_path):
         """在主路径上放置陷阱（15% 概率）"""
-        path_cells = [p for p in main_path if self.grid[p[1]][p[0]].type == PATH]
+        path_cells = [p for p in main_path if self.grid.get(*p) == PATH]
         num_traps = int(len(path_cells) * 0.15)
         for x, y in random.sample(path_cells, min(num_traps, len(path_cells))):
-            self.grid[y][x].type = TRAP
+            self.grid.set(x, y, TRAP)
 
     def _place_additional_resources(self, main_path):
         """在迷宫中非主路径上放置金币资源"""
-        path_cells = [(c, r) for r in range(self.size) for c in range(self.size) if self.grid[r][c].type == PATH]
+        cells, size = self.grid.cells, self.size
+        path_cells = [(c, r) for r in range(size) for c in range(size) if cells[r * size + c] == PATH]
         main_path_set = set(main_path)
         eligible_cells = [cell for cell in path_cells if cell not in main_path_set]
 
@@ -224,35 +199,116 @@ class Maze:
             num_gold = int(len(eligible_cells) * 0.15)
 
         for x, y in random.sample(eligible_cells, min(num_gold, len(eligible_cells))):
-            self.grid[y][x].type = GOLD
-
-    def draw(self, screen, dp_path_to_show=None):
-        """绘制迷宫和可视化路径"""
-        screen.fill(COLOR_BG)
-        for r, row in enumerate(self.grid):
-            for c, tile in enumerate(row):
+            self.grid.set(x, y, GOLD)
+
+    def _render_cell(self, surface, index):
+        """把一个格子（底色、图标以及它左侧和上方的网格线）画到静态图层上"""
+        c, r = index % self.size, index // self.size
+        x, y = c * self.cell_width, r * self.cell_height
+        tile_type = self.grid.cells[index]
+        rect = pygame.Rect(x, y, self.cell_width, self.cell_height)
+        pygame.draw.rect(surface, TILE_TYPE_COLORS.get(tile_type, COLOR_PATH), rect)
+        if tile_type in self.tile_icons:
+            icon = self.tile_icons[tile_type]
+            surface.blit(icon, icon.get_rect(center=rect.center))
+        pygame.draw.line(surface, COLOR_GRID, (x, y), (x, y + self.cell_height - 1))
+        pygame.draw.line(surface, COLOR_GRID, (x, y), (x + self.cell_width - 1, y))
+        return rect
+
+    def _build_static_surface(self, target_size):
+        """完整绘制一次地块与网格线，作为之后每帧复用的静态图层"""
+        surface = pygame.Surface(target_size)
+        surface.fill(COLOR_BG)
+        cells, size = self.grid.cells, self.size
+        for r in range(size):
+            for c in range(size):
+                tile_type = cells[r * size + c]
                 rect = (c * self.cell_width, r * self.cell_height, self.cell_width, self.cell_height)
-                pygame.draw.rect(screen, TILE_TYPE_COLORS.get(tile.type, COLOR_PATH), rect)
-                if tile.type in self.tile_icons:
-                    icon = self.tile_icons[tile.type]
+                pygame.draw.rect(surface, TILE_TYPE_COLORS.get(tile_type, COLOR_PATH), rect)
+                if tile_type in self.tile_icons:
+                    icon = self.tile_icons[tile_type]
                     icon_rect = icon.get_rect(center=pygame.Rect(rect).center)
-                    screen.blit(icon, icon_rect)
-
-        # 绘制路径线条
-        if dp_path_to_show:
-            for i in range(len(dp_path_to_show) - 1):
-                p1 = dp_path_to_show[i]
-                p2 = dp_path_to_show[i + 1]
-                start = (p1[0] * self.cell_width + self.cell_width // 2,
-                         p1[1] * self.cell_height + self.cell_height // 2)
-                end = (p2[0] * self.cell_width + self.cell_width // 2,
-                       p2[1] * self.cell_height + self.cell_height // 2)
-                pygame.draw.line(screen, COLOR_DP_PATH, start, end, 4)
+                    surface.blit(icon, icon_rect)
 
         # 画网格线（增强视觉辅助）
         for i in range(self.size + 1):
-            pygame.draw.line(screen, COLOR_GRID, (i * self.cell_width, 0), (i * self.cell_width, MAZE_AREA_SIZE))
-            pygame.draw.line(screen, COLOR_GRID, (0, i * self.cell_height), (MAZE_AREA_SIZE, i * self.cell_height))
+            pygame.draw.line(surface, COLOR_GRID, (i * self.cell_width, 0), (i * self.cell_width, MAZE_AREA_SIZE))
+            pygame.draw.line(surface, COLOR_GRID, (0, i * self.cell_height), (MAZE_AREA_SIZE, i * self.cell_height))
+        self._static_surface = surface
+        self.grid.dirty.clear()
+
+    def cell_rect(self, x, y):
+        return pygame.Rect(x * self.cell_width, y * self.cell_height, self.cell_width, self.cell_height)
+
+    def _segment_endpoints(self, path, i):
+        p1, p2 = path[i], path[i + 1]
+        start = (p1[0] * self.cell_width + self.cell_width // 2, p1[1] * self.cell_height + self.cell_height // 2)
+        end = (p2[0] * self.cell_width + self.cell_width // 2, p2[1] * self.cell_height + self.cell_height // 2)
+        return start, end
+
+    def _update_path_overlays(self, path, progress, target_size):
+        """
+        保证路径图层与 path 对应、已走图层画到第 progress 段为止。
+        返回 (是否重建了路径图层, 本次新画的路径段矩形)。
+        """
+        rebuilt = path is not self._overlay_path or self._path_overlay is None or \
+            self._path_overlay.get_size() != target_size
+        if rebuilt:
+            self._overlay_path = path
+            self._path_overlay = pygame.Surface(target_size, pygame.SRCALPHA)
+            for i in range(len(path) - 1):
+                pygame.draw.line(self._path_overlay, COLOR_DP_PATH, *self._segment_endpoints(path, i), 4)
+            self._walked_overlay = pygame.Surface(target_size, pygame.SRCALPHA)
+            self._walked_segments = 0
+
+        progress = max(0, min(progress, len(path) - 1))
+        if progress < self._walked_segments:
+            # 进度回退（重新开始模拟）时清空已走图层
+            self._walked_overlay.fill((0, 0, 0, 0))
+            self._walked_segments = 0
+            rebuilt = True
+        new_rects = []
+        for i in range(self._walked_segments, progress):
+            new_rects.append(pygame.draw.line(self._walked_overlay, COLOR_DP_PATH_WALKED,
+                                              *self._segment_endpoints(path, i), 4))
+        self._walked_segments = progress
+        return rebuilt, new_rects
+
+    def draw(self, screen, dp_path_to_show=None, refresh_cells=(), full=False, dp_progress=None):
+        """
+        绘制迷宫和可视化路径，返回 screen 上被重绘的矩形列表（相对 screen 的坐标）。
+        地块与网格线缓存在静态图层中，被修改的格子（Grid.dirty）只在图层上局部重画；
+        DP 路径只在路径变化时渲染到一张 SRCALPHA 图层上，之后每帧整块或按矩形拷贝。
+        dp_progress 为已走过的路径段数（None 表示不显示进度），已走部分另用一张图层逐段叠加。
+        full=False 时只把脏格、refresh_cells（如玩家前后所在的格子）和新走过的路径段从图层拷回 screen。
+        """
+        target_size = screen.get_size()
+        if self._static_surface is None or self._static_surface.get_size() != target_size:
+            self._build_static_surface(target_size)
+            full = True
+
+        dirty_rects = [self._render_cell(self._static_surface, index) for index in self.grid.take_dirty()]
+
+        layers = [self._static_surface]
+        if dp_path_to_show:
+            rebuilt, walked_rects = self._update_path_overlays(
+                dp_path_to_show, 0 if dp_progress is None else dp_progress, target_size)
+            full = full or rebuilt
+            dirty_rects.extend(walked_rects)
+            layers.append(self._path_overlay)
+            if dp_progress is not None:
+                layers.append(self._walked_overlay)
+
+        if full:
+            for layer in layers:
+                screen.blit(layer, (0, 0))
+            return [screen.get_rect()]
+
+        dirty_rects.extend(self.cell_rect(x, y) for x, y in refresh_cells)
+        for rect in dirty_rects:
+            for layer in layers:
+                screen.blit(layer, rect, rect)
+        return dirty_rects
 
     def save_to_json(self, filename=None):
         """将当前迷宫保存为 JSON 格式（只保存字符矩阵）"""
@@ -262,8 +318,9 @@ class Maze:
         }
 
         maze_chars = []
-        for row_of_tiles in self.grid:
-            row_chars = [TILE_TO_CHAR.get(tile.type, ' ') for tile in row_of_tiles]
+        cells, size = self.grid.cells, self.size
+        for r in range(size):
+            row_chars = [TILE_TO_CHAR.get(tile_type, ' ') for tile_type in cells[r * size:(r + 1) * size]]
             maze_chars.append(row_chars)
             
         data = {"maze": maze_chars}
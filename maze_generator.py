@@ -0,0 +1,48 @@
+# 迷宫基础结构生成引擎：迭代式分治法。
+# 用显式工作栈代替递归（大尺寸迷宫不会触发递归深度限制），
+# 并以整段切片的方式在 Grid.cells 上绘制墙壁。
+
+import random
+from config import *
+
+
+def generate_base_maze(grid, rng=random):
+    """
+    在 grid 上生成四周为墙的分治迷宫。
+    工作栈按“先处理前一半、再处理后一半”的顺序出栈，随机数的消耗顺序与原递归版本完全一致，
+    因此相同的 random 种子会得到相同的迷宫。
+    """
+    size = grid.size
+    cells = grid.cells
+    wall_run = memoryview(bytes([WALL]) * size)
+
+    # 四周的墙：上下两行为连续切片，左右两列为步长为 size 的切片
+    cells[0:size] = wall_run
+    cells[(size - 1) * size:size * size] = wall_run
+    cells[0::size] = wall_run
+    cells[size - 1::size] = wall_run
+
+    stack = [(1, 1, size - 2, size - 2)]
+    while stack:
+        x, y, width, height = stack.pop()
+        if width < 2 or height < 2:
+            continue
+        horizontal = width < height or (width == height and rng.choice([True, False]))
+        if horizontal:
+            wall_y = y + (rng.randrange(height // 2) * 2 + 1)
+            passage_x = x + (rng.randrange((width + 1) // 2) * 2)
+            row = wall_y * size
+            cells[row + x:row + x + width + 1] = wall_run[:width + 1]
+            cells[row + passage_x] = PATH  # 保留一个通道
+            # 后压入的先处理：先上半部分，再下半部分
+            stack.append((x, wall_y + 1, width, y + height - wall_y - 1))
+            stack.append((x, y, width, wall_y - y))
+        else:
+            wall_x = x + (rng.randrange(width // 2) * 2 + 1)
+            passage_y = y + (rng.randrange((height + 1) // 2) * 2)
+            top = y * size + wall_x
+            cells[top:top + height * size + 1:size] = wall_run[:height + 1]
+            cells[passage_y * size + wall_x] = PATH
+            # 先左半部分，再右半部分
+            stack.append((wall_x + 1, y, x + width - wall_x - 1, height))
+            stack.append((x, y, wall_x - x, height))
@@ -0,0 +1,301 @@
+# 无界面模拟：不依赖显示、声音和计时器，按与 Game.update_state 相同的计分规则逐步推进 AIPlayer，
+# Boss 战与解谜在当步同步求解。适合批量评估大量迷宫。
+# 计分、战斗、解谜的规则函数同时被 game.py 使用，保证两边结果一致。
+#
+# 用法：
+#     maze = Maze(source_data=data['maze'], load_icons=False)
+#     result = Simulation(maze, ALGO_DP_VISUALIZATION).run()
+#     result['score']
+
+import json
+import random
+
+from config import *
+import instrumentation
+from entities import AIPlayer, Boss
+from algorithms.branch_and_bound import GauntletCache, find_best_attack_sequence, iter_boss_gauntlet
+from algorithms.backtracking import GRANULARITY_STEP, solve_puzzle_by_method, solve_puzzle_instant
+from algorithms.parallel_backtracking import PARALLEL_METHODS, crack_password_parallel, solve_puzzle_parallel
+from algorithms.puzzle_cache import PuzzleCache, puzzle_cache_key, record_solution, replay_solution
+from algorithms.greedy import get_tile_value
+
+# Boss 战：依次挑战的 Boss 血量与玩家可用技能（battle_config.json 缺失或无效时的默认值）
+BOSS_HP_LIST = [11, 13, 9, 15]
+PLAYER_SKILLS = [
+    {"Damage": 8, "Cooldown": 4},
+    {"Damage": 2, "Cooldown": 0},
+    {"Damage": 4, "Cooldown": 2},
+    {"Damage": 6, "Cooldown": 3}
+]
+
+# 密码锁谜题：L 为目标哈希，C 为线索
+PUZZLE_SALT = b'\xb2\x53\x22\x65\x7d\xdf\xb0\xfe\x9c\xde\xde\xfe\xf3\x1d\xdc\x3e'
+PUZZLES = [{"L": "81d5400ab2eca801a80837500be67485d0f8b297db1fa8ecbe4a23b66b65f6b8", "C": [[3, 1], [-1, -1, 5]],
+            "length": 3, "salt": PUZZLE_SALT}]
+PUZZLE_METHOD = "method1"
+# 不短于该长度的谜题改用多进程搜索（不再逐步展示搜索路径）；短谜题保留逐步可视化
+PARALLEL_PUZZLE_MIN_LENGTH = 7
+# 无界面模拟共用的内存缓存：每张迷宫的密码锁都是同一批谜题，解过一次后直接复用
+HEADLESS_PUZZLE_CACHE = PuzzleCache()
+
+
+class SilentSoundManager:
+    """与 SoundManager 接口相同但不发声，无需初始化 pygame.mixer"""
+
+    def play(self, name):
+        pass
+
+
+def score_interaction(ai_player, algorithm, interaction_result):
+    """按地块交互结果计分。贪心 AI 到达终点时停止并返回 True。"""
+    if algorithm == ALGO_DP_VISUALIZATION:
+        if interaction_result == GOLD:
+            ai_player.resource_value += 50
+        elif interaction_result == TRAP:
+            ai_player.resource_value -= 30
+    if algorithm == ALGO_GREEDY:
+        if isinstance(interaction_result, int):  # 检查返回的是否为地块类型常量
+            # 陷阱的价值本身是负数，所以直接相加即可
+            ai_player.greedy_score += get_tile_value(interaction_result, ai_player)
+            if interaction_result == END:
+                ai_player.is_active = False  # 停止AI
+                return True
+    return False
+
+
+def parse_battle_config(data):
+    """
+    校验 battle_config.json 的内容：B 为正整数血量列表，PlayerSkills 为 [伤害, 冷却] 非负整数对列表，
+    且至少一个技能有伤害。返回 (Boss 血量列表, 技能字典列表)，格式不对时抛出 ValueError。
+    """
+    def is_int(value):
+        return isinstance(value, int) and not isinstance(value, bool)
+
+    if not isinstance(data, dict):
+        raise ValueError("battle config must be a JSON object")
+    boss_hps = data.get("B")
+    if not isinstance(boss_hps, list) or not boss_hps:
+        raise ValueError("'B' must be a non-empty list of boss HP values")
+    if not all(is_int(hp) and hp > 0 for hp in boss_hps):
+        raise ValueError("'B' must contain positive integers only")
+    raw_skills = data.get("PlayerSkills")
+    if not isinstance(raw_skills, list) or not raw_skills:
+        raise ValueError("'PlayerSkills' must be a non-empty list of [damage, cooldown] pairs")
+    skills = []
+    for skill in raw_skills:
+        if not (isinstance(skill, list) and len(skill) == 2 and all(is_int(v) and v >= 0 for v in skill)):
+            raise ValueError(f"invalid skill {skill!r}: expected [damage, cooldown] with non-negative integers")
+        skills.append({"Damage": skill[0], "Cooldown": skill[1]})
+    if not any(skill["Damage"] > 0 for skill in skills):
+        raise ValueError("'PlayerSkills' needs at least one skill with positive damage")
+    return list(boss_hps), skills
+
+
+def load_battle_config(filepath='battle_config.json'):
+    """读取并校验 Boss 战配置文件；文件不存在抛出 OSError，内容无效抛出 ValueError"""
+    with open(filepath, 'r') as f:
+        return parse_battle_config(json.load(f))  # json.JSONDecodeError 是 ValueError 的子类
+
+
+def _prepare_battle(ai_player, boss, config):
+    boss_hps, skills = config or (BOSS_HP_LIST, PLAYER_SKILLS)
+    boss.health = list(boss_hps)
+    ai_player.skills = skills
+
+
+def start_battle(ai_player, boss, config=None, cache=None):
+    """
+    设置 Boss 血量与玩家技能并求解攻击序列。config 为 parse_battle_config 的返回值，None 时用默认配置。
+    cache 为调用方持有的 GauntletCache，重复的战斗直接取结果。
+    小规模配置精确求解，Boss 多、技能多时改用集束搜索（结果附带下界与是否最优）。
+    """
+    _prepare_battle(ai_player, boss, config)
+    with instrumentation.timer('battle.solve'):
+        return find_best_attack_sequence(ai_player, boss, ai_player.skills, mode='auto', cache=cache)
+
+
+def create_battle_solver(ai_player, boss, config=None, cache=None):
+    """与 start_battle 相同的设置，返回分步求解的生成器，每步产出进度字典（见 iter_boss_gauntlet）"""
+    _prepare_battle(ai_player, boss, config)
+    return iter_boss_gauntlet(boss.health, ai_player.skills, cache=cache, mode='auto')
+
+
+def apply_battle_result(maze, ai_player, battle_result, algorithm):
+    """
+    结算战斗：胜利时清除 Boss 地块并按回合数扣减资源值，返回扣减值；
+    失败时 AI 回到起点，返回 None。
+    """
+    if battle_result and battle_result['turns'] != -1:
+        ai_player.boss_defeated = True
+        maze.grid[ai_player.y][ai_player.x].type = PATH
+        ai_player.needs_new_target = True
+
+        deduction = battle_result['turns']
+        ai_player.resource_value -= deduction
+        if algorithm == ALGO_GREEDY:
+            ai_player.greedy_score -= deduction
+        return deduction
+
+    ai_player.x, ai_player.y = ai_player.start_pos
+    return None
+
+
+def _uses_parallel_search(puzzle, method):
+    return puzzle["length"] >= PARALLEL_PUZZLE_MIN_LENGTH and method in PARALLEL_METHODS
+
+
+def create_puzzle_solver(puzzle, method=PUZZLE_METHOD, poll_timeout=0, granularity=GRANULARITY_STEP,
+                         cache=None):
+    """
+    返回逐步求解的生成器，每步产出 (当前路径, 状态文本, 尝试次数)；granularity 见 backtracking.GRANULARITY_*。
+    长谜题交给 solve_puzzle_parallel，每步最多等待 poll_timeout 秒（None 表示等到有子树完成）。
+    给出 cache（PuzzleCache）时，解过的谜题直接产出成功一步，新解出的结果写入缓存。
+    """
+    key = puzzle_cache_key(puzzle, method) if cache is not None else None
+    if key is not None:
+        hit = cache.get(key)
+        if hit is not None:
+            return replay_solution(*hit)
+    if _uses_parallel_search(puzzle, method):
+        solver = solve_puzzle_parallel(method, puzzle["C"], puzzle["L"], puzzle["length"], puzzle["salt"],
+                                       {"count": 0}, poll_timeout=poll_timeout)
+    else:
+        solver = solve_puzzle_by_method(method, puzzle["C"], puzzle["L"], puzzle["length"], puzzle["salt"],
+                                        {"count": 0}, granularity)
+    return record_solution(solver, cache, key) if key is not None else solver
+
+
+def solve_puzzle_headless(puzzle, method=PUZZLE_METHOD, cache=None):
+    """不产出任何步骤的即时求解，返回 (密码字符串或 None, 尝试次数)，尝试次数与逐步求解相同"""
+    key = puzzle_cache_key(puzzle, method) if cache is not None else None
+    hit = cache.get(key) if key is not None else None
+    if hit is not None:
+        return hit
+    if _uses_parallel_search(puzzle, method):
+        password, tries = crack_password_parallel(method, puzzle["C"], puzzle["L"], puzzle["length"],
+                                                  puzzle["salt"])
+    else:
+        tries_counter = {"count": 0}
+        password = solve_puzzle_instant(method, puzzle["C"], puzzle["L"], puzzle["length"], puzzle["salt"],
+                                        tries_counter)
+        tries = tries_counter["count"]
+    if key is not None:
+        cache.put(key, password, tries)
+    return password, tries
+
+
+def apply_puzzle_success(maze, ai_player, tries, algorithm):
+    """解谜成功：打开密码锁并按尝试次数扣减资源值"""
+    ai_player.resource_value -= tries
+    if algorithm == ALGO_GREEDY:
+        ai_player.greedy_score -= tries
+    maze.grid[ai_player.y][ai_player.x].type = PATH
+    ai_player.needs_new_target = True
+
+
+def apply_puzzle_failure(maze, ai_player):
+    """解谜失败：密码锁变为墙，AI 退回上一步"""
+    maze.grid[ai_player.y][ai_player.x].type = WALL
+    if len(ai_player.path_history) > 1:
+        ai_player.path_history.pop()
+        ai_player.x, ai_player.y = ai_player.path_history[-1]
+    ai_player.needs_new_target = True
+
+
+class Simulation:
+    """
+    单次 AI 行走的无界面模拟。
+    - step(): 推进一步（含当步触发的战斗 / 解谜），返回模拟是否仍在进行
+    - run(): 一直推进到结束，返回结果字典
+    结束条件：贪心 AI 到达终点、DP 路线走完、AI 被困原地，或达到 max_steps。
+    DP 模式未给出 dp_path 时，在构造时用 calculate_dp_path 规划。
+    battle_config 为 parse_battle_config 的返回值，None 时用默认的 Boss 与技能。
+    puzzle_cache 缺省时使用共享的 HEADLESS_PUZZLE_CACHE；战斗结果缓存由每个模拟各自持有。
+    """
+
+    def __init__(self, maze, algorithm=ALGO_GREEDY, dp_path=None, max_steps=None, battle_config=None,
+                 puzzle_cache=None):
+        self.maze = maze
+        self.battle_config = battle_config
+        self.puzzle_cache = HEADLESS_PUZZLE_CACHE if puzzle_cache is None else puzzle_cache
+        self.battle_cache = GauntletCache()
+        self.algorithm = algorithm
+        if algorithm == ALGO_DP_VISUALIZATION and dp_path is None:
+            from algorithms.dynamic_programming import calculate_dp_path
+            dp_path, _ = calculate_dp_path(maze)
+        self.dp_path = list(dp_path or [])
+        self.max_steps = max_steps if max_steps is not None else 4 * maze.size * maze.size
+        self.sound_manager = SilentSoundManager()
+        self.reset()
+
+    def reset(self):
+        """与 Game.reset_simulation 相同：恢复迷宫并创建新的 AI"""
+        self.maze.reset()
+        self.boss = Boss()
+        self.ai_player = AIPlayer(start_pos=self.maze.start_pos)
+        if self.algorithm == ALGO_DP_VISUALIZATION:
+            self.ai_player.path_to_follow = list(self.dp_path)
+        self.steps = 0
+        self.battles = 0
+        self.puzzles = 0
+        self.idle_steps = 0
+        self.finished = False
+
+    def step(self):
+        if self.finished:
+            return False
+        player = self.ai_player
+        before = (player.x, player.y, len(player.path_to_follow))
+
+        interaction_result = player.update(self.maze, self.sound_manager, self.algorithm)
+        self.steps += 1
+        score_interaction(player, self.algorithm, interaction_result)
+        if interaction_result == 'start_battle':
+            self.battles += 1
+            apply_battle_result(self.maze, player,
+                                start_battle(player, self.boss, self.battle_config, self.battle_cache),
+                                self.algorithm)
+        elif interaction_result == 'start_puzzle':
+            self.puzzles += 1
+            self._solve_puzzle(random.choice(PUZZLES))
+
+        # 原地不动也会写入 path_history，贪心 AI 可能因此换一个方向；
+        # 连续停留超过历史窗口长度时状态不再变化，视为被困
+        if interaction_result is None and (player.x, player.y, len(player.path_to_follow)) == before:
+            self.idle_steps += 1
+        else:
+            self.idle_steps = 0
+
+        if (not player.is_active or self.steps >= self.max_steps
+                or (self.algorithm == ALGO_DP_VISUALIZATION and not player.path_to_follow)
+                or self.idle_steps > player.path_history.maxlen):
+            self.finished = True
+        return not self.finished
+
+    def _solve_puzzle(self, puzzle):
+        with instrumentation.timer('puzzle.solve'):
+            password, tries = solve_puzzle_headless(puzzle, cache=self.puzzle_cache)
+        if password is not None:
+            apply_puzzle_success(self.maze, self.ai_player, tries, self.algorithm)
+        else:
+            apply_puzzle_failure(self.maze, self.ai_player)
+
+    def run(self):
+        with instrumentation.profile(), instrumentation.timer(f'simulation.run.{self.algorithm}'):
+            while self.step():
+                pass
+        instrumentation.count('simulation.steps', self.steps)
+        return self.result()
+
+    def result(self):
+        player = self.ai_player
+        score = player.resource_value if self.algorithm == ALGO_DP_VISUALIZATION else player.greedy_score
+        return {
+            "algorithm": self.algorithm,
+            "score": score,
+            "steps": self.steps,
+            "reached_end": (player.x, player.y) == self.maze.end_pos,
+            "boss_defeated": player.boss_defeated,
+            "battles": self.battles,
+            "puzzles": self.puzzles,
+        }
@@ -1,33 +1,34 @@
 import json
-from collections import deque
+import os
+import sys
 import itertools
 
+# 允许从项目根目录以脚本方式运行时导入共享的 BFS 引擎
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import WALL, PATH
+from utils import bfs_parents, reconstruct_path
+
 # 从JSON文件中读取迷宫
 def read_maze(file_path):
     with open(file_path, 'r') as file:
         data = json.load(file)
     return data['maze']
 
-# 广度优先搜索函数
+# 广度优先搜索函数（基于 utils 中的父节点数组 BFS 引擎，给定终点时到达终点即停止）
 def bfs(maze, start, end=None):
     rows, cols = len(maze), len(maze[0])
-    directions = [(0, 1), (1, 0), (0, -1), (-1, 0)]
-    visited = [[False] * cols for _ in range(rows)]
-    visited[start[0]][start[1]] = True
-    queue = deque([(start, [start])])
+    cells = bytearray(WALL if maze[r][c] == '#' else PATH for r in range(rows) for c in range(cols))
+    # 引擎使用 (x, y) = (列, 行) 坐标，这里的坐标是 (行, 列)，方向也需对调
+    directions = [(1, 0), (0, 1), (-1, 0), (0, -1)]
+    engine_end = None if end is None else (end[1], end[0])
+    parents = bfs_parents(cells, cols, (start[1], start[0]), engine_end, directions=directions)
+    visited = [[parents[r * cols + c] != -1 for c in range(cols)] for r in range(rows)]
     paths = []
 
-    while queue:
-        (x, y), path = queue.popleft()
-        if end and (x, y) == end:
-            paths.append(path)
-            continue
-        for dx, dy in directions:
-            new_x, new_y = x + dx, y + dy
-            if 0 <= new_x < rows and 0 <= new_y < cols and maze[new_x][new_y] != '#' and not visited[new_x][new_y]:
-                visited[new_x][new_y] = True
-                new_path = path + [(new_x, new_y)]
-                queue.append(((new_x, new_y), new_path))
+    if end:
+        path = reconstruct_path(parents, cols, engine_end)
+        if path:
+            paths.append([(y, x) for x, y in path])
 
     return paths, visited
 
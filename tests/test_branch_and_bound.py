@@ -0,0 +1,33 @@
+import pytest
+
+from algorithms.branch_and_bound import GauntletCache, iter_boss_gauntlet, solve_boss_gauntlet
+
+SKILLS = [{'Damage': 5, 'Cooldown': 0}, {'Damage': 9, 'Cooldown': 2}]
+LONG_COOLDOWNS = [{'Damage': 5, 'Cooldown': 40}] * 4  # 41 ** 4 种冷却组合，超出 20 位编号
+
+
+@pytest.mark.parametrize("boss_hps, skills", [([1 << 24], SKILLS), ([10], LONG_COOLDOWNS)])
+def test_exact_mode_rejects_states_that_do_not_fit(boss_hps, skills):
+    with pytest.raises(ValueError):
+        solve_boss_gauntlet(boss_hps, skills, mode='exact')
+    with pytest.raises(ValueError):
+        iter_boss_gauntlet(boss_hps, skills, mode='exact')
+
+
+def test_auto_mode_falls_back_to_beam_when_states_do_not_fit():
+    result = solve_boss_gauntlet([10], LONG_COOLDOWNS, mode='auto')
+    assert result['turns'] == 2
+
+
+def test_cache_evicts_least_recently_used_result():
+    cache = GauntletCache(max_entries=2)
+    solve_boss_gauntlet([10], SKILLS, cache=cache)
+    solve_boss_gauntlet([20], SKILLS, cache=cache)
+    stats = {}
+    solve_boss_gauntlet([10], SKILLS, stats, cache=cache)  # 命中后 [10] 成为最近使用
+    assert stats['cache_hit']
+
+    solve_boss_gauntlet([30], SKILLS, cache=cache)  # 淘汰最久未用的 [20]
+
+    assert len(cache) == 2
+    assert [key[0] for key in cache.entries] == [(10,), (30,)]
@@ -0,0 +1,55 @@
+import time
+
+from algorithms.dp_background import BackgroundDPPlanner
+from algorithms.dp_path_cache import DPPathCache
+from algorithms.dynamic_programming import calculate_dp_path
+from benchmarks.fixtures import generate_maze
+
+
+def _wait_for_result(planner, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        result = planner.poll()
+        if result is not None:
+            return result
+        time.sleep(0.01)
+    raise AssertionError("background planning did not finish in time")
+
+
+def test_background_plan_matches_direct_plan(tmp_path):
+    maze = generate_maze(9, 0)
+    planner = BackgroundDPPlanner(cache=DPPathCache(str(tmp_path)))
+    planner.submit(maze)
+
+    path, score = _wait_for_result(planner)
+
+    assert not planner.pending
+    assert (path, score) == calculate_dp_path(maze)
+    planner.shutdown()
+
+
+def test_cancel_terminates_running_plan(tmp_path):
+    planner = BackgroundDPPlanner(cache=DPPathCache(str(tmp_path)))
+    planner.submit(generate_maze(41, 0))  # 规划需要数秒以上，取消时必然仍在运行
+    process = planner.process
+    time.sleep(0.5)
+    assert process.is_alive()
+
+    planner.cancel()
+
+    assert not process.is_alive()
+    assert process.exitcode is not None
+    assert not planner.pending
+    assert planner.poll() is None
+
+
+def test_resubmit_leaves_no_running_worker(tmp_path):
+    planner = BackgroundDPPlanner(cache=DPPathCache(str(tmp_path)))
+    planner.submit(generate_maze(41, 0))
+    first = planner.process
+
+    planner.submit(generate_maze(9, 0))
+
+    assert not first.is_alive()
+    _wait_for_result(planner)
+    planner.shutdown()
@@ -0,0 +1,55 @@
+import random
+
+import pytest
+
+from config import *
+from benchmarks.fixtures import generate_maze
+from utils import bfs_multi_target, bfs_path_avoiding_history
+
+
+def _open_maze(size):
+    """四周是墙、内部全空的 size x size 迷宫"""
+    cells = bytearray(PATH for _ in range(size * size))
+    for i in range(size):
+        for cell in (i, (size - 1) * size + i, i * size, i * size + size - 1):
+            cells[cell] = WALL
+    return cells
+
+
+def test_unreachable_target_is_omitted():
+    size = 21
+    cells = _open_maze(size)
+    # 把 (1, 1) 用墙围死，使它不可达
+    cells[1 * size + 2] = WALL
+    cells[2 * size + 1] = WALL
+    cells[2 * size + 2] = WALL
+    reachable, unreachable = 10 * size + 17, 1 * size + 1
+
+    found = bfs_multi_target(cells, size, (10, 10), {reachable, unreachable})
+
+    assert found == {reachable: (7, 10 * size + 11)}
+
+
+@pytest.mark.parametrize("size, seed", [(15, 0), (21, 1), (31, 2)])
+def test_matches_per_target_search(size, seed):
+    """与对每个目标单独调用 bfs_path_avoiding_history 得到的距离和第一步完全相同"""
+    maze = generate_maze(size, seed)
+    cells = maze.grid.cells
+    rng = random.Random(seed)
+    open_cells = [(i % size, i // size) for i in range(size * size) if cells[i] != WALL]
+
+    for _ in range(50):
+        start = rng.choice(open_cells)
+        history = set(rng.sample(open_cells, len(open_cells) // 4)) - {start}
+        targets = {y * size + x for x, y in rng.sample(open_cells, 8)} - {start[1] * size + start[0]}
+        avoid = {y * size + x for x, y in history}
+
+        found = bfs_multi_target(cells, size, start, targets, avoid)
+
+        for target in targets:
+            path = bfs_path_avoiding_history(start, (target % size, target // size), maze.grid, history)
+            if path is None:
+                assert target not in found
+            else:
+                x, y = path[1]
+                assert found[target] == (len(path) - 1, y * size + x)
@@ -0,0 +1,52 @@
+# 字体与文字表面缓存：字体在启动时解析一次，渲染结果按 (字体, 字号, 文本, 颜色) 缓存并按 LRU 淘汰。
+# HUD 和弹窗中的静态文字（标题、按钮标签）每帧命中缓存，不再重复调用 font.render。
+
+from collections import OrderedDict
+
+import pygame
+
+
+class TextCache:
+    """
+    - font(size, bold): 取得（并缓存）指定字号的字体；首选字体不可用时回退到 pygame 默认字体
+    - render(font, text, color): 返回缓存的文字表面，缓存满时淘汰最久未用的条目
+    - hits / misses: 命中与实际渲染次数，misses 即文字表面的分配次数
+    """
+
+    def __init__(self, font_name='sans-serif', max_entries=256):
+        self.font_name = font_name
+        self.max_entries = max_entries
+        self.fonts = {}
+        self.font_keys = {}  # 字体对象 -> (字号, 是否粗体)，作为渲染缓存键的一部分
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def font(self, size, bold=False):
+        key = (size, bold)
+        font = self.fonts.get(key)
+        if font is None:
+            try:
+                font = pygame.font.SysFont(self.font_name, size, bold=bold)
+            except pygame.error:
+                font = pygame.font.SysFont(None, size, bold=bold)
+            self.fonts[key] = font
+            self.font_keys[font] = key
+        return font
+
+    def render(self, font, text, color):
+        key = (self.font_keys.get(font, font), text, tuple(color))
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+        self.misses += 1
+        surface = font.render(text, True, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_entries:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def reset_stats(self):
+        self.hits = self.misses = 0
@@ -77,37 +77,149 @@ def create_all_icons(icon_size):
     
     return tile_icons
 
-def bfs_path_avoiding_history(start, end, maze_grid, history_path=set()):
+# BFS 默认的扩展顺序（下、右、上、左），顺序会影响等长路径中最终选中的那一条
+BFS_DIRECTIONS = [(0, 1), (1, 0), (0, -1), (-1, 0)]
+
+
+def bfs_parents(cells, width, start, end=None, avoid=None, directions=BFS_DIRECTIONS):
     """
-    BFS寻路算法，避免走已经走过的点。
+    共享的 BFS 引擎：在按行优先排列的扁平网格上搜索，只记录父节点。
+    - cells: 扁平的地块数组（如 Grid.cells），值为 WALL 的格子不可通行
+    - start / end: (x, y) 坐标；end 为 None 时遍历整个连通区域
+    - avoid: 需要绕开的格子编号集合（终点本身除外）
+    返回长度为 len(cells) 的父节点列表，未访问的格子为 -1，起点的父节点是它自己。
     """
-    queue = deque([[start]])
-    visited = {start}
+    total = len(cells)
+    start_id = start[1] * width + start[0]
+    goal_id = -1 if end is None else end[1] * width + end[0]
+    steps = [(dx, dy * width + dx) for dx, dy in directions]
+
+    parents = [-1] * total
+    parents[start_id] = start_id
+    queue = deque([start_id])
 
     while queue:
-        path = queue.popleft()
-        node_x, node_y = path[-1]
+        current = queue.popleft()
+        if current == goal_id:
+            break
+        x = current % width
+        for dx, offset in steps:
+            if not 0 <= x + dx < width:
+                continue
+            nxt = current + offset
+            if not 0 <= nxt < total or parents[nxt] != -1 or cells[nxt] == WALL:
+                continue
+            if avoid and nxt in avoid and nxt != goal_id:
+                continue
+            parents[nxt] = current
+            queue.append(nxt)
 
-        if (node_x, node_y) == end:
-            return path
+    return parents
 
-        # 优先顺序可以影响路径选择，例如优先向下、向右
-        for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-            next_x, next_y = node_x + dx, node_y + dy
 
-            if not (0 <= next_y < len(maze_grid) and 0 <= next_x < len(maze_grid[0])):
+def reconstruct_path(parents, width, end):
+    """沿父节点数组从终点回溯到起点，返回 (x, y) 路径；终点未被访问时返回 None"""
+    current = end[1] * width + end[0]
+    if parents[current] == -1:
+        return None
+    path = []
+    while True:
+        path.append((current % width, current // width))
+        parent = parents[current]
+        if parent == current:
+            break
+        current = parent
+    path.reverse()
+    return path
+
+
+def bfs_path(cells, width, start, end, avoid=None, directions=BFS_DIRECTIONS):
+    """求 start 到 end 的最短路径（(x, y) 列表），不可达时返回 None"""
+    parents = bfs_parents(cells, width, start, end, avoid, directions)
+    return reconstruct_path(parents, width, end)
+
+
+def bfs_distances(cells, width, source, avoid=None):
+    """从 source 出发的 BFS 距离场（按格子编号的扁平列表），不可达的格子为 -1；avoid 中的格子编号不可通行"""
+    total = len(cells)
+    source_id = source[1] * width + source[0]
+    steps = [(dx, dy * width + dx) for dx, dy in BFS_DIRECTIONS]
+    distances = [-1] * total
+    distances[source_id] = 0
+    queue = deque([source_id])
+
+    while queue:
+        current = queue.popleft()
+        next_distance = distances[current] + 1
+        x = current % width
+        for dx, offset in steps:
+            if not 0 <= x + dx < width:
                 continue
-            
-            if maze_grid[next_y][next_x].type == WALL:
+            nxt = current + offset
+            if not 0 <= nxt < total or distances[nxt] != -1 or cells[nxt] == WALL:
                 continue
+            if avoid and nxt in avoid:
+                continue
+            distances[nxt] = next_distance
+            queue.append(nxt)
+
+    return distances
 
-            # 如果节点在访问过或历史路径中，则跳过
-            if (next_x, next_y) in visited or ((next_x, next_y) in history_path and (next_x, next_y) != end):
+
+def bfs_multi_target(cells, width, start, targets, avoid=None, directions=BFS_DIRECTIONS):
+    """
+    单次 BFS 同时求出到多个目标格子的距离和第一步，找到全部目标后立即停止。
+    - targets: 目标格子编号集合
+    - avoid: 不可经过的格子编号集合；其中的目标格仍可作为终点到达，但不会从它继续扩展，
+      与对每个目标单独调用 bfs_path_avoiding_history 的规则一致
+    返回 {目标编号: (距离, 第一步的格子编号)}，不可达的目标不出现在结果中。
+    """
+    total = len(cells)
+    start_id = start[1] * width + start[0]
+    steps = [(dx, dy * width + dx) for dx, dy in directions]
+    remaining = set(targets)
+    remaining.discard(start_id)
+    found = {}
+    if not remaining:
+        return found
+
+    # 访问过的格子 -> (距离, 第一步)，使用字典使开销只与实际搜索范围相关
+    seen = {start_id: (0, -1)}
+    queue = deque([start_id])
+
+    while queue:
+        current = queue.popleft()
+        distance, first_step = seen[current]
+        distance += 1
+        x = current % width
+        for dx, offset in steps:
+            if not 0 <= x + dx < width:
                 continue
-            
-            visited.add((next_x, next_y))
-            new_path = list(path)
-            new_path.append((next_x, next_y))
-            queue.append(new_path)
-    
-    return None
+            nxt = current + offset
+            if not 0 <= nxt < total or nxt in seen or cells[nxt] == WALL:
+                continue
+            is_target = nxt in remaining
+            if avoid and nxt in avoid and not is_target:
+                continue
+            info = (distance, nxt if current == start_id else first_step)
+            seen[nxt] = info
+            if is_target:
+                found[nxt] = info
+                remaining.discard(nxt)
+                if not remaining:
+                    return found
+                if avoid and nxt in avoid:
+                    continue
+            queue.append(nxt)
+
+    return found
+
+
+def bfs_path_avoiding_history(start, end, maze_grid, history_path=set()):
+    """
+    BFS寻路算法，避免走已经走过的点。
+    maze_grid 为 grid.Grid，搜索由共享的 bfs_parents 引擎完成。
+    """
+    size = maze_grid.size
+    avoid = {y * size + x for x, y in history_path}
+    return bfs_path(maze_grid.cells, size, start, end, avoid)